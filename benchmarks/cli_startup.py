@@ -0,0 +1,140 @@
+"""
+Cold-start benchmark for the supercli command line.
+
+Runs each subcommand in a fresh interpreter against an empty temporary HOME
+and records the wall time and how many modules ended up in sys.modules
+(a proxy for how much the lazy command loader avoided importing).
+
+Usage:
+    python benchmarks/cli_startup.py
+    python benchmarks/cli_startup.py --runs 20 --output cli_startup.json
+    python benchmarks/cli_startup.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+DEFAULT_RUNS = 10
+
+# subcommand label -> supercli arguments (read-only, safe on an empty HOME)
+SUBCOMMANDS = {
+    "--version": ["--version"],
+    "list": ["list"],
+    "show": ["show"],
+    "add": ["add", "--help"],
+    "remove": ["remove", "--help"],
+    "completion-init": ["completion-init", "--help"],
+    "completion-refresh": ["completion-refresh", "--help"],
+    "completion-bundle": ["completion-bundle", "--help"],
+    "completion-daemon": ["completion-daemon", "--status"],
+}
+
+# run the application without exiting, then report sys.modules on the given fd
+DRIVER = """
+import os, sys
+sys.argv = ["supercli"] + sys.argv[1:]
+from cli_manager.core import SupercliApplication
+app = SupercliApplication()
+app.auto_exits(False)
+app.run()
+os.write(int(os.environ["SUPERCLI_BENCH_FD"]), str(len(sys.modules)).encode())
+"""
+
+
+def run_once(args: List[str], env: Dict[str, str]) -> Dict[str, float]:
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", DRIVER, *args],
+        env=dict(env, SUPERCLI_BENCH_FD=str(write_fd)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        pass_fds=(write_fd,),
+    )
+    os.close(write_fd)
+    process.wait()
+    elapsed = (time.perf_counter() - start) * 1000
+    with os.fdopen(read_fd) as f:
+        modules = int(f.read() or 0)
+    return {"wall_ms": elapsed, "modules": modules}
+
+
+def run_benchmarks(runs: int) -> List[Dict]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="supercli-startup-") as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=str(SRC_DIR))
+        for label, args in SUBCOMMANDS.items():
+            samples = [run_once(args, env) for _ in range(runs)]
+            durations = sorted(sample["wall_ms"] for sample in samples)
+            result = {
+                "subcommand": label,
+                "runs": runs,
+                "median_ms": round(statistics.median(durations), 2),
+                "min_ms": round(durations[0], 2),
+                "modules": samples[-1]["modules"],
+            }
+            results.append(result)
+            print(
+                f"{label:>18}: median {result['median_ms']:8.2f} ms"
+                f"  min {result['min_ms']:8.2f} ms  {result['modules']:4d} modules",
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(results: List[Dict], baseline_path: Path) -> None:
+    """Print wall time and module count deltas against a previous JSON report"""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {r["subcommand"]: r for r in baseline.get("results", [])}
+
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for result in results:
+        old = previous.get(result["subcommand"])
+        if not old:
+            continue
+        print(
+            f"  {result['subcommand']:>18}: {old['median_ms']:8.2f} -> {result['median_ms']:8.2f} ms"
+            f"  {old['modules']:4d} -> {result['modules']:4d} modules",
+            file=sys.stderr,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="previous JSON report to compare with")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.runs)
+    report = {
+        "benchmark": "cli_startup",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.compare:
+        compare(results, args.compare)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
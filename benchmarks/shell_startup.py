@@ -0,0 +1,253 @@
+"""
+Shell startup benchmark for the supercli completion loaders.
+
+Builds a synthetic ~/.completions with N generated cleo-style scripts in a
+temporary HOME, installs the real .bashrc loader for each loader mode
+(eager, lazy, bundle) and times `bash -i -c exit`.
+
+Usage:
+    python benchmarks/shell_startup.py
+    python benchmarks/shell_startup.py --counts 10 100 --runs 30 --output startup.json
+    python benchmarks/shell_startup.py --compare baseline.json --output startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+DEFAULT_COUNTS = [10, 100, 1000]
+DEFAULT_RUNS = 20
+
+CLEO_TEMPLATE = """_{name}_complete()
+{{
+    local cur script coms opts com
+    COMPREPLY=()
+    _get_comp_words_by_ref -n : cur words
+
+    # for an alias, get the real script behind it
+    if [[ $(type -t ${{words[0]}}) == "alias" ]]; then
+        script=$(alias ${{words[0]}} | sed -E "s/alias ${{words[0]}}='(.*)'/\\1/")
+    else
+        script=${{words[0]}}
+    fi
+
+    # lookup for command
+    for word in ${{words[@]:1}}; do
+        if [[ $word != -* ]]; then
+            com=$word
+            break
+        fi
+    done
+
+    # completing for an option
+    if [[ ${{cur}} == --* ]] ; then
+        opts="--ansi --help --no-ansi --no-interaction --quiet --verbose --version"
+
+        case "$com" in
+{cases}
+        esac
+
+        COMPREPLY=($(compgen -W "${{opts}}" -- ${{cur}}))
+        __ltrim_colon_completions "$cur"
+
+        return 0;
+    fi
+
+    # completing for a command
+    if [[ $cur == $com ]]; then
+        coms="{commands}"
+
+        COMPREPLY=($(compgen -W "${{coms}}" -- ${{cur}}))
+        __ltrim_colon_completions "$cur"
+
+        return 0
+    fi
+}}
+
+complete -o default -F _{name}_complete {name}
+complete -o default -F _{name}_complete {bin_dir}/{name}
+"""
+
+
+def synthetic_cleo_script(name: str, bin_dir: Path, n_commands: int = 8) -> str:
+    """Render a cleo-like bash completion script for a fake CLI"""
+    commands = [f"command-{i}" for i in range(n_commands)] + ["help", "list"]
+    cases = "\n".join(
+        f"\n            ({command})\n            opts=\"${{opts}} --option-{i}\"\n            ;;"
+        for i, command in enumerate(commands)
+    )
+    return CLEO_TEMPLATE.format(
+        name=name, bin_dir=bin_dir, cases=cases, commands=" ".join(commands)
+    )
+
+
+def build_home(home: Path, count: int) -> Path:
+    """Create a HOME with `count` managed completions and matching executables"""
+    from cli_manager.utils.install_completion import install_completion
+    from cli_manager.utils.meta_parser import add_meta_to_completion
+
+    bin_dir = home / "bin"
+    bin_dir.mkdir(parents=True)
+    for i in range(count):
+        name = f"benchcli{i:04d}"
+        executable = bin_dir / name
+        executable.write_text("#!/bin/sh\n")
+        executable.chmod(0o755)
+
+        script = add_meta_to_completion(
+            "supercli", name, name, synthetic_cleo_script(name, bin_dir)
+        )
+        success, messages, _ = install_completion(name, script)
+        if not success:
+            raise RuntimeError("; ".join(messages))
+    return bin_dir
+
+
+def use_loader(mode: str) -> None:
+    """Switch the temporary HOME to the given loader mode"""
+    from cli_manager.utils.completion_loader import set_loader_mode, sync_completion_loader
+    from cli_manager.utils.install_completion import add_bashrc_loader
+
+    set_loader_mode(mode)
+    add_bashrc_loader(mode)
+    sync_completion_loader(mode)
+
+
+def time_shell_startup(env: Dict[str, str], runs: int) -> Dict[str, float]:
+    """Time `bash -i -c exit` and collect per-run max RSS"""
+    durations: List[float] = []
+    rss: List[int] = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            ["bash", "-i", "-c", "exit"],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        _, _, usage = os.wait4(process.pid, 0)
+        durations.append((time.perf_counter() - start) * 1000)
+        rss.append(usage.ru_maxrss)
+        process.returncode = 0  # already reaped by wait4
+
+    durations.sort()
+    p95_index = min(len(durations) - 1, int(round(0.95 * (len(durations) - 1))))
+    return {
+        "median_ms": round(statistics.median(durations), 3),
+        "p95_ms": round(durations[p95_index], 3),
+        "min_ms": round(durations[0], 3),
+        "max_rss_kb": max(rss),
+    }
+
+
+def run_benchmarks(counts: List[int], modes: List[str], runs: int) -> List[Dict]:
+    results = []
+    original_home = os.environ.get("HOME")
+
+    for count in counts:
+        with tempfile.TemporaryDirectory(prefix="supercli-bench-") as temp_dir:
+            home = Path(temp_dir)
+            os.environ["HOME"] = str(home)
+            try:
+                bin_dir = build_home(home, count)
+                env = {
+                    "HOME": str(home),
+                    "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+                    "TERM": "dumb",
+                }
+                for mode in modes:
+                    use_loader(mode)
+                    stats = time_shell_startup(env, runs)
+                    results.append({"mode": mode, "count": count, "runs": runs, **stats})
+                    print(
+                        f"{mode:>7} {count:>5} CLIs: median {stats['median_ms']:8.2f} ms"
+                        f"  p95 {stats['p95_ms']:8.2f} ms  rss {stats['max_rss_kb']} KB",
+                        file=sys.stderr,
+                    )
+            finally:
+                if original_home is None:
+                    os.environ.pop("HOME", None)
+                else:
+                    os.environ["HOME"] = original_home
+
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline_path: Path) -> None:
+    """Print median/p95 deltas against a previous JSON report"""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(r["mode"], r["count"]): r for r in baseline.get("results", [])}
+
+    print(f"\nCompared with {baseline_path} ({baseline.get('revision')}):", file=sys.stderr)
+    for result in results:
+        old = previous.get((result["mode"], result["count"]))
+        if not old:
+            continue
+        for key in ("median_ms", "p95_ms"):
+            delta = result[key] - old[key]
+            percent = (delta / old[key] * 100) if old[key] else 0.0
+            print(
+                f"  {result['mode']:>7} {result['count']:>5} {key:>9}: "
+                f"{old[key]:8.2f} -> {result[key]:8.2f} ms ({percent:+.1f}%)",
+                file=sys.stderr,
+            )
+
+
+def main() -> int:
+    from cli_manager.utils.completion_loader import LOADER_MODES
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS)
+    parser.add_argument("--modes", nargs="+", choices=LOADER_MODES, default=list(LOADER_MODES))
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="previous JSON report to compare with")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.counts, args.modes, args.runs)
+    report = {
+        "benchmark": "shell_startup",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.compare:
+        compare(results, args.compare)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
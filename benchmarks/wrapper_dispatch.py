@@ -0,0 +1,186 @@
+"""
+Dispatch overhead benchmark for the superclisubs wrapper.
+
+Registers N CLIs (the target, a no-op executable, is registered last so
+linear lookups pay their worst case) and measures the per-call cost of:
+
+    legacy    the old regex-over-a-string wrapper that runs "$@" as a child
+    script    the generated wrapper script (exec, no lingering bash)
+    case      the same script dispatching through one `case` alternation
+    assoc     the same script dispatching through a `declare -A` lookup
+    function  the generated shell function (associative-array lookup, no fork)
+    direct    calling the target directly, as a floor
+
+Each measurement runs the call in a loop inside one bash process so that only
+the dispatch itself is timed.
+
+Usage:
+    python benchmarks/wrapper_dispatch.py
+    python benchmarks/wrapper_dispatch.py --counts 10 1000 --calls 200 --output dispatch.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+DEFAULT_COUNTS = [10, 1000, 10000]
+DEFAULT_CALLS = 200
+TARGET = "benchtarget"
+
+LEGACY_TEMPLATE = """#!/bin/bash
+# superclisubs wrapper script
+
+registered_clis="{clis}"
+
+if [[ " $registered_clis " =~ " $1 " ]]; then
+    "$@"
+else
+    echo "Unknown command: $1"
+    echo "Available commands: $registered_clis"
+    exit 1
+fi
+"""
+
+# script-mode alternatives; a one-shot script re-parses the whole list on every call
+CASE_TEMPLATE = """#!/bin/bash
+# superclisubs wrapper script
+
+case $1 in
+    {patterns}) exec "$@" ;;
+esac
+
+echo "Unknown command: $1"
+echo "Available commands: {clis}"
+exit 1
+"""
+
+ASSOC_TEMPLATE = """#!/bin/bash
+# superclisubs wrapper script
+
+declare -A registered_clis=({entries})
+
+if [[ -n $1 && -n ${{registered_clis[$1]}} ]]; then
+    exec "$@"
+fi
+
+echo "Unknown command: $1"
+echo "Available commands: {clis}"
+exit 1
+"""
+
+
+def registered(count: int) -> List[str]:
+    return [f"benchcli{i:05d}" for i in range(count - 1)] + [TARGET]
+
+
+def time_loop(setup: str, call: str, calls: int, env: Dict[str, str]) -> float:
+    """Run `call` `calls` times inside one bash and return microseconds per call"""
+    script = f"""{setup}
+start=$EPOCHREALTIME
+for ((i = 0; i < {calls}; i++)); do {call}; done
+end=$EPOCHREALTIME
+echo "$start $end"
+"""
+    output = subprocess.run(
+        ["bash", "-c", script], capture_output=True, text=True, check=True, env=env
+    ).stdout.split()
+    start, end = (float(value) for value in output[-2:])
+    return (end - start) / calls * 1_000_000
+
+
+def run_benchmarks(counts: List[int], calls: int) -> List[Dict]:
+    from cli_manager.utils.wrapper_utils import (
+        generate_wrapper_function,
+        generate_wrapper_script,
+    )
+
+    results = []
+    for count in counts:
+        clis = registered(count)
+        with tempfile.TemporaryDirectory(prefix="supercli-dispatch-") as temp_dir:
+            temp_path = Path(temp_dir)
+            target = temp_path / TARGET
+            target.write_text("#!/bin/sh\n")
+            env = {"PATH": f"{temp_path}:/usr/bin:/bin"}
+            legacy = temp_path / "legacy"
+            legacy.write_text(LEGACY_TEMPLATE.format(clis=" ".join(clis)))
+            script = temp_path / "script"
+            script.write_text(generate_wrapper_script(clis))
+            case = temp_path / "case"
+            case.write_text(CASE_TEMPLATE.format(patterns="|".join(clis), clis=" ".join(clis)))
+            assoc = temp_path / "assoc"
+            assoc.write_text(
+                ASSOC_TEMPLATE.format(
+                    entries=" ".join(f"[{cli}]=1" for cli in clis), clis=" ".join(clis)
+                )
+            )
+            function = temp_path / "function.bash"
+            function.write_text(generate_wrapper_function(clis))
+            for path in (target, legacy, script, case, assoc):
+                path.chmod(0o755)
+
+            started = time.perf_counter()
+            timings = {
+                "direct": time_loop("", TARGET, calls, env),
+                "legacy": time_loop("", f"{legacy} {TARGET}", calls, env),
+                "script": time_loop("", f"{script} {TARGET}", calls, env),
+                "case": time_loop("", f"{case} {TARGET}", calls, env),
+                "assoc": time_loop("", f"{assoc} {TARGET}", calls, env),
+                "function": time_loop(
+                    f"source {function}", f"superclisubs {TARGET}", calls, env
+                ),
+            }
+
+        for mode, per_call in timings.items():
+            overhead = per_call - timings["direct"]
+            results.append(
+                {
+                    "mode": mode,
+                    "count": count,
+                    "calls": calls,
+                    "per_call_us": round(per_call, 2),
+                    "overhead_us": round(overhead, 2),
+                }
+            )
+            print(
+                f"{mode:>8} {count:>6} CLIs: {per_call:10.1f} us/call"
+                f"  (+{overhead:9.1f} us over direct)",
+                file=sys.stderr,
+            )
+        print(f"  ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS)
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "wrapper_dispatch",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_benchmarks(args.counts, args.calls),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
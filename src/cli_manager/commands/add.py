@@ -1,9 +1,22 @@
-from typing import List
+import time
+from typing import Any, Dict, List, Optional
 from cleo.commands.command import Command
 from cleo.helpers import argument, option
 
-from ..utils.wrapper_utils import get_registered_clis, update_wrapper_script
+from ..utils.wrapper_utils import (
+    set_wrapper_mode,
+    update_wrapper_script,
+    validate_wrapper_mode,
+)
+from ..utils.completion_engine import map_ordered, parse_jobs
+from ..utils.completion_index import load_index
+from ..utils.completion_loader import sync_completion_loader
+from ..utils.install_completion import RESTART_MESSAGE
 from ..utils.managed_completion import refresh_cli_completion
+from ..utils.path_index import which
+from ..utils.registry import load_registry, make_record, save_registry
+from ..utils.safe_io import exclusive_lock, get_completion_dir
+from ..utils.transaction import FileTransaction
 
 
 class AddCommand(Command):
@@ -14,80 +27,133 @@ class AddCommand(Command):
         argument("cli_names", "Names of CLIs to add (space-separated)", multiple=True)
     ]
 
-    options = [option("force", "f", "Force add even if CLI already exists", flag=True)]
+    options = [
+        option("force", "f", "Force add even if CLI already exists", flag=True),
+        option(
+            "jobs", "j", "Number of CLIs to generate completions for in parallel", flag=False
+        ),
+        option(
+            "wrapper-mode",
+            None,
+            "Install superclisubs as a 'script' or also as a bash 'function' (remembered)",
+            flag=False,
+        ),
+    ]
 
     help = """
     The add command registers new CLIs to be managed by supercli.
     
     It will:
-    1. Register the CLI in superclisubs wrapper
+    1. Register the CLI in the supercli registry and superclisubs wrapper
     2. Generate and install completion script
     3. Update the wrapper completion
     
+    Completions are generated in parallel (see --jobs). All files (completions,
+    registry, wrapper, .bashrc loader) are written together at the end, so a
+    failure leaves everything as it was.
+    
     Example:
         supercli add mycli
         supercli add cli1 cli2 cli3
         supercli add --force existingcli
+        supercli add --jobs 8 cli1 cli2 cli3
+        supercli add --wrapper-mode function mycli
     """
 
     def handle(self) -> int:
         cli_names: List[str] = self.argument("cli_names")
         force: bool = self.option("force")
 
+        try:
+            jobs = parse_jobs(self.option("jobs"))
+            # Remembered only once everything else is committed
+            wrapper_mode = self.option("wrapper-mode")
+            if wrapper_mode:
+                validate_wrapper_mode(wrapper_mode)
+            registry = load_registry()
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+
         success_clis: List[str] = []
         failed_clis: List[str] = []
+        records: Dict[str, Dict[str, Any]] = {}
+        completions_changed = False
 
-        # Get currently registered CLIs
-        registered_clis = get_registered_clis()
-
+        # Decide which CLIs need a completion refresh
+        pending_clis: List[str] = []
         for cli_name in cli_names:
             # Check if CLI already exists
-            if cli_name in registered_clis and not force:
+            if (cli_name in registry or cli_name in pending_clis) and not force:
                 self.line(
                     f"<error>CLI '{cli_name}' is already registered. Use --force to override.</error>"
                 )
                 failed_clis.append(cli_name)
                 continue
 
-            try:
-                # Update completion for the CLI
-                completion_success, messages = refresh_cli_completion(
-                    cli_name=cli_name,
-                    backend_name="supercli",
-                    wrapper_name="superclisubs",
+            if cli_name not in pending_clis:
+                pending_clis.append(cli_name)
+
+        # CLIs missing from PATH are still registered (they may be installed
+        # later), but are never spawned: refresh skips them via the PATH index
+        for cli_name in pending_clis:
+            if which(cli_name) is None:
+                self.line(
+                    f"<comment>'{cli_name}' was not found in PATH; "
+                    "registering it without a completion</comment>"
                 )
 
-                if not completion_success:
-                    self.line(
-                        f"<error>Failed to update completion for '{cli_name}': {messages[0]}</error>"
-                    )
-                    failed_clis.append(cli_name)
-                    continue
+        # Generate completions in parallel into one transaction, results come
+        # back in input order. The index is read once and shared by every CLI
+        transaction = FileTransaction()
+        index = load_index(get_completion_dir()) if pending_clis else {}
+        results = map_ordered(
+            lambda cli_name: self._refresh_timed(cli_name, transaction, index),
+            pending_clis,
+            jobs,
+        )
+        index = transaction.index_view() if results else {}
+
+        for cli_name, timed, error in results:
+            if error is not None:
+                self.line(f"<error>Failed to add '{cli_name}': {str(error)}</error>")
+                failed_clis.append(cli_name)
+                continue
 
-                # Add to success list if not already registered
-                if cli_name not in registered_clis:
-                    registered_clis.append(cli_name)
+            (completion_success, messages, changed), elapsed = timed
+            if not completion_success:
+                self.line(
+                    f"<error>Failed to update completion for '{cli_name}': {messages[0]}</error>"
+                )
+                failed_clis.append(cli_name)
+                continue
 
-                success_clis.append(cli_name)
-                self.line(f"<info>Successfully added '{cli_name}'</info>")
+            records[cli_name] = make_record(
+                cli_name,
+                fingerprint=index.get(cli_name, {}).get("fingerprint"),
+                generation_seconds=elapsed,
+            )
 
-                # Show completion messages
-                for msg in messages:
-                    self.line(f"  <comment>{msg}</comment>")
+            success_clis.append(cli_name)
+            self.line(f"<info>Successfully added '{cli_name}'</info>")
 
-            except Exception as e:
-                self.line(f"<error>Failed to add '{cli_name}': {str(e)}</error>")
-                failed_clis.append(cli_name)
+            # Show completion messages
+            for msg in messages:
+                self.line(f"  <comment>{msg}</comment>")
+            completions_changed = completions_changed or changed
 
         if success_clis:
-            # Update wrapper script with all registered CLIs
-            wrapper_success, message = update_wrapper_script(registered_clis)
-            if not wrapper_success:
-                self.line(
-                    f"<error>Warning: Failed to update wrapper script: {message}</error>"
+            # Other supercli processes may have changed the registry while
+            # completions were generated: re-read and write it under the lock
+            with exclusive_lock():
+                committed = self._register(
+                    records, transaction, completions_changed, wrapper_mode
                 )
-            else:
-                self.line(f"<info>{message}</info>")
+            if not committed:
+                failed_clis.extend(success_clis)
+                success_clis = []
+        else:
+            transaction.rollback()
 
         # Summary
         if success_clis:
@@ -101,3 +167,80 @@ class AddCommand(Command):
             return 1
 
         return 0
+
+    def _register(
+        self,
+        records: Dict[str, Dict[str, Any]],
+        transaction: FileTransaction,
+        completions_changed: bool = True,
+        wrapper_mode: Optional[str] = None,
+    ) -> bool:
+        """
+        Merge new records into the registry, regenerate the wrapper and commit
+        everything staged in the transaction at once
+
+        A new --wrapper-mode is staged in the same transaction, so it is only
+        remembered if the commit succeeds
+
+        Returns False if the transaction could not be committed (nothing changed)
+        """
+        try:
+            registry = load_registry()
+        except ValueError as e:
+            self.line(f"<error>Warning: Failed to update registry: {e}</error>")
+            registry = None
+
+        wrapper_success, message, wrapper_changed = True, "", False
+        if wrapper_mode:
+            set_wrapper_mode(wrapper_mode, transaction)
+        if registry is not None:
+            for cli_name, record in records.items():
+                # Keep the original added time on --force
+                if cli_name in registry:
+                    record["added_at"] = registry[cli_name]["added_at"]
+                registry[cli_name] = record
+            save_registry(registry, transaction)
+
+            # Update wrapper script with all registered CLIs
+            wrapper_success, message, wrapper_changed = update_wrapper_script(
+                list(registry), transaction
+            )
+            if not wrapper_success:
+                self.line(
+                    f"<error>Warning: Failed to update wrapper script: {message}</error>"
+                )
+
+        try:
+            transaction.commit()
+        except Exception as e:
+            self.line(f"<error>Failed to apply changes, nothing was modified: {e}</error>")
+            return False
+
+        if message and wrapper_success:
+            self.line(f"<info>{message}</info>")
+        if completions_changed:
+            self.line(f"<comment>{RESTART_MESSAGE}</comment>")
+
+        # Nothing on disk changed (e.g. add --force of an unchanged CLI)
+        if wrapper_success and not completions_changed and not wrapper_changed:
+            return True
+
+        # Keep lazy completion stubs in sync
+        loader_message = sync_completion_loader()
+        if loader_message:
+            self.line(f"<info>{loader_message}</info>")
+        return True
+
+    def _refresh_timed(
+        self, cli_name: str, transaction: FileTransaction, index: Dict[str, Dict[str, Any]]
+    ):
+        """Stage one CLI's completion and measure how long generation took"""
+        start = time.perf_counter()
+        result = refresh_cli_completion(
+            cli_name=cli_name,
+            backend_name="supercli",
+            wrapper_name="superclisubs",
+            transaction=transaction,
+            index=index,
+        )
+        return result, time.perf_counter() - start
@@ -0,0 +1,47 @@
+from cleo.commands.command import Command
+
+from cli_manager.utils.completion_loader import (
+    LOADER_BUNDLE,
+    set_loader_mode,
+    sync_completion_loader,
+)
+from cli_manager.utils.install_completion import add_bashrc_loader
+from cli_manager.utils.safe_io import exclusive_lock
+
+
+class CompletionBundleCommand(Command):
+    name = "completion-bundle"
+    description = "Build a single-file bundle of all completions and load it from ~/.bashrc"
+
+    help = """
+    The completion-bundle command concatenates every script in ~/.completions
+    into one bundle, without comments, blank lines, META lines or duplicate
+    helper functions, and switches the ~/.bashrc loader to source only it.
+    
+    Once enabled, add, remove and completion-refresh rebuild the bundle
+    automatically. Use `supercli completion-init --loader eager` to go back.
+    
+    Example:
+        supercli completion-bundle
+    """
+
+    def handle(self) -> int:
+        try:
+            set_loader_mode(LOADER_BUNDLE)
+            message = sync_completion_loader(LOADER_BUNDLE)
+        except Exception as e:
+            self.line(f"<error>Failed to build completion bundle: {e}</error>")
+            return 1
+
+        self.line(f"<info>{message}</info>")
+
+        with exclusive_lock():
+            bashrc_message = add_bashrc_loader(LOADER_BUNDLE)
+        if bashrc_message:
+            if bashrc_message.startswith("Failed"):
+                self.line(f"<error>{bashrc_message}</error>")
+                return 1
+            self.line(f"<info>{bashrc_message}</info>")
+            self.line("<comment>Restart terminal to activate</comment>")
+
+        return 0
@@ -0,0 +1,95 @@
+import os
+
+from cleo.commands.command import Command
+from cleo.helpers import option
+
+from cli_manager.utils.completion_daemon import (
+    create_server,
+    get_pid_path,
+    get_socket_path,
+    is_daemon_running,
+    run_server,
+    stop_daemon,
+    write_daemon_client,
+)
+
+
+class CompletionDaemonCommand(Command):
+    name = "completion-daemon"
+    description = "Serve completions from a background process that keeps CLIs imported"
+
+    options = [
+        option("detach", "d", "Run the daemon in the background", flag=True),
+        option("stop", None, "Stop the running daemon", flag=True),
+        option("status", None, "Show whether the daemon is running", flag=True),
+    ]
+
+    help = """
+    The completion-daemon command starts a local completion server on a Unix
+    socket under $XDG_RUNTIME_DIR (or /tmp/supercli-<uid>). It imports the cleo
+    application behind every managed Python console script once, and answers
+    Tab requests from a small bash client, including dynamic completions from
+    commands that implement complete().
+    
+    The client is installed to ~/.completions/.supercli/daemon.bash and loaded
+    from ~/.bashrc. When the daemon is not running, Tab falls back to the
+    regular completion scripts.
+    
+    CLIs installed with completion-init --cache-ttl SECONDS have their answers
+    cached under the same runtime directory, shared by every open shell. When a
+    fresh answer takes longer than --cache-budget milliseconds, the last cached
+    answer is returned right away and refreshed in the background.
+    
+    Example:
+        supercli completion-daemon --detach
+        supercli completion-daemon --status
+        supercli completion-daemon --stop
+    """
+
+    def handle(self) -> int:
+        if self.option("status"):
+            if is_daemon_running():
+                self.line(
+                    f"<info>Completion daemon is running (pid {get_pid_path().read_text().strip()}) "
+                    f"at {get_socket_path()}</info>"
+                )
+            else:
+                self.line("<comment>Completion daemon is not running.</comment>")
+            return 0
+
+        if self.option("stop"):
+            pid = stop_daemon()
+            if pid is None:
+                self.line("<comment>Completion daemon is not running.</comment>")
+            else:
+                self.line(f"<info>Stopped completion daemon (pid {pid})</info>")
+            return 0
+
+        client_path, cli_names = write_daemon_client()
+        self.line(
+            f"<info>Installed completion daemon client for {len(cli_names)} CLI(s): {client_path}</info>"
+        )
+
+        try:
+            server = create_server(cli_names)
+        except (OSError, RuntimeError) as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+
+        self.line(
+            f"<info>Serving completions for {len(server.served_clis)} CLI(s) at {get_socket_path()}</info>"
+        )
+
+        if self.option("detach"):
+            if os.fork():
+                return 0
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+
+        try:
+            run_server(server)
+        except KeyboardInterrupt:
+            pass
+        return 0
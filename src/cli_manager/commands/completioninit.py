@@ -2,62 +2,190 @@ from cleo.commands.command import Command
 from cleo.helpers import argument, option
 
 from cli_manager.utils.install_completion import (
-    generate_completion,
+    RESTART_MESSAGE,
     add_wrapper_completion,
+    generate_and_install_completion,
     install_completion,
+    wrapper_completion_snippet,
 )
-from cli_manager.utils.meta_parser import add_meta_to_completion
+from cli_manager.utils.completion_index import load_index
+from cli_manager.utils.completion_loader import set_loader_mode, sync_completion_loader
+from cli_manager.utils.fingerprint import compute_fingerprint
+from cli_manager.utils.hash_cleaner import clean_content
+from cli_manager.utils.inprocess_completion import SUBPROCESS_GENERATOR
+from cli_manager.utils.meta_parser import add_meta_to_completion, format_meta_line
+from cli_manager.utils.result_cache import DEFAULT_BUDGET_MS, parse_cache_settings
+from cli_manager.utils.shells import (
+    BASH,
+    ZSH,
+    compile_zsh_completions,
+    get_shell_completion_dir,
+    validate_shell,
+)
+from cli_manager.utils.startup_profile import format_profile, profile_command
+from cli_manager.utils.static_completion import install_static_completion
+from cli_manager.utils.transaction import FileTransaction
 
 
 class CompletionInitCommand(Command):
     name = "completion-init"
-    description = "Install bash completion for any CLI to ~/.completions/"
+    description = "Install bash, zsh or fish completion for any CLI to ~/.completions/"
 
     arguments = [
         argument("cli_name", "Name of the CLI to install completion for", optional=True)
     ]
 
     options = [
-        option("wrapper", "w", "Also setup completion for a wrapper script", flag=False)
+        option("wrapper", "w", "Also setup completion for a wrapper script", flag=False),
+        option(
+            "shell",
+            "s",
+            "Completion format to install: bash, zsh (autoloaded from fpath, precompiled with zcompile) or fish (autoloaded)",
+            flag=False,
+            default=BASH,
+        ),
+        option(
+            "loader",
+            "l",
+            "How ~/.bashrc loads completions: eager (source all at startup), lazy (source on first Tab) or bundle (source one prebuilt file)",
+            flag=False,
+        ),
+        option(
+            "static",
+            None,
+            "Generate a pure-bash completion from the CLI's cleo commands and options (Python runs on Tab only for commands implementing complete())",
+            flag=True,
+        ),
+        option(
+            "isolated",
+            None,
+            "Always run the CLI in a separate process to generate its completion instead of importing it (remembered)",
+            flag=True,
+        ),
+        option(
+            "profile",
+            "p",
+            "Report how long the CLI takes to emit its completion script (with import times for Python CLIs)",
+            flag=True,
+        ),
+        option(
+            "cache-ttl",
+            None,
+            "Let the completion daemon cache this CLI's dynamic completions for this many seconds (0 disables, remembered)",
+            flag=False,
+        ),
+        option(
+            "cache-budget",
+            None,
+            f"Milliseconds to wait for a fresh result before answering from a stale cache (default: {DEFAULT_BUDGET_MS})",
+            flag=False,
+        ),
     ]
 
     def handle(self) -> int:
         # CLI 이름 결정
         cli_name = self.argument("cli_name") or self.application.name
         wrapper_name = self.option("wrapper")
+        loader_mode = self.option("loader")
 
-        # completion 생성
-        completion_script, message = generate_completion(cli_name)
-        if completion_script:
-            self.line(f"<comment>{message}</comment>")
-        else:
-            self.line(f"<error>{message}</error>")
+        try:
+            shell = validate_shell(self.option("shell"))
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+        if wrapper_name and shell != BASH:
+            self.line("<error>--wrapper is only supported for bash completions</error>")
             return 1
+        if self.option("static") and (shell != BASH or self.option("profile")):
+            self.line("<error>--static only supports bash and cannot be combined with --profile</error>")
+            return 1
+        if self.option("static") and self.option("isolated"):
+            self.line("<error>--static imports the CLI and cannot be combined with --isolated</error>")
+            return 1
+        generator = SUBPROCESS_GENERATOR if self.option("isolated") else None
 
-        # wrapper completion도 필요하면 추가
-        if wrapper_name:
-            completion_script = add_wrapper_completion(
-                completion_script, wrapper_name, cli_name
-            )
+        # 로더 모드 저장 (설치 시 .bashrc 로더에 반영됨)
+        if loader_mode:
+            try:
+                set_loader_mode(loader_mode)
+            except ValueError as e:
+                self.line(f"<error>{e}</error>")
+                return 1
 
-        # meta 정보 추가
-        completion_script = add_meta_to_completion(
-            self.application.name,  # backend name으로 app 이름 사용
-            cli_name,
-            wrapper_name or cli_name,
-            completion_script,
-        )
+        try:
+            cache = self._cache_settings(cli_name, shell)
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
 
-        # 설치
-        success, messages = install_completion(
-            cli_name, completion_script, wrapper_name
-        )
+        # 생성 + 설치 (--profile이 아니면 CLI 출력을 메모리에 모으지 않고 바로 파일로)
+        # completion 파일, .bashrc 로더, index는 transaction으로 모아 한 번에 반영
+        transaction = FileTransaction()
+        if self.option("static"):
+            success, messages, changed = install_static_completion(
+                cli_name,
+                self.application.name,
+                wrapper_name,
+                fingerprint=compute_fingerprint(cli_name),
+                cache=cache,
+                transaction=transaction,
+            )
+        elif self.option("profile"):
+            success, messages, changed = self._install_profiled(
+                cli_name, wrapper_name, transaction, cache, shell, generator
+            )
+        else:
+            meta_line = format_meta_line(
+                self.application.name,  # backend name으로 app 이름 사용
+                cli_name,
+                wrapper_name or cli_name,
+                fingerprint=compute_fingerprint(cli_name),
+                cache=cache,
+                shell=shell,
+                generator=generator,
+            )
+            footer = (
+                (lambda function: wrapper_completion_snippet(wrapper_name, cli_name, function))
+                if wrapper_name
+                else ""
+            )
+            success, messages, changed = generate_and_install_completion(
+                cli_name,
+                meta_line + "\n",
+                wrapper_name,
+                footer,
+                transaction,
+                shell=shell,
+                in_process=generator is None,
+            )
+        if success:
+            try:
+                transaction.commit()
+            except Exception as e:
+                success, messages, changed = False, [f"Failed to install completion: {e}"], False
+        else:
+            transaction.rollback()
 
         if success:
+            self.line(f"<comment>Generated completion for {cli_name}</comment>")
+            if changed:
+                messages.append(RESTART_MESSAGE)
+
+            if shell == ZSH:
+                # 첫 Tab에서 원본 대신 읽을 .zwc 생성 (zsh가 없으면 건너뜀)
+                compile_message = compile_zsh_completions()
+                if compile_message:
+                    messages.append(compile_message)
+            else:
+                # lazy 모드면 stub 갱신
+                loader_message = sync_completion_loader()
+                if loader_message:
+                    messages.append(loader_message)
+
             for msg in messages:
                 if msg.startswith("✅"):
                     self.line(f"<info>{msg}</info>")
-                elif msg.startswith("Added completion loader"):
+                elif msg.startswith(("Added completion loader", "Switched completion loader")):
                     self.line(f"<info>{msg}</info>")
                 else:
                     self.line(f"<comment>{msg}</comment>")
@@ -66,3 +194,72 @@ class CompletionInitCommand(Command):
             for msg in messages:
                 self.line(f"<error>{msg}</error>")
             return 1
+
+    def _cache_settings(self, cli_name: str, shell: str = BASH):
+        """
+        Result cache settings for the META header
+
+        Without --cache-ttl the CLI keeps what it had; --cache-ttl 0 turns it off.
+        """
+        ttl = self.option("cache-ttl")
+        budget = self.option("cache-budget")
+        if ttl is None:
+            previous = load_index(get_shell_completion_dir(shell)).get(cli_name) or {}
+            cache = previous.get("cache")
+            if budget is None or not cache:
+                return cache
+            ttl = cache["ttl"]
+
+        try:
+            if float(ttl) == 0:
+                return None
+        except ValueError:
+            pass
+        cache = {"ttl": ttl, "budget_ms": DEFAULT_BUDGET_MS if budget is None else budget}
+        settings = parse_cache_settings(cache)
+        if settings is None:
+            raise ValueError(
+                "--cache-ttl must be a positive number of seconds and "
+                "--cache-budget a non-negative number of milliseconds"
+            )
+        return settings
+
+    def _install_profiled(
+        self,
+        cli_name: str,
+        wrapper_name,
+        transaction: FileTransaction,
+        cache=None,
+        shell: str = BASH,
+        generator=None,
+    ):
+        """generate_and_install_completion과 같지만 실행 시간과 import 내역을 함께 출력"""
+        profile = profile_command([cli_name, "completions", shell])
+        self.line(format_profile(profile))
+
+        if profile["returncode"] == 127 and not profile["stdout"]:
+            return None, [f"{cli_name} not found in PATH"], False
+        if profile["returncode"] != 0:
+            return None, [
+                f"Failed to generate completion for {cli_name}: "
+                f"exit status {profile['returncode']}"
+            ], False
+
+        completion_script = clean_content(profile["stdout"], cli_name)
+        if wrapper_name:
+            completion_script = add_wrapper_completion(
+                completion_script, wrapper_name, cli_name
+            )
+        completion_script = add_meta_to_completion(
+            self.application.name,
+            cli_name,
+            wrapper_name or cli_name,
+            completion_script,
+            fingerprint=compute_fingerprint(cli_name),
+            cache=cache,
+            shell=shell,
+            generator=generator,
+        )
+        return install_completion(
+            cli_name, completion_script, wrapper_name, transaction, shell=shell
+        )
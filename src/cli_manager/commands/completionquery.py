@@ -0,0 +1,38 @@
+from cleo.commands.command import Command
+from cleo.helpers import argument
+
+from cli_manager.utils.completion_daemon import complete_words, load_application
+
+
+class CompletionQueryCommand(Command):
+    name = "completion-query"
+    description = "Print dynamic completions for a CLI (called by static completion scripts)"
+    hidden = True
+
+    arguments = [
+        argument("cli_name", "Name of the CLI to complete"),
+        argument("cword", "Index of the word being completed"),
+        argument("words", "The command line words (COMP_WORDS)", optional=True, multiple=True),
+    ]
+
+    help = """
+    The completion-query command imports a cleo console script and prints the
+    completions for one command line, one per line. Static completion scripts
+    (completion-init --static) call it only for commands that implement
+    complete(). Pass the words after -- so that options are not parsed:
+
+        supercli completion-query -- subcli1 2 subcli1 example-command ''
+    """
+
+    def handle(self) -> int:
+        application = load_application(self.argument("cli_name"))
+        if application is None:
+            return 1
+        try:
+            cword = int(self.argument("cword"))
+        except ValueError:
+            return 1
+
+        for completion in complete_words(application, self.argument("words"), cword):
+            self.line(completion)
+        return 0
@@ -1,15 +1,32 @@
 from cleo.commands.command import Command
-from cleo.helpers import argument
+from cleo.helpers import argument, option
 
+from cli_manager.utils.completion_engine import parse_jobs
+from cli_manager.utils.completion_index import load_index
+from cli_manager.utils.completion_loader import sync_completion_loader
 from cli_manager.utils.managed_completion import (
     refresh_cli_completion,
     refresh_all_completions,
 )
+from cli_manager.utils.registry import load_registry
+from cli_manager.utils.safe_io import exclusive_lock
+from cli_manager.utils.shells import (
+    BASH,
+    ZSH,
+    compile_zsh_completions,
+    get_shell_completion_dir,
+    installed_shells,
+    validate_shell,
+)
+from cli_manager.utils.wrapper_utils import (
+    get_wrapper_completion_path,
+    write_wrapper_completion,
+)
 
 
 class CompletionRefreshCommand(Command):
     name = "completion-refresh"
-    description = "Refresh bash completions for managed CLIs"
+    description = "Refresh bash, zsh and fish completions for managed CLIs"
 
     arguments = [
         argument(
@@ -19,17 +36,98 @@ class CompletionRefreshCommand(Command):
         )
     ]
 
+    options = [
+        option(
+            "force",
+            "f",
+            "Regenerate even if the CLI executable has not changed",
+            flag=True,
+        ),
+        option(
+            "jobs",
+            "j",
+            "Number of CLIs to refresh in parallel",
+            flag=False,
+        ),
+        option(
+            "shell",
+            "s",
+            "Only refresh completions for this shell (bash, zsh or fish; default: every installed shell)",
+            flag=False,
+        ),
+    ]
+
     def handle(self) -> int:
         cli_name = self.argument("cli_name")
+        force: bool = self.option("force")
+
+        try:
+            jobs = parse_jobs(self.option("jobs"))
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+
+        try:
+            shell = self.option("shell")
+            shells = [validate_shell(shell)] if shell else installed_shells()
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+
+        success, messages = True, []
+        # 처리한 CLI마다 completion 파일을 바꿨는지 여부 (셸마다 따로)
+        changes = []
+        for shell in shells:
+            if cli_name:
+                # 특정 CLI completion 갱신 (zsh/fish는 그 셸에 설치된 경우만)
+                index = load_index(get_shell_completion_dir(shell))
+                if shell != BASH and cli_name not in index:
+                    continue
+                shell_success, shell_messages, changed = refresh_cli_completion(
+                    cli_name,
+                    self.application.name,  # backend name으로 app 이름 사용
+                    skip_unchanged=not force,
+                    shell=shell,
+                    index=index,
+                )
+                if shell_success:
+                    changes.append(changed)
+            else:
+                # 모든 completion 갱신
+                shell_success, shell_messages, shell_changes = refresh_all_completions(
+                    self.application.name, jobs=jobs, force=force, shell=shell
+                )
+                changes.extend(shell_changes.values())
+            success = success and shell_success
+            messages.extend(shell_messages)
+
+            if shell == ZSH:
+                # 바뀐 파일만 다시 zcompile (zsh가 없으면 건너뜀)
+                compile_message = compile_zsh_completions()
+                if compile_message:
+                    messages.append(compile_message)
+
+        changed = sum(changes)
+        unchanged = len(changes) - changed
+
+        # 아무것도 바뀌지 않았으면 superclisubs completion/로더 파일도 그대로 둠
+        if changed:
+            # 새로 설치되거나 사라진 backend를 superclisubs completion에 반영
+            if get_wrapper_completion_path().exists():
+                try:
+                    # registry를 읽고 쓸 때까지 잠가야 그 사이 add가 추가한 CLI를 덮어쓰지 않음
+                    with exclusive_lock():
+                        write_wrapper_completion(list(load_registry()))
+                except (OSError, ValueError) as e:
+                    messages.append(f"Failed to update superclisubs completion: {e}")
+                    success = False
+
+            # lazy 모드면 stub 갱신
+            loader_message = sync_completion_loader()
+            if loader_message:
+                messages.append(loader_message)
 
-        if cli_name:
-            # 특정 CLI completion 갱신
-            success, messages = refresh_cli_completion(
-                cli_name, self.application.name  # backend name으로 app 이름 사용
-            )
-        else:
-            # 모든 completion 갱신
-            success, messages = refresh_all_completions(self.application.name)
+        messages.append(f"{changed} changed, {unchanged} unchanged")
 
         # 결과 출력
         for msg in messages:
@@ -2,8 +2,12 @@ from typing import List
 from cleo.commands.command import Command
 from cleo.helpers import argument, option
 
-from ..utils.wrapper_utils import get_registered_clis, update_wrapper_script
+from ..utils.wrapper_utils import update_wrapper_script
 from ..utils.completion_utils import remove_cli_completion
+from ..utils.completion_loader import sync_completion_loader
+from ..utils.registry import load_registry, save_registry
+from ..utils.safe_io import exclusive_lock
+from ..utils.transaction import FileTransaction
 
 
 class RemoveCommand(Command):
@@ -31,7 +35,7 @@ class RemoveCommand(Command):
     The remove command unregisters CLIs from supercli management.
     
     It will:
-    1. Remove the CLI from superclisubs wrapper
+    1. Remove the CLI from the supercli registry and superclisubs wrapper
     2. Remove the completion script
     3. Update the wrapper completion
     
@@ -46,12 +50,16 @@ class RemoveCommand(Command):
         force: bool = self.option("force")
         
         # Get currently registered CLIs
-        registered_clis = get_registered_clis()
+        try:
+            registry = load_registry()
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
         
         # Confirm removal if not forced
         if not force:
-            not_found = [cli for cli in cli_names if cli not in registered_clis]
-            to_remove = [cli for cli in cli_names if cli in registered_clis]
+            not_found = [cli for cli in cli_names if cli not in registry]
+            to_remove = [cli for cli in cli_names if cli in registry]
             
             if not to_remove:
                 self.line("<error>None of the specified CLIs are registered.</error>")
@@ -68,17 +76,32 @@ class RemoveCommand(Command):
                 self.line("<comment>Operation cancelled.</comment>")
                 return 0
         
+        # Hold the lock from re-reading the registry until the wrapper is
+        # rewritten so concurrent adds/removes are not lost
+        with exclusive_lock():
+            return self._remove(cli_names)
+
+    def _remove(self, cli_names: List[str]) -> int:
+        """Remove CLIs from the registry and regenerate the wrapper"""
+        try:
+            registry = load_registry()
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+
         success_clis: List[str] = []
         failed_clis: List[str] = []
+        # Every file change is staged and applied together after the loop
+        transaction = FileTransaction()
         
         for cli_name in cli_names:
             try:
-                if cli_name not in registered_clis:
+                if cli_name not in registry:
                     self.line(f"<comment>CLI '{cli_name}' is not registered, skipping.</comment>")
                     continue
                 
                 # Remove completion script
-                success, message = remove_cli_completion(cli_name)
+                success, message = remove_cli_completion(cli_name, transaction)
                 if not success:
                     self.line(f"<error>{message}</error>")
                     failed_clis.append(cli_name)
@@ -87,7 +110,7 @@ class RemoveCommand(Command):
                 self.line(f"<info>{message}</info>")
                 
                 # Remove from registered list
-                registered_clis.remove(cli_name)
+                del registry[cli_name]
                 success_clis.append(cli_name)
                 
             except Exception as e:
@@ -95,12 +118,29 @@ class RemoveCommand(Command):
                 failed_clis.append(cli_name)
         
         if success_clis:
+            save_registry(registry, transaction)
+
             # Update wrapper script with remaining CLIs
-            wrapper_success, message = update_wrapper_script(registered_clis)
+            wrapper_success, message, _ = update_wrapper_script(list(registry), transaction)
             if not wrapper_success:
                 self.line(f"<error>Warning: Failed to update wrapper script: {message}</error>")
+
+            try:
+                transaction.commit()
+            except Exception as e:
+                self.line(f"<error>Failed to apply changes, nothing was modified: {e}</error>")
+                failed_clis.extend(success_clis)
+                success_clis = []
             else:
-                self.line(f"<info>{message}</info>")
+                if wrapper_success:
+                    self.line(f"<info>{message}</info>")
+
+                # Keep lazy completion stubs in sync
+                loader_message = sync_completion_loader()
+                if loader_message:
+                    self.line(f"<info>{loader_message}</info>")
+        else:
+            transaction.rollback()
         
         # Summary
         if success_clis:
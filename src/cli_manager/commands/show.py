@@ -1,13 +1,21 @@
-from typing import List, Dict
-import shutil
+from typing import Any, Dict, Iterator, List, Optional, Set
+from fnmatch import fnmatchcase
 from pathlib import Path
 from cleo.commands.command import Command
 from cleo.helpers import option
+from cleo.io.outputs.output import Type as OutputType
 from cleo.ui.table import Table
+import json
 import os
 
-from ..utils.wrapper_utils import get_registered_clis, get_wrapper_script_path
-from ..utils.completion_utils import get_completion_dir
+from ..utils.wrapper_utils import get_wrapper_script_path
+from ..utils.safe_io import get_completion_dir
+from ..utils.completion_index import load_index
+from ..utils.path_index import which
+from ..utils.registry import load_registry
+
+
+FORMATS = ("table", "json", "ndjson")
 
 
 class ShowCommand(Command):
@@ -20,7 +28,21 @@ class ShowCommand(Command):
             "c",
             "Check if registered CLIs are actually available in PATH",
             flag=True
-        )
+        ),
+        option(
+            "format",
+            None,
+            "Output format: table, json or ndjson (one JSON object per CLI, streamed)",
+            flag=False,
+            default="table",
+        ),
+        option(
+            "filter",
+            None,
+            "Only show CLIs whose name matches this glob pattern (e.g. 'git*')",
+            flag=False,
+        ),
+        option("limit", None, "Show at most this many CLIs", flag=False),
     ]
     
     help = """
@@ -34,24 +56,48 @@ class ShowCommand(Command):
     Example:
         supercli show
         supercli show --check
+        supercli show --format ndjson --filter 'git*' --limit 20
     """
     
     def handle(self) -> int:
         check_availability: bool = self.option("check")
-        registered_clis = get_registered_clis()
-        
-        if not registered_clis:
+        output_format = self.option("format")
+        if output_format not in FORMATS:
+            self.line(
+                f"<error>--format must be one of {', '.join(FORMATS)}, got '{output_format}'</error>"
+            )
+            return 1
+        try:
+            limit = self._parse_limit(self.option("limit"))
+            registered_clis = list(load_registry())
+        except ValueError as e:
+            self.line(f"<error>{e}</error>")
+            return 1
+
+        any_registered = bool(registered_clis)
+        pattern = self.option("filter")
+        if pattern:
+            registered_clis = [cli for cli in registered_clis if fnmatchcase(cli, pattern)]
+        if limit is not None:
+            registered_clis = registered_clis[:limit]
+
+        completion_dir = get_completion_dir()
+        rows = self._iter_rows(registered_clis, completion_dir, check_availability)
+
+        if output_format == "ndjson":
+            for row in rows:
+                self._write_raw(json.dumps(row, separators=(",", ":")))
+            return 0
+        if output_format == "json":
+            self._write_raw(json.dumps(list(rows), indent=2))
+            return 0
+
+        if not any_registered:
             self.line("<comment>No CLIs are registered.</comment>")
             return 0
-            
-        # Get completion status for all CLIs
-        completion_dir = get_completion_dir()
-        completion_status = self._get_completion_status(registered_clis, completion_dir)
-        
-        # Get CLI availability if requested
-        cli_availability = {}
-        if check_availability:
-            cli_availability = self._check_cli_availability(registered_clis)
+        if not registered_clis:
+            self.line("<comment>No registered CLIs match the filter.</comment>")
+            return 0
         
         # Create and configure table
         table = Table(self.io)
@@ -61,14 +107,14 @@ class ShowCommand(Command):
         table.set_headers(headers)
         
         # Add rows
-        for cli in registered_clis:
-            row = [
-                cli,
-                self._format_completion_status(completion_status[cli])
+        for row in rows:
+            cells = [
+                row["name"],
+                self._format_completion_status(row["completion"])
             ]
             if check_availability:
-                row.append(self._format_availability(cli_availability[cli]))
-            table.add_row(row)
+                cells.append(self._format_availability(row["available"]))
+            table.add_row(cells)
         
         # Show wrapper script status
         wrapper_path = get_wrapper_script_path()
@@ -97,22 +143,59 @@ class ShowCommand(Command):
         
         return 0
     
-    def _get_completion_status(
-        self, clis: List[str], completion_dir: Path
-    ) -> Dict[str, bool]:
-        """Check completion script status for each CLI"""
-        status = {}
+    def _iter_rows(
+        self, clis: List[str], completion_dir: Path, check_availability: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one status row per CLI as soon as it is known"""
+        installed = self._get_completion_files(clis, completion_dir)
         for cli in clis:
-            completion_file = completion_dir / cli
-            status[cli] = completion_file.is_file()
-        return status
-    
-    def _check_cli_availability(self, clis: List[str]) -> Dict[str, bool]:
-        """Check if CLIs are available in PATH"""
-        status = {}
+            completion_file = installed.get(cli)
+            row: Dict[str, Any] = {
+                "name": cli,
+                "completion": completion_file is not None,
+                "completion_file": str(completion_file) if completion_file else None,
+            }
+            if check_availability:
+                row["available"] = which(cli) is not None
+            yield row
+
+    def _get_completion_files(
+        self, clis: List[str], completion_dir: Path
+    ) -> Dict[str, Path]:
+        """
+        Find the installed completion file of each CLI
+
+        One directory listing tells which files exist, and the completion
+        index maps CLIs to files whose name differs from the CLI name.
+        """
+        try:
+            with os.scandir(completion_dir) as it:
+                names: Set[str] = {entry.name for entry in it}
+        except OSError:
+            return {}
+
+        index = load_index(completion_dir)
+        files = {}
         for cli in clis:
-            status[cli] = shutil.which(cli) is not None
-        return status
+            file_name = index.get(cli, {}).get("file", cli)
+            if file_name in names:
+                files[cli] = completion_dir / file_name
+        return files
+
+    def _parse_limit(self, value: Optional[str]) -> Optional[int]:
+        if value is None or value == "":
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = -1
+        if limit < 0:
+            raise ValueError(f"--limit must be a non-negative integer, got '{value}'")
+        return limit
+
+    def _write_raw(self, text: str) -> None:
+        """Write machine-readable output without formatter tag processing"""
+        self.io.write_line(text, type=OutputType.RAW)
     
     def _format_completion_status(self, status: bool) -> str:
         """Format completion status for display"""
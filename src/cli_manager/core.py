@@ -1,9 +1,44 @@
+import os
+import sys
+import time
+from importlib import import_module
+
 from cleo.application import Application
-from cli_manager.commands.add import AddCommand
-from cli_manager.commands.remove import RemoveCommand
-from cli_manager.commands.show import ShowCommand
-from cli_manager.commands.completioninit import CompletionInitCommand
-from cli_manager.commands.completionrefresh import CompletionRefreshCommand
+from cleo.io.inputs.definition import Definition
+from cleo.io.inputs.option import Option
+from cleo.loaders.factory_command_loader import FactoryCommandLoader
+
+
+# 명령 이름 -> (모듈, 클래스). 실행하는 명령의 모듈만 import되도록 lazy loader로 등록
+COMMANDS = {
+    "add": ("cli_manager.commands.add", "AddCommand"),
+    "remove": ("cli_manager.commands.remove", "RemoveCommand"),
+    "show": ("cli_manager.commands.show", "ShowCommand"),
+    "completion-init": ("cli_manager.commands.completioninit", "CompletionInitCommand"),
+    "completion-refresh": (
+        "cli_manager.commands.completionrefresh",
+        "CompletionRefreshCommand",
+    ),
+    "completion-bundle": (
+        "cli_manager.commands.completionbundle",
+        "CompletionBundleCommand",
+    ),
+    "completion-daemon": (
+        "cli_manager.commands.completiondaemon",
+        "CompletionDaemonCommand",
+    ),
+    "completion-query": (
+        "cli_manager.commands.completionquery",
+        "CompletionQueryCommand",
+    ),
+}
+
+
+def _command_factory(module_name: str, class_name: str):
+    def factory():
+        return getattr(import_module(module_name), class_name)()
+
+    return factory
 
 
 class SupercliApplication(Application):
@@ -16,14 +51,58 @@ class SupercliApplication(Application):
     def __init__(self):
         super().__init__()
         self.set_name("supercli")
-        self.add(AddCommand())
-        self.add(RemoveCommand())
-        self.add(ShowCommand())
-        self.add(CompletionInitCommand())
-        self.add(CompletionRefreshCommand())
+        self.set_command_loader(
+            FactoryCommandLoader(
+                {
+                    name: _command_factory(module_name, class_name)
+                    for name, (module_name, class_name) in COMMANDS.items()
+                }
+            )
+        )
+
+    @property
+    def _default_definition(self) -> Definition:
+        definition = super()._default_definition
+        # main()이 application을 만들기 전에 처리함 (도움말 표시용)
+        definition.add_option(
+            Option(
+                "--profile-startup",
+                flag=True,
+                description=(
+                    "Profile imports, application construction and command dispatch "
+                    "(or set SUPERCLI_PROFILE_STARTUP=1|json|<file.json>)."
+                ),
+            )
+        )
+        return definition
+
+
+def _run_timed(report_path: str) -> int:
+    """startup 프로파일링 대상 자식 프로세스: 구성/실행 시간을 기록하며 실행"""
+    start = time.perf_counter()
+    app = SupercliApplication()
+    constructed = time.perf_counter()
+    app.auto_exits(False)
+    exit_code = app.run()
+    finished = time.perf_counter()
+
+    with open(report_path, "w") as f:
+        f.write(f"{(constructed - start) * 1000:.3f} {(finished - constructed) * 1000:.3f}\n")
+    return exit_code
 
 
 def main():
+    report_path = os.environ.get("SUPERCLI_PROFILE_REPORT")
+    if report_path:
+        sys.exit(_run_timed(report_path))
+
+    if "--profile-startup" in sys.argv[1:] or os.environ.get("SUPERCLI_PROFILE_STARTUP"):
+        from cli_manager.utils.startup_profile import profile_supercli, requested_profile_mode
+
+        mode = requested_profile_mode(sys.argv[1:])
+        if mode:
+            sys.exit(profile_supercli(sys.argv[1:], mode))
+
     app = SupercliApplication()
     app.run()
 
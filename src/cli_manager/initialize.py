@@ -1,15 +1,7 @@
-import subprocess
-import shutil
-import os
-from pathlib import Path
-from typing import List
-
-from cli_manager.utils.install_completion import (
-    install_completion,
-    generate_completion,
-    add_wrapper_completion,
-)
-from cli_manager.utils.meta_parser import add_meta_to_completion
+from cli_manager.utils.completion_engine import generate_completions
+from cli_manager.utils.install_completion import RESTART_MESSAGE, install_completion
+from cli_manager.utils.transaction import FileTransaction
+from cli_manager.utils.wrapper_utils import get_wrapper_script_path, update_wrapper_script
 
 
 # 모든 registered CLI 목록 (completion과 공유)
@@ -18,49 +10,35 @@ REGISTERED_CLIS = ["subcli1", "subcli2"]
 
 def install_supercli():
     """superclisubs wrapper 스크립트 설치 및 completion 설정"""
-    # wrapper 스크립트 설치
-    local_bin = Path.home() / ".local" / "bin"
-    target_file = local_bin / "superclisubs"
-
-    local_bin.mkdir(parents=True, exist_ok=True)
-
-    script_content = f"""#!/bin/bash
-# superclisubs wrapper script
-
-registered_clis="{' '.join(REGISTERED_CLIS)}"
-
-if [[ " $registered_clis " =~ " $1 " ]]; then
-    "$@"
-else
-    echo "Unknown command: $1"
-    echo "Available commands: $registered_clis"
-    exit 1
-fi
-"""
-    target_file.write_text(script_content)
-    subprocess.run(["chmod", "+x", str(target_file)], check=True)
+    # wrapper 스크립트, completion, .bashrc 로더를 모아서 마지막에 한 번에 반영
+    transaction = FileTransaction()
 
-    print(f"✅ superclisubs installed to {target_file}")
-    print("✅ Execute permission set - available globally!")
-
-    # registered CLI들의 completion 설치
-    for cli in REGISTERED_CLIS:
-        completion_script, message = generate_completion(cli)
+    # registered CLI들의 completion 설치 (생성은 병렬, 설치는 순서대로)
+    for cli, completion_script, message in generate_completions(REGISTERED_CLIS):
         if completion_script:
             print(f"Installing completion for {cli}...")
-            success, messages = install_completion(cli, completion_script)
+            success, messages, _ = install_completion(
+                cli, completion_script, transaction=transaction
+            )
             for msg in messages:
                 print(msg)
 
-    # superclisubs completion 설치
-    print("Installing completion for superclisubs...")
-    wrapper_script = add_wrapper_completion("superclisubs", "supercli", REGISTERED_CLIS)
-    wrapper_script = add_meta_to_completion(
-        "supercli", "supercli", "superclisubs", wrapper_script
-    )
-    success, messages = install_completion("superclisubs", wrapper_script)
-    for msg in messages:
-        print(msg)
+    # wrapper 스크립트와 superclisubs completion (위에서 stage한 completion으로 라우팅)
+    success, message, _ = update_wrapper_script(REGISTERED_CLIS, transaction)
+    if not success:
+        transaction.rollback()
+        print(message)
+        return
+
+    try:
+        transaction.commit()
+    except Exception as e:
+        print(f"Failed to install supercli, nothing was modified: {e}")
+        return
+
+    print(f"✅ superclisubs installed to {get_wrapper_script_path()}")
+    print("✅ Execute permission set - available globally!")
+    print(RESTART_MESSAGE)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .completion_index import INDEX_DIR_NAME, load_index
+from .safe_io import atomic_write_text
+
+
+BUNDLE_FILE_NAME = "bundle.bash"
+
+# name() {  /  name()  /  function name {  형태의 함수 정의 시작
+FUNCTION_START_PATTERN = re.compile(
+    r"^(?:function\s+)?([A-Za-z_][\w:.-]*)\s*(?:\(\s*\))?\s*\{?\s*$"
+)
+
+
+def get_bundle_path(completion_dir: Optional[Path] = None) -> Path:
+    """completion bundle 파일 경로 반환"""
+    completion_dir = completion_dir or Path.home() / ".completions"
+    return completion_dir / INDEX_DIR_NAME / BUNDLE_FILE_NAME
+
+
+def minify_completion_script(content: str) -> str:
+    """
+    completion script에서 주석(META 포함)과 빈 줄 제거
+
+    heredoc이 있는 스크립트는 본문을 망가뜨릴 수 있으므로 META 줄만 제거한다.
+    """
+    lines = content.splitlines()
+    if any("<<" in line for line in lines):
+        return "\n".join(line for line in lines if not line.startswith("# META: "))
+
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def split_top_level_blocks(content: str) -> List[Tuple[Optional[str], str]]:
+    """
+    스크립트를 최상위 함수 정의와 나머지 줄로 분리
+
+    함수는 정의 시작 줄부터 첫 칸의 `}` 줄까지를 하나의 블록으로 본다.
+
+    Returns:
+        (함수 이름 또는 None, 블록 내용) 리스트
+    """
+    blocks: List[Tuple[Optional[str], str]] = []
+    lines = content.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        match = FUNCTION_START_PATTERN.match(line)
+        is_function = match and (
+            "()" in line.replace(" ", "") or line.startswith("function ")
+        )
+        if not is_function:
+            blocks.append((None, line))
+            i += 1
+            continue
+
+        end = i + 1
+        while end < len(lines) and lines[end].rstrip() != "}":
+            end += 1
+        if end >= len(lines):
+            # 닫는 괄호를 찾지 못하면 함수로 취급하지 않음
+            blocks.append((None, line))
+            i += 1
+            continue
+
+        blocks.append((match.group(1), "\n".join(lines[i : end + 1])))
+        i = end + 1
+    return blocks
+
+
+def build_bundle(completion_files: List[Path]) -> str:
+    """
+    여러 completion 파일을 하나의 bundle 스크립트로 합침
+
+    - 주석, 빈 줄, META 줄 제거
+    - 앞에서 이미 같은 내용으로 정의된 함수는 생략
+      (내용이 다르면 source 순서대로 덮어쓰도록 그대로 둠)
+    """
+    emitted_functions: Dict[str, str] = {}
+    parts = ["# supercli completion bundle (generated by supercli, do not edit)"]
+
+    for completion_file in completion_files:
+        try:
+            content = completion_file.read_text()
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        kept = []
+        for name, block in split_top_level_blocks(minify_completion_script(content)):
+            if name is not None:
+                if emitted_functions.get(name) == block:
+                    continue
+                emitted_functions[name] = block
+            kept.append(block)
+
+        if kept:
+            parts.append("\n".join(kept))
+
+    return "\n".join(parts) + "\n"
+
+
+def write_bundle(completion_dir: Optional[Path] = None) -> Tuple[Path, int]:
+    """
+    completion 디렉토리의 모든 completion 파일로 bundle을 다시 만듦
+
+    임시 파일에 쓴 뒤 rename하므로 셸이 반쯤 쓰인 bundle을 source하지 않는다.
+
+    Returns:
+        (bundle 경로, 포함된 파일 수)
+    """
+    completion_dir = completion_dir or Path.home() / ".completions"
+    index = load_index(completion_dir)
+    files: Set[str] = {entry["file"] for entry in index.values()}
+    completion_files = [completion_dir / name for name in sorted(files)]
+
+    bundle_path = get_bundle_path(completion_dir)
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(bundle_path, build_bundle(completion_files))
+
+    return bundle_path, len(completion_files)
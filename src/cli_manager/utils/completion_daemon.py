@@ -0,0 +1,504 @@
+import os
+import signal
+import shlex
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cleo.application import Application
+
+from .completion_index import INDEX_DIR_NAME, get_index_path, load_index
+from .meta_parser import extract_complete_function
+from .result_cache import ResultCache, make_cache_key, parse_cache_settings
+from .safe_io import atomic_write_text, exclusive_lock
+from .fingerprint import get_console_scripts
+
+
+PROTOCOL_VERSION = "v1"
+SOCKET_FILE_NAME = "complete.sock"
+PID_FILE_NAME = "complete.pid"
+CLIENT_FILE_NAME = "daemon.bash"
+CACHE_DIR_NAME = "cache"
+
+# client가 응답을 기다리는 최대 시간 (초). 넘기면 일반 completion으로 돌아간다
+CLIENT_TIMEOUT_SECONDS = 0.5
+
+# 데몬 client를 source하는 .bashrc 로더
+BASHRC_DAEMON_LOADER = f"""
+# Ask the supercli completion daemon first (falls back when it is not running)
+[ -r ~/.completions/{INDEX_DIR_NAME}/{CLIENT_FILE_NAME} ] && source ~/.completions/{INDEX_DIR_NAME}/{CLIENT_FILE_NAME}
+"""
+
+
+class _ApplicationCaptured(Exception):
+    def __init__(self, application: Application):
+        self.application = application
+
+
+_load_lock = threading.Lock()
+
+
+def get_runtime_dir() -> Path:
+    """
+    데몬 소켓 디렉토리 반환
+
+    $XDG_RUNTIME_DIR/supercli, 없으면 /tmp/supercli-<uid>
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "supercli"
+    return Path("/tmp") / f"supercli-{os.getuid()}"
+
+
+def ensure_runtime_dir() -> Path:
+    """
+    데몬 소켓 디렉토리를 만들고 이 사용자 전용인지 확인
+
+    /tmp 아래는 다른 사용자가 같은 이름을 미리 만들어 둘 수 있으므로, 만든 뒤
+    lstat으로 심볼릭 링크가 아닌 디렉토리이고 소유자가 나이며 group/other 권한이
+    없는지 확인한다.
+
+    Raises:
+        RuntimeError: 디렉토리를 믿을 수 없는 경우
+    """
+    runtime_dir = get_runtime_dir()
+    runtime_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    info = os.lstat(runtime_dir)
+    if not stat.S_ISDIR(info.st_mode):
+        raise RuntimeError(f"Refusing to use {runtime_dir}: not a directory")
+    if info.st_uid != os.getuid():
+        raise RuntimeError(f"Refusing to use {runtime_dir}: owned by another user")
+    if info.st_mode & 0o077:
+        raise RuntimeError(
+            f"Refusing to use {runtime_dir}: accessible by other users "
+            f"(mode {stat.S_IMODE(info.st_mode):o})"
+        )
+    return runtime_dir
+
+
+def get_socket_path() -> Path:
+    """데몬 Unix 소켓 경로 반환"""
+    return get_runtime_dir() / SOCKET_FILE_NAME
+
+
+def get_pid_path() -> Path:
+    """실행 중인 데몬의 pid 파일 경로 반환"""
+    return get_runtime_dir() / PID_FILE_NAME
+
+
+def get_cache_dir() -> Path:
+    """completion 결과 캐시 디렉토리 반환 (소켓과 같은 사용자 전용 runtime 디렉토리)"""
+    return get_runtime_dir() / CACHE_DIR_NAME
+
+
+def get_client_path() -> Path:
+    """.bashrc가 source하는 bash client 경로 반환"""
+    return Path.home() / ".completions" / INDEX_DIR_NAME / CLIENT_FILE_NAME
+
+
+def load_application(cli_name: str) -> Optional[Application]:
+    """
+    console script entry point를 호출하여 CLI의 cleo Application 얻기
+
+    entry point 함수가 Application.run()을 부르는 순간 실행하지 않고
+    Application 객체만 가로챈다. 가로채는 동안에도 다른 스레드의
+    Application.run()은 원래대로 실행되고, entry point가 sys.argv를 읽어도
+    supercli의 인자는 보이지 않는다. 끝나면 (예외가 나도) 모두 되돌린다.
+
+    Returns:
+        Application 또는 None (cleo console script가 아닌 경우)
+    """
+    entry_point = get_console_scripts().get(cli_name)
+    if entry_point is None:
+        return None
+
+    with _load_lock:
+        original_run = Application.run
+        original_argv = sys.argv
+        owner = threading.get_ident()
+
+        def capture(application, *args, **kwargs):
+            if threading.get_ident() != owner:
+                return original_run(application, *args, **kwargs)
+            raise _ApplicationCaptured(application)
+
+        Application.run = capture
+        sys.argv = [cli_name]
+        try:
+            entry_point.load()()
+        except _ApplicationCaptured as captured:
+            return captured.application
+        except BaseException:
+            return None
+        finally:
+            sys.argv = original_argv
+            Application.run = original_run
+
+    return None
+
+
+def complete_words(application: Application, words: List[str], cword: int) -> List[str]:
+    """
+    cleo Application으로 COMP_WORDS의 cword 번째 단어 완성
+
+    명령이 complete(words, word)를 구현하면 명령 이름부터 현재 단어까지를
+    넘겨 동적 completion을 받고, 아니면 명령/옵션 이름을 완성한다.
+    빈 목록이면 bash 기본(파일 이름) completion이 쓰인다.
+    """
+    words = words[: cword + 1]
+    current = words[cword] if cword < len(words) else ""
+
+    command_index = next(
+        (i for i in range(1, cword) if not words[i].startswith("-")), None
+    )
+    command = None
+    if command_index is not None and application.has(words[command_index]):
+        command = application.get(words[command_index])
+
+    if current.startswith("-"):
+        options = list(application.definition.options)
+        if command is not None:
+            options += list(command.definition.options)
+        names = [f"--{option.name}" for option in options]
+        return sorted(name for name in set(names) if name.startswith(current))
+
+    if command_index is None:
+        return sorted(
+            name
+            for name, candidate in application.all().items()
+            if name.startswith(current) and not candidate.hidden
+        )
+
+    complete = getattr(command, "complete", None)
+    if callable(complete):
+        return list(complete(words[command_index:], current))
+
+    return []
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        lines = self.rfile.read().decode("utf-8", "surrogateescape").split("\n")
+        try:
+            version, cli_name, cwd, cword = lines[0], lines[1], lines[2], int(lines[3])
+            words = lines[4:]
+            if words and words[-1] == "":
+                words.pop()  # printf '%s\n'의 마지막 줄바꿈
+        except (IndexError, ValueError):
+            self.wfile.write(b"error bad request\n")
+            return
+
+        if version != PROTOCOL_VERSION:
+            self.wfile.write(b"error unsupported protocol\n")
+            return
+
+        application = self.server.get_application(cli_name)
+        if application is None:
+            self.wfile.write(b"error unsupported cli\n")
+            return
+
+        def compute() -> List[str]:
+            # 파일 이름 completion 등이 셸의 현재 디렉토리 기준이 되도록
+            # (계산은 캐시의 worker 스레드 하나에서만 하므로 chdir해도 안전)
+            os.chdir(cwd or "/")
+            return complete_words(application, words, cword)
+
+        cache = self.server.result_cache
+        settings = self.server.get_cache_settings(cli_name)
+        try:
+            if settings is None:
+                completions = cache.run(compute)
+            else:
+                key = make_cache_key(cli_name, words, cword, cwd)
+                completions = cache.lookup(cli_name, key, settings, compute)
+        except Exception as e:
+            self.wfile.write(f"error {e}\n".encode("utf-8", "replace"))
+            return
+        if completions is None:
+            # 한도 안에 끝나지 않았고 캐시도 없음: client는 일반 completion으로
+            self.wfile.write(b"error timeout\n")
+            return
+
+        body = "".join(f"{completion}\n" for completion in completions)
+        self.wfile.write(f"ok\n{body}".encode("utf-8", "surrogateescape"))
+
+
+class CompletionServer(socketserver.UnixStreamServer):
+    """
+    import해 둔 cleo Application으로 completion 요청에 답하는 Unix 소켓 서버
+
+    요청마다 셸의 현재 디렉토리로 chdir하므로 계산은 순서대로 하나씩 처리한다.
+    META에 "cache" 설정이 있는 CLI는 결과를 ResultCache에 저장해 두고
+    TTL 동안 다시 계산하지 않는다.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        cli_names: List[str],
+        completion_dir: Optional[Path] = None,
+    ):
+        self.applications: Dict[str, Optional[Application]] = {}
+        self.completion_dir = completion_dir or Path.home() / ".completions"
+        self.result_cache = ResultCache(get_cache_dir())
+        self._cache_settings: Dict[str, Optional[Dict[str, float]]] = {}
+        self._index_mtime_ns: Optional[int] = -1
+        for cli_name in cli_names:
+            self.get_application(cli_name)
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def get_cache_settings(self, cli_name: str) -> Optional[Dict[str, float]]:
+        """
+        CLI의 결과 캐시 설정 (index에 기록된 META의 "cache")
+
+        index 파일이 바뀐 경우에만 다시 읽으므로 데몬을 다시 띄우지 않아도
+        completion-init으로 바꾼 설정이 반영된다.
+        """
+        try:
+            mtime_ns = get_index_path(self.completion_dir).stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != self._index_mtime_ns:
+            self._index_mtime_ns = mtime_ns
+            self._cache_settings = {
+                name: parse_cache_settings(entry.get("cache"))
+                for name, entry in load_index(self.completion_dir).items()
+                if entry.get("managed")
+            }
+        return self._cache_settings.get(cli_name)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.result_cache.shutdown()
+
+    def get_application(self, cli_name: str) -> Optional[Application]:
+        """CLI의 Application 반환 (처음 요청될 때 한 번만 import)"""
+        if cli_name not in self.applications:
+            self.applications[cli_name] = load_application(cli_name)
+        return self.applications[cli_name]
+
+    @property
+    def served_clis(self) -> List[str]:
+        """Application을 얻은 CLI 목록"""
+        return sorted(name for name, app in self.applications.items() if app is not None)
+
+
+def is_daemon_running() -> bool:
+    """데몬 소켓에 연결할 수 있는지 확인"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CLIENT_TIMEOUT_SECONDS)
+        try:
+            client.connect(str(get_socket_path()))
+        except OSError:
+            return False
+    return True
+
+
+def create_server(cli_names: List[str]) -> CompletionServer:
+    """
+    소켓을 만들고 서버 생성
+
+    Raises:
+        RuntimeError: 다른 데몬이 이미 실행 중이거나 소켓 디렉토리를 믿을 수 없는 경우
+    """
+    ensure_runtime_dir()
+
+    socket_path = get_socket_path()
+    if socket_path.exists():
+        if is_daemon_running():
+            raise RuntimeError(f"Completion daemon is already running at {socket_path}")
+        socket_path.unlink()  # 비정상 종료로 남은 소켓
+
+    return CompletionServer(socket_path, cli_names)
+
+
+def run_server(server: CompletionServer) -> None:
+    """
+    SIGTERM/SIGINT를 받을 때까지 요청 처리
+
+    pid 파일은 여기서 쓰므로 fork한 자식 프로세스에서 불러야 한다.
+    """
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    get_pid_path().write_text(f"{os.getpid()}\n")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        remove_server_files()
+
+
+def stop_daemon() -> Optional[int]:
+    """
+    실행 중인 데몬에 SIGTERM 보내기
+
+    Returns:
+        종료시킨 데몬의 pid 또는 None (실행 중이 아닌 경우)
+    """
+    try:
+        pid = int(get_pid_path().read_text())
+    except (OSError, ValueError):
+        return None
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        remove_server_files()
+        return None
+    return pid
+
+
+def remove_server_files() -> None:
+    """소켓과 pid 파일 삭제"""
+    for path in (get_socket_path(), get_pid_path()):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def request_completion(
+    cli_name: str,
+    words: List[str],
+    cword: int,
+    cwd: Optional[str] = None,
+    timeout: float = CLIENT_TIMEOUT_SECONDS,
+) -> Optional[List[str]]:
+    """
+    데몬에 completion 요청 (bash client와 같은 프로토콜)
+
+    Returns:
+        completion 목록 또는 None (데몬이 없거나 처리하지 못한 경우)
+    """
+    cwd = cwd or os.getcwd()
+    request = "\n".join([PROTOCOL_VERSION, cli_name, cwd, str(cword), *words]) + "\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(str(get_socket_path()))
+            client.sendall(request.encode("utf-8", "surrogateescape"))
+            client.shutdown(socket.SHUT_WR)
+            response = b"".join(iter(lambda: client.recv(65536), b""))
+        except OSError:
+            return None
+
+    lines = response.decode("utf-8", "surrogateescape").split("\n")
+    if lines[0] != "ok":
+        return None
+    return [line for line in lines[1:] if line]
+
+
+def find_complete_function(completion_file: Path) -> Optional[str]:
+    """completion 파일이 `complete -F`로 등록하는 함수 이름 찾기"""
+    try:
+        return extract_complete_function(completion_file.read_text())
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def collect_daemon_targets(completion_dir: Optional[Path] = None) -> List[Tuple[str, str, Path]]:
+    """
+    데몬이 답할 수 있는 CLI 목록 수집
+
+    managed completion이 있고 console script entry point가 있는 CLI만 대상이다.
+
+    Returns:
+        (CLI 이름, 원래 completion 함수, completion 파일) 리스트
+    """
+    completion_dir = completion_dir or Path.home() / ".completions"
+    scripts = get_console_scripts()
+    targets = []
+    for cli_name, entry in sorted(load_index(completion_dir).items()):
+        if not entry.get("managed") or cli_name not in scripts:
+            continue
+        completion_file = completion_dir / entry["file"]
+        # 설치할 때 index에 기록된 함수 (예전 index면 파일에서 찾음)
+        function = entry.get("complete_function") or find_complete_function(completion_file)
+        if function:
+            targets.append((cli_name, function, completion_file))
+    return targets
+
+
+def generate_daemon_client(targets: List[Tuple[str, str, Path]]) -> str:
+    """
+    데몬 bash client 생성
+
+    Tab을 누르면 소켓이 있을 때만 데몬에 묻고, 소켓이 없거나 응답이 없으면
+    원래 cleo completion 함수로 돌아간다 (lazy 모드처럼 아직 source되지
+    않았으면 그 파일을 source한 뒤 호출한다). 소켓에는 socat으로 연결하고,
+    socat이 없으면 Tab마다 인터프리터를 띄우지 않도록 데몬을 쓰지 않고 항상
+    설치된 completion 파일로 완성한다. 내 소유가 아닌 소켓에는 묻지 않는다.
+    """
+    functions = " ".join(
+        f"[{shlex.quote(cli)}]={shlex.quote(function)}" for cli, function, _ in targets
+    )
+    files = " ".join(
+        f"[{shlex.quote(cli)}]={shlex.quote(str(path))}" for cli, _, path in targets
+    )
+    timeout = CLIENT_TIMEOUT_SECONDS
+
+    return f"""# supercli completion daemon client (generated by supercli, do not edit)
+declare -gA _supercli_daemon_functions=({functions})
+declare -gA _supercli_daemon_files=({files})
+if [[ -n $XDG_RUNTIME_DIR ]]; then
+    _supercli_daemon_socket=$XDG_RUNTIME_DIR/supercli/{SOCKET_FILE_NAME}
+else
+    _supercli_daemon_socket=/tmp/supercli-$UID/{SOCKET_FILE_NAME}
+fi
+
+if command -v socat >/dev/null 2>&1; then
+    _supercli_daemon_send() {{
+        socat -t{timeout} -T{timeout} - "UNIX-CONNECT:$_supercli_daemon_socket"
+    }}
+fi
+
+_supercli_daemon_complete() {{
+    local cli=${{1##*/}} reply
+    if [[ -S $_supercli_daemon_socket && -O $_supercli_daemon_socket ]] &&
+        declare -F _supercli_daemon_send >/dev/null &&
+        reply=$(printf '%s\\n' {PROTOCOL_VERSION} "$cli" "$PWD" "$COMP_CWORD" "${{COMP_WORDS[@]}}" | _supercli_daemon_send 2>/dev/null) &&
+        [[ $reply == ok* ]]; then
+        mapfile -t COMPREPLY <<< "${{reply#ok}}"
+        COMPREPLY=("${{COMPREPLY[@]:1}}")
+        return 0
+    fi
+
+    # 데몬이 없으면 원래 completion 함수로
+    local function=${{_supercli_daemon_functions[$cli]}}
+    if ! declare -F "$function" >/dev/null; then
+        source "${{_supercli_daemon_files[$cli]}}" || return 1
+        complete -o default -F _supercli_daemon_complete "$1"
+    fi
+    "$function" "$@"
+}}
+
+(( ${{#_supercli_daemon_functions[@]}} )) && complete -o default -F _supercli_daemon_complete "${{!_supercli_daemon_functions[@]}}"
+"""
+
+
+def write_daemon_client(completion_dir: Optional[Path] = None) -> Tuple[Path, List[str]]:
+    """
+    bash client를 다시 만들고 .bashrc 로더 추가
+
+    Returns:
+        (client 경로, 대상 CLI 목록)
+    """
+    targets = collect_daemon_targets(completion_dir)
+    client_path = get_client_path()
+    client_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with exclusive_lock():
+        atomic_write_text(client_path, generate_daemon_client(targets))
+        bashrc = Path.home() / ".bashrc"
+        content = bashrc.read_text() if bashrc.exists() else ""
+        if BASHRC_DAEMON_LOADER not in content:
+            atomic_write_text(bashrc, content + BASHRC_DAEMON_LOADER)
+
+    return client_path, [cli_name for cli_name, _, _ in targets]
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from .install_completion import generate_completion
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# completion 생성은 대부분 subprocess 대기 시간이므로 CPU 수보다 넉넉하게 둔다
+MAX_DEFAULT_JOBS = 32
+
+
+def default_jobs() -> int:
+    """기본 worker 수 반환"""
+    return min(MAX_DEFAULT_JOBS, (os.cpu_count() or 1) + 4)
+
+
+def parse_jobs(value: Optional[str]) -> int:
+    """
+    --jobs 옵션 값 해석
+
+    Raises:
+        ValueError: 1 이상의 정수가 아닌 경우
+    """
+    if value is None or value == "":
+        return default_jobs()
+
+    try:
+        jobs = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"--jobs must be a positive integer, got '{value}'")
+
+    if jobs < 1:
+        raise ValueError(f"--jobs must be a positive integer, got '{value}'")
+    return jobs
+
+
+def map_ordered(
+    func: Callable[[T], R], items: Iterable[T], jobs: Optional[int] = None
+) -> List[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    제한된 worker pool에서 func를 실행하고 입력 순서대로 결과 반환
+
+    한 항목의 예외가 다른 항목의 결과를 버리지 않도록 항목별로 예외를 잡는다.
+
+    Args:
+        func: 각 항목에 적용할 함수
+        items: 입력 항목들
+        jobs: 최대 동시 실행 수 (None이면 default_jobs())
+
+    Returns:
+        (item, result, error) 리스트 - items와 같은 순서
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = min(jobs or default_jobs(), len(items))
+
+    def run(item: T) -> Tuple[T, Optional[R], Optional[Exception]]:
+        try:
+            return item, func(item), None
+        except Exception as e:
+            return item, None, e
+
+    if workers <= 1:
+        return [run(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, items))
+
+
+def generate_completions(
+    cli_names: Iterable[str], jobs: Optional[int] = None
+) -> List[Tuple[str, Optional[str], str]]:
+    """
+    여러 CLI의 completion을 병렬로 생성
+
+    Returns:
+        (cli_name, completion_script, message) 리스트 - cli_names와 같은 순서
+    """
+    results = []
+    for cli_name, result, error in map_ordered(generate_completion, cli_names, jobs):
+        if error is not None:
+            results.append(
+                (cli_name, None, f"Failed to generate completion for {cli_name}: {error}")
+            )
+            continue
+        script, message = result
+        results.append((cli_name, script, message))
+    return results
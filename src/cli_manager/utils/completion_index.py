@@ -0,0 +1,315 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .meta_parser import (
+    extract_complete_function,
+    extract_completion_commands,
+    get_meta_shell,
+    parse_meta_from_completion,
+    read_meta_header,
+)
+from .safe_io import STATE_DIR_NAME, atomic_write_text, exclusive_lock, try_exclusive_lock
+
+
+# index.json 형식 버전 (배포된 형식이 바뀔 때만 올림, 다르면 다시 만듦)
+INDEX_VERSION = 1
+INDEX_DIR_NAME = STATE_DIR_NAME
+INDEX_FILE_NAME = "index.json"
+# zsh가 zcompile로 만든 파일 (completion 스크립트가 아님)
+COMPILED_SUFFIX = ".zwc"
+
+_lock = threading.Lock()
+
+
+def get_index_path(completion_dir: Path) -> Path:
+    """completion index 파일 경로 반환"""
+    return completion_dir / INDEX_DIR_NAME / INDEX_FILE_NAME
+
+
+def load_index(completion_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    completion index 읽기
+
+    index 파일이 없거나 깨졌거나, 다른 프로세스가 디렉토리에 파일을 추가/삭제한
+    경우(디렉토리 mtime 불일치)에만 META 헤더로부터 다시 만든다.
+
+    Returns:
+        source_cli -> entry 딕셔너리
+        entry: {"source_cli", "file", "managed", "shell", "generator", "backend",
+                "wrapper", "fingerprint", "cache", "commands", "complete_function",
+                "size", "mtime_ns", "sha256", "refreshed_at"}
+    """
+    with _lock:
+        return _load_locked(completion_dir)
+
+
+def rebuild_index(completion_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """디렉토리를 스캔하여 completion index를 새로 만들고 저장"""
+    with _lock:
+        data = _read_index(completion_dir)
+        return _rebuild_locked(completion_dir, data["entries"] if data else None)
+
+
+def update_index_entry(
+    completion_dir: Path, completion_file: Path, completion_script: str
+) -> None:
+    """
+    설치된 completion 파일의 index 항목 갱신
+
+    Args:
+        completion_dir: completion 디렉토리
+        completion_file: 설치된 completion 파일
+        completion_script: 설치된 내용 (META 헤더 확인용)
+    """
+    meta = parse_meta_from_completion(completion_script)
+    shell = get_meta_shell(meta)
+    set_index_entry(
+        completion_dir,
+        completion_file,
+        meta,
+        len(completion_script.encode("utf-8")),
+        extract_completion_commands(completion_script, shell),
+        extract_complete_function(completion_script, shell),
+        hashlib.sha256(completion_script.encode("utf-8")).hexdigest(),
+    )
+
+
+def set_index_entry(
+    completion_dir: Path,
+    completion_file: Path,
+    meta: Optional[Dict[str, Any]],
+    size: int,
+    commands: List[str],
+    complete_function: Optional[str] = None,
+    sha256: Optional[str] = None,
+) -> None:
+    """
+    내용을 다시 읽지 않고 이미 알고 있는 정보로 index 항목 갱신
+
+    스트리밍으로 설치한 경우처럼 전체 내용이 메모리에 없을 때 사용한다.
+    """
+    entry = make_index_entry(
+        completion_file.name,
+        meta,
+        size,
+        completion_file.stat().st_mtime_ns,
+        commands,
+        complete_function,
+        sha256,
+    )
+    apply_index_changes(completion_dir, [entry])
+
+
+def remove_index_entry(completion_dir: Path, cli_name: str) -> None:
+    """CLI의 index 항목 제거"""
+    apply_index_changes(completion_dir, [], [cli_name])
+
+
+def apply_index_changes(
+    completion_dir: Path,
+    entries: List[Dict[str, Any]],
+    removed: Optional[List[str]] = None,
+) -> None:
+    """
+    여러 index 항목을 한 번의 read-modify-write로 반영
+
+    Args:
+        completion_dir: completion 디렉토리
+        entries: 추가하거나 바꿀 항목 (make_index_entry로 만든 것)
+        removed: 제거할 CLI 이름 (또는 파일 이름)
+    """
+    # 다른 supercli 프로세스의 갱신을 잃지 않도록 파일 잠금 안에서 read-modify-write
+    with exclusive_lock(), _lock:
+        # 방금 우리가 파일을 바꿔 디렉토리 mtime이 바뀌었으므로 검증 없이 읽음
+        current = _load_locked(completion_dir, validate=False)
+        for cli_name in removed or []:
+            for name in [n for n, e in current.items() if n == cli_name or e["file"] == cli_name]:
+                del current[name]
+        for entry in entries:
+            # 같은 파일을 가리키던 예전 항목 정리 (source_cli가 바뀐 경우)
+            for name in [n for n, e in current.items() if e["file"] == entry["file"]]:
+                del current[name]
+            current[entry["source_cli"]] = entry
+        _write_locked(completion_dir, current)
+
+
+def lookup_completion_file(completion_dir: Path, cli_name: str) -> Optional[Path]:
+    """index에서 CLI의 관리되는 completion 파일 경로 찾기"""
+    entry = load_index(completion_dir).get(cli_name)
+    if entry and entry.get("managed"):
+        return completion_dir / entry["file"]
+    return None
+
+
+def make_index_entry(
+    file_name: str,
+    meta: Optional[Dict[str, Any]],
+    size: int,
+    mtime_ns: Optional[int],
+    commands: List[str],
+    complete_function: Optional[str] = None,
+    sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """completion 파일 하나의 index 항목 생성 (mtime_ns는 아직 모르면 None)"""
+    meta = meta or {}
+    return {
+        "source_cli": meta.get("source_cli") or file_name,
+        "file": file_name,
+        "managed": bool(meta),
+        "shell": get_meta_shell(meta),
+        "generator": meta.get("generator"),
+        "backend": meta.get("backend"),
+        "wrapper": meta.get("wrapper_cli"),
+        "fingerprint": meta.get("fingerprint"),
+        "cache": meta.get("cache"),
+        "commands": commands,
+        "complete_function": complete_function,
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "sha256": sha256,
+        "refreshed_at": time.time(),
+    }
+
+
+def entry_matches_file(entry: Dict[str, Any], completion_file: Path) -> bool:
+    """index 항목의 크기/mtime이 파일과 같은지 (index 이후 파일이 바뀌지 않았는지)"""
+    try:
+        stat = completion_file.stat()
+    except OSError:
+        return False
+    return entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+
+def _dir_mtime(completion_dir: Path) -> Optional[int]:
+    try:
+        return completion_dir.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_index(completion_dir: Path) -> Optional[Dict[str, Any]]:
+    """저장된 index 파일 내용 (없거나 버전이 다르거나 깨졌으면 None)"""
+    try:
+        data = json.loads(get_index_path(completion_dir).read_text())
+        if data.get("version") == INDEX_VERSION and isinstance(data.get("entries"), dict):
+            return data
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _load_locked(
+    completion_dir: Path, validate: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    if not completion_dir.is_dir():
+        return {}
+
+    data = _read_index(completion_dir)
+    if data is None:
+        return _rebuild_locked(completion_dir)
+    if not validate or data.get("dir_mtime_ns") == _dir_mtime(completion_dir):
+        return data["entries"]
+    # 바뀌지 않은 파일은 이전 항목을 재사용하며 다시 만듦
+    return _rebuild_locked(completion_dir, data["entries"])
+
+
+def _rebuild_locked(
+    completion_dir: Path, previous: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    디렉토리를 스캔하여 index를 다시 만듦
+
+    META는 파일 앞부분만 읽는다. 본문 전체는 `complete` 명령 목록이 필요할 때만
+    읽고, 크기와 mtime이 이전 index와 같은 파일은 이전 목록을 그대로 쓴다.
+
+    저장은 exclusive_lock을 기다리지 않고 잡을 수 있을 때만 한다. 다른 프로세스가
+    잠금을 잡고 파일을 바꾸는 중이면 그쪽이 index를 저장한다.
+    """
+    entries: Dict[str, Dict[str, Any]] = {}
+    if not completion_dir.is_dir():
+        return entries
+
+    # index 디렉토리를 먼저 만들어 두고 스캔 전 mtime을 기록 (스캔 중 바뀌면 저장하지 않음)
+    try:
+        get_index_path(completion_dir).parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+    dir_mtime_ns = _dir_mtime(completion_dir)
+    known = {entry["file"]: entry for entry in (previous or {}).values()}
+
+    with os.scandir(completion_dir) as it:
+        for dir_entry in sorted(it, key=lambda e: e.name):
+            if (
+                dir_entry.name.startswith(".")
+                or dir_entry.name.endswith(COMPILED_SUFFIX)
+                or not dir_entry.is_file()
+            ):
+                continue
+            try:
+                stat = dir_entry.stat()
+                meta = read_meta_header(dir_entry)
+                old = known.get(dir_entry.name)
+                if (
+                    old
+                    and old.get("size") == stat.st_size
+                    and old.get("mtime_ns") == stat.st_mtime_ns
+                ):
+                    commands = old["commands"]
+                    complete_function = old.get("complete_function")
+                    sha256 = old.get("sha256")
+                else:
+                    with open(dir_entry.path, "rb") as f:
+                        data = f.read()
+                    content = data.decode("utf-8")
+                    shell = get_meta_shell(meta)
+                    commands = extract_completion_commands(content, shell)
+                    complete_function = extract_complete_function(content, shell)
+                    sha256 = hashlib.sha256(data).hexdigest()
+            except (OSError, UnicodeDecodeError):
+                continue
+
+            entry = make_index_entry(
+                dir_entry.name,
+                meta,
+                stat.st_size,
+                stat.st_mtime_ns,
+                commands,
+                complete_function,
+                sha256,
+            )
+            cli_name = entry["source_cli"]
+            # 같은 CLI를 가리키는 파일이 여럿이면 CLI 이름과 같은 파일 우선
+            if cli_name in entries and entries[cli_name]["file"] == cli_name:
+                continue
+            entries[cli_name] = entry
+
+    try:
+        with try_exclusive_lock() as locked:
+            if locked and _dir_mtime(completion_dir) == dir_mtime_ns:
+                _write_locked(completion_dir, entries, dir_mtime_ns)
+    except OSError:
+        pass  # index는 캐시일 뿐이므로 저장 실패는 무시
+    return entries
+
+
+def _write_locked(
+    completion_dir: Path,
+    entries: Dict[str, Dict[str, Any]],
+    dir_mtime_ns: Optional[int] = None,
+) -> None:
+    """index 저장 (exclusive_lock을 잡은 채로 호출)"""
+    index_path = get_index_path(completion_dir)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # index 디렉토리 생성까지 끝난 뒤의 mtime을 기록해야 다음 읽기에서 일치함
+    data = {
+        "version": INDEX_VERSION,
+        "dir_mtime_ns": dir_mtime_ns if dir_mtime_ns is not None else _dir_mtime(completion_dir),
+        "entries": entries,
+    }
+    atomic_write_text(index_path, json.dumps(data, separators=(",", ":")))
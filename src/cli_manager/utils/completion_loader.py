@@ -0,0 +1,157 @@
+import os
+import shlex
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .completion_bundle import BUNDLE_FILE_NAME, get_bundle_path, write_bundle
+from .completion_daemon import get_client_path, write_daemon_client
+from .completion_index import INDEX_DIR_NAME, load_index
+from .config import get_config_value, set_config_value
+from .path_index import which
+from .safe_io import atomic_write_text
+
+
+LOADER_EAGER = "eager"
+LOADER_LAZY = "lazy"
+LOADER_BUNDLE = "bundle"
+LOADER_MODES = (LOADER_EAGER, LOADER_LAZY, LOADER_BUNDLE)
+
+LAZY_LOADER_FILE_NAME = "lazy.bash"
+
+# .bashrc에 추가되는 로더 (모드별)
+BASHRC_LOADERS = {
+    LOADER_EAGER: """
+# Auto-load custom completions
+for completion in ~/.completions/*; do
+    [ -r "$completion" ] && source "$completion"
+done
+""",
+    LOADER_LAZY: f"""
+# Lazy-load custom completions (sourced on first Tab)
+[ -r ~/.completions/{INDEX_DIR_NAME}/{LAZY_LOADER_FILE_NAME} ] && source ~/.completions/{INDEX_DIR_NAME}/{LAZY_LOADER_FILE_NAME}
+""",
+    LOADER_BUNDLE: f"""
+# Load custom completions from a single prebuilt bundle
+[ -r ~/.completions/{INDEX_DIR_NAME}/{BUNDLE_FILE_NAME} ] && source ~/.completions/{INDEX_DIR_NAME}/{BUNDLE_FILE_NAME}
+""",
+}
+
+
+def _completion_dir() -> Path:
+    return Path.home() / ".completions"
+
+
+def get_lazy_loader_path() -> Path:
+    """lazy 로더 스크립트 경로 반환"""
+    return _completion_dir() / INDEX_DIR_NAME / LAZY_LOADER_FILE_NAME
+
+
+def get_loader_mode() -> str:
+    """설정된 completion 로더 모드 반환 (기본값 eager)"""
+    mode = get_config_value("loader")
+    return mode if mode in LOADER_MODES else LOADER_EAGER
+
+
+def set_loader_mode(mode: str) -> None:
+    """
+    completion 로더 모드 저장
+
+    Raises:
+        ValueError: 지원하지 않는 모드인 경우
+    """
+    if mode not in LOADER_MODES:
+        raise ValueError(
+            f"Unknown loader mode '{mode}' (choose from: {', '.join(LOADER_MODES)})"
+        )
+    set_config_value("loader", mode)
+
+
+def generate_lazy_loader(stubs: List[Tuple[str, Path]]) -> str:
+    """
+    lazy 로더 스크립트 생성
+
+    명령마다 작은 stub만 등록하고, 처음 Tab을 누를 때 실제 completion 파일을
+    source한 뒤 124를 반환하여 bash가 새 compspec으로 다시 완성하게 한다.
+
+    Args:
+        stubs: (명령 이름, completion 파일) 리스트
+    """
+    lines = [
+        "# supercli lazy completion loader (generated by supercli, do not edit)",
+        "declare -gA _supercli_lazy_files=(",
+    ]
+    for command, completion_file in stubs:
+        lines.append(f"    [{shlex.quote(command)}]={shlex.quote(str(completion_file))}")
+    lines.append(")")
+    lines.append(
+        """
+_supercli_lazy_load() {
+    local file=${_supercli_lazy_files[$1]}
+    complete -r "$1" 2>/dev/null
+    [ -r "$file" ] && source "$file" && return 124
+    return 1
+}
+
+(( ${#_supercli_lazy_files[@]} )) && complete -F _supercli_lazy_load "${!_supercli_lazy_files[@]}"
+"""
+    )
+    return "\n".join(lines)
+
+
+def collect_lazy_stubs(completion_dir: Optional[Path] = None) -> List[Tuple[str, Path]]:
+    """
+    index에서 lazy stub 대상 (명령, completion 파일) 목록 수집
+
+    PATH에서 찾을 수 없는 명령은 제외한다 (셸 시작 시 확인 비용을 없애기 위해
+    생성 시점에 확인).
+    """
+    completion_dir = completion_dir or _completion_dir()
+    stubs: Dict[str, Path] = {}
+
+    for cli_name, entry in sorted(load_index(completion_dir).items()):
+        completion_file = completion_dir / entry["file"]
+        for command in entry.get("commands") or [cli_name]:
+            if command in stubs:
+                continue
+            if os.path.isabs(command):
+                available = os.access(command, os.X_OK)
+            else:
+                available = which(command) is not None
+            if available:
+                stubs[command] = completion_file
+
+    return sorted(stubs.items())
+
+
+def sync_completion_loader(mode: Optional[str] = None) -> Optional[str]:
+    """
+    현재 로더 모드에 맞게 생성된 로더 파일(lazy stub 또는 bundle)을 갱신
+
+    사용하지 않는 모드의 생성 파일은 지운다. completion 데몬 client를 쓰고
+    있으면 대상 CLI 목록도 함께 갱신한다.
+
+    Returns:
+        메시지 (생성 파일을 갱신한 경우만)
+    """
+    mode = mode or get_loader_mode()
+    if get_client_path().exists():
+        write_daemon_client()
+
+    lazy_path = get_lazy_loader_path()
+    bundle_path = get_bundle_path()
+
+    for unused_mode, path in ((LOADER_LAZY, lazy_path), (LOADER_BUNDLE, bundle_path)):
+        if mode != unused_mode and path.exists():
+            path.unlink()
+
+    if mode == LOADER_LAZY:
+        stubs = collect_lazy_stubs()
+        lazy_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(lazy_path, generate_lazy_loader(stubs))
+        return f"Updated lazy completion stubs for {len(stubs)} command(s)"
+
+    if mode == LOADER_BUNDLE:
+        bundle_path, file_count = write_bundle()
+        return f"Rebuilt completion bundle from {file_count} file(s): {bundle_path}"
+
+    return None
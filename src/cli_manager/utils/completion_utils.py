@@ -1,4 +1,3 @@
-from pathlib import Path
 from typing import List, Tuple, Optional
 
 # from .generate_completion import generate_completion, add_wrapper_completion
@@ -8,6 +7,11 @@ from .install_completion import (
     add_wrapper_completion,
 )
 from .meta_parser import add_meta_to_completion
+from .completion_index import COMPILED_SUFFIX, lookup_completion_file
+# 예전부터 completion_utils에서 import하던 호출을 위한 re-export
+from .safe_io import get_completion_dir, get_state_dir  # noqa: F401
+from .shells import get_shell_completion_dir, get_shell_completion_file, installed_shells
+from .transaction import FileTransaction, transaction_scope
 
 
 def update_cli_completion(cli_name: str) -> Tuple[bool, List[str]]:
@@ -21,7 +25,7 @@ def update_cli_completion(cli_name: str) -> Tuple[bool, List[str]]:
     if not completion_script:
         return False, [message]
 
-    success, messages = install_completion(cli_name, completion_script)
+    success, messages, _ = install_completion(cli_name, completion_script)
     return success, messages
 
 
@@ -41,26 +45,40 @@ def update_wrapper_completion(registered_clis: List[str]) -> Tuple[bool, List[st
     )
 
     # 설치
-    success, messages = install_completion("superclisubs", wrapper_script)
+    success, messages, _ = install_completion("superclisubs", wrapper_script)
     return success, messages
 
 
-def get_completion_dir() -> Path:
-    """completion 스크립트 디렉토리 경로 반환"""
-    return Path.home() / ".completions"
-
-
-def remove_cli_completion(cli_name: str) -> Tuple[bool, str]:
+def remove_cli_completion(
+    cli_name: str, transaction: Optional[FileTransaction] = None
+) -> Tuple[bool, str]:
     """
     CLI의 completion 파일 제거
 
+    설치된 모든 셸(bash, zsh, fish)의 파일을 지운다. zsh의 컴파일된 .zwc도
+    같이 지운다. transaction이 주어지면 삭제를 stage만 한다.
+
     Returns:
         (success, message): 성공 여부와 메시지
     """
     try:
-        completion_file = get_completion_dir() / cli_name
-        if completion_file.exists():
-            completion_file.unlink()
+        targets = []
+        for shell in installed_shells():
+            completion_dir = get_shell_completion_dir(shell)
+            completion_file = lookup_completion_file(
+                completion_dir, cli_name
+            ) or get_shell_completion_file(shell, cli_name)
+            if completion_file.exists():
+                targets.append((completion_dir, completion_file))
+
+        if targets:
+            with transaction_scope(transaction) as txn:
+                for completion_dir, completion_file in targets:
+                    txn.delete(completion_file)
+                    compiled = completion_file.with_name(completion_file.name + COMPILED_SUFFIX)
+                    if compiled.exists():
+                        txn.delete(compiled)
+                    txn.remove_index_entry(completion_dir, cli_name)
             return True, f"Removed completion for {cli_name}"
         return True, f"No completion file found for {cli_name}"
     except Exception as e:
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .safe_io import STATE_DIR_NAME, atomic_write_text, exclusive_lock
+from .transaction import FileTransaction
+
+
+CONFIG_FILE_NAME = "config.json"
+
+
+def get_config_path() -> Path:
+    """supercli 설정 파일 경로 반환"""
+    return Path.home() / ".completions" / STATE_DIR_NAME / CONFIG_FILE_NAME
+
+
+def load_config(transaction: Optional[FileTransaction] = None) -> Dict[str, Any]:
+    """설정 읽기 (없거나 깨졌으면 빈 설정, transaction이 주어지면 stage된 내용 기준)"""
+    try:
+        if transaction:
+            config = json.loads(transaction.read_text(get_config_path()) or "{}")
+        else:
+            config = json.loads(get_config_path().read_text())
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+def get_config_value(
+    key: str, default: Any = None, transaction: Optional[FileTransaction] = None
+) -> Any:
+    """설정 값 하나 읽기"""
+    return load_config(transaction).get(key, default)
+
+
+def set_config_value(
+    key: str, value: Any, transaction: Optional[FileTransaction] = None
+) -> None:
+    """
+    설정 값 하나 저장 (임시 파일에 쓴 뒤 rename)
+
+    transaction이 주어지면 stage만 한다. 다른 프로세스의 설정 변경을 잃지 않도록
+    호출하는 쪽이 commit까지 exclusive_lock을 잡아야 한다.
+    """
+    config_path = get_config_path()
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if transaction:
+        config = load_config(transaction)
+        config[key] = value
+        transaction.write(config_path, json.dumps(config, indent=2))
+        return
+
+    with exclusive_lock():
+        config = load_config()
+        config[key] = value
+        atomic_write_text(config_path, json.dumps(config, indent=2))
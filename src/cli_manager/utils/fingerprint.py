@@ -0,0 +1,165 @@
+import hashlib
+import os
+from functools import lru_cache
+from importlib import metadata
+from typing import Any, Dict, Optional
+
+from .path_index import which
+
+
+# 이 크기 이하의 실행 파일(스크립트, shim 등)은 내용 해시까지 기록
+CONTENT_HASH_MAX_SIZE = 64 * 1024
+
+# console script의 배포판 정보 키
+DIST_KEYS = ("dist", "version", "module_hash")
+
+
+def compute_fingerprint(cli_name: str) -> Optional[Dict[str, Any]]:
+    """
+    PATH에서 찾은 CLI 실행 파일의 fingerprint 계산
+
+    실행 파일을 실행하지 않고 stat 정보(와 작은 파일은 내용 해시)만 사용한다.
+    Python console script인 경우 배포판 이름/버전과 대상 모듈의 RECORD 해시를
+    함께 기록한다. shim 파일이 그대로여도 패키지 업그레이드를 감지하기 위함이다.
+
+    Returns:
+        {"path", "size", "mtime_ns"[, "sha256"][, "dist", "version", "module_hash"]}
+        또는 None (PATH에 없는 경우)
+    """
+    executable = which(cli_name)
+    if not executable:
+        return None
+
+    try:
+        resolved = os.path.realpath(executable)
+        stat = os.stat(resolved)
+    except OSError:
+        return None
+
+    dist_fingerprint = _dist_fingerprint(cli_name, resolved)
+    if dist_fingerprint and dist_fingerprint.pop("owned"):
+        # 배포판이 이 실행 파일을 설치했고 모듈 해시도 있으면 배포판 정보로 충분
+        return {"path": resolved, **dist_fingerprint}
+
+    fingerprint: Dict[str, Any] = {
+        "path": resolved,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+    if stat.st_size <= CONTENT_HASH_MAX_SIZE:
+        try:
+            with open(resolved, "rb") as f:
+                fingerprint["sha256"] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            pass
+
+    if dist_fingerprint:
+        # 소유 관계를 확인할 수 없으면 stat 정보와 함께 보수적으로 비교
+        fingerprint.update(dist_fingerprint)
+
+    return fingerprint
+
+
+@lru_cache(maxsize=None)
+def get_console_scripts() -> Dict[str, metadata.EntryPoint]:
+    """설치된 console_scripts entry point를 이름별로 반환 (프로세스당 한 번)"""
+    scripts = {}
+    for entry_point in metadata.entry_points(group="console_scripts"):
+        scripts.setdefault(entry_point.name, entry_point)
+    return scripts
+
+
+def owns_console_script(cli_name: str, resolved: str) -> bool:
+    """
+    PATH에서 찾은 실행 파일이 이 Python 환경에 설치된 console script인지 확인
+
+    entry point 배포판의 RECORD에 그 실행 파일이 있어야 한다. 다른 가상환경에
+    설치된 같은 이름의 CLI를 이 프로세스에 import하지 않기 위함이다.
+    """
+    dist = getattr(get_console_scripts().get(cli_name), "dist", None)
+    if dist is None:
+        return False
+
+    try:
+        files = dist.files or []
+    except Exception:
+        return False
+
+    for file in files:
+        if file.name == cli_name:
+            try:
+                if os.path.realpath(dist.locate_file(file)) == resolved:
+                    return True
+            except Exception:
+                pass
+    return False
+
+
+def _dist_fingerprint(cli_name: str, resolved: str) -> Optional[Dict[str, Any]]:
+    """
+    console script를 배포판으로 역추적하여 배포판 fingerprint 계산
+
+    Returns:
+        {"dist", "version", "module_hash", "owned"} 또는 None (console script가 아닌 경우)
+        owned는 배포판 RECORD에 이 실행 파일과 모듈 해시가 모두 있는지 여부
+    """
+    entry_point = get_console_scripts().get(cli_name)
+    dist = getattr(entry_point, "dist", None)
+    if dist is None:
+        return None
+
+    try:
+        files = dist.files or []
+    except Exception:
+        files = []
+
+    module_path = entry_point.module.replace(".", "/")
+    module_candidates = {f"{module_path}.py", f"{module_path}/__init__.py"}
+
+    module_hash = None
+    owns_executable = False
+    for file in files:
+        if file.name == cli_name and not owns_executable:
+            try:
+                owns_executable = os.path.realpath(dist.locate_file(file)) == resolved
+            except Exception:
+                pass
+        elif file.hash and str(file) in module_candidates:
+            module_hash = f"{file.hash.mode}={file.hash.value}"
+
+    return {
+        "dist": dist.metadata["Name"],
+        "version": dist.version,
+        "module_hash": module_hash,
+        "owned": owns_executable and module_hash is not None,
+    }
+
+
+def fingerprints_match(
+    stored: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]
+) -> bool:
+    """
+    저장된 fingerprint와 현재 fingerprint 비교
+
+    배포판 정보가 있으면 이름/버전/모듈 해시가 같아야 한다.
+    stat 정보는 둘 다 내용 해시가 있으면 해시로, 없으면 size/mtime으로 비교한다.
+    """
+    if not stored or not current:
+        return False
+
+    if stored.get("path") != current.get("path"):
+        return False
+
+    if any(stored.get(key) != current.get(key) for key in DIST_KEYS):
+        return False
+
+    if "size" not in stored and "size" not in current:
+        return True  # 배포판 정보만으로 비교
+
+    if "sha256" in stored and "sha256" in current:
+        return stored["sha256"] == current["sha256"]
+
+    return stored.get("size") == current.get("size") and stored.get(
+        "mtime_ns"
+    ) == current.get("mtime_ns")
@@ -0,0 +1,333 @@
+import atexit
+import codecs
+import json
+import os
+import subprocess
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .path_index import which
+
+
+# template 인터프리터에서 실행하는 코드 (대상 CLI의 Python으로 띄우므로 supercli를 import하지 않음)
+#
+# 요청 한 줄(JSON [script, *argv])마다 자식을 fork하여 sys.argv를 바꾼 채 console
+# script를 __main__으로 실행하고, 자식 stdout을 pipe에서 읽는 대로 "D <크기>\n<출력>"
+# frame으로 넘긴 뒤 마지막에 "E <exit code>\n"을 보낸다. 출력 전체를 모으지 않으므로
+# template과 supercli 모두 메모리 사용량이 출력 크기와 관계없다. cleo와 자주 쓰는 표준
+# 라이브러리는 미리 import해 두므로 자식은 인터프리터 시작과 그 import를 건너뛴다.
+# 자식이 import한 모듈은 template에 남지 않는다.
+TEMPLATE_SOURCE = r"""
+import json, os, re, runpy, sys
+try:
+    import cleo.application, cleo.commands.command, cleo.commands.completions_command
+    import cleo.io.inputs.argv_input, cleo.io.outputs.stream_output
+except Exception:
+    pass
+
+requests, responses = sys.stdin.buffer, sys.stdout.buffer
+devnull = os.open(os.devnull, os.O_RDWR)
+for line in requests:
+    script, *argv = json.loads(line)
+    read_fd, write_fd = os.pipe()
+    responses.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.close(read_fd)
+            os.dup2(devnull, 0)
+            os.dup2(write_fd, 1)
+            os.dup2(devnull, 2)
+            sys.argv = [script, *argv]
+            sys.path[0] = os.path.dirname(script)
+            runpy.run_path(script, run_name="__main__")
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            code = 1
+        finally:
+            try:
+                sys.stdout.flush()
+            except BaseException:
+                pass
+            os._exit(code)
+    os.close(write_fd)
+    while True:
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        responses.write(b"D %d\n" % len(chunk))
+        responses.write(chunk)
+        responses.flush()
+    os.close(read_fd)
+    code = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+    responses.write(b"E %d\n" % code)
+    responses.flush()
+"""
+
+
+class ForkServerError(Exception):
+    """template 인터프리터가 죽었거나 응답이 잘못된 경우"""
+
+
+class ForkServer:
+    """
+    template 인터프리터 하나
+
+    요청은 한 번에 하나씩 처리한다 (동시에 여러 CLI를 생성하려면 ForkServerPool).
+    """
+
+    def __init__(self, interpreter: str):
+        self.interpreter = interpreter
+        self.process = subprocess.Popen(
+            [interpreter, "-c", TEMPLATE_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def send(self, script: str, argv: List[str]) -> None:
+        """
+        fork한 자식에서 script를 실행하도록 요청 (출력은 read_frame으로 읽음)
+
+        Raises:
+            ForkServerError: template 인터프리터가 요청을 받지 못하는 경우
+        """
+        try:
+            self.process.stdin.write(json.dumps([script, *argv]).encode() + b"\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            raise ForkServerError(f"fork server for {self.interpreter} failed: {e}") from e
+
+    def read_frame(self) -> Tuple[bytes, int]:
+        """
+        응답 frame 하나 읽기
+
+        Returns:
+            출력 frame이면 (출력 조각, -1), 끝 frame이면 (b"", exit code)
+
+        Raises:
+            ForkServerError: template 인터프리터가 응답하지 않는 경우
+        """
+        try:
+            kind, value = self.process.stdout.readline().split()
+            value = int(value)
+            if kind == b"E":
+                return b"", value
+            if kind != b"D":
+                raise ValueError(f"unknown frame {kind!r}")
+            data = self.process.stdout.read(value)
+        except (OSError, ValueError) as e:
+            raise ForkServerError(f"fork server for {self.interpreter} failed: {e}") from e
+        if len(data) != value:
+            raise ForkServerError(f"fork server for {self.interpreter} exited")
+        return data, -1
+
+    def close(self) -> None:
+        """stdin을 닫아 template을 끝냄"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class ForkedRun:
+    """
+    fork server에서 실행 중인 요청 하나 (subprocess.Popen처럼 사용)
+
+    stdout은 출력 frame을 받는 대로 내보내는 텍스트 줄 iterator이고, wait()는
+    남은 출력을 버린 뒤 exit code를 반환한다. 끝까지 읽은 template은 pool로
+    돌려보내고, 도중에 실패한 template은 버린다 (exit code 1).
+    with 블록으로 쓰면 블록이 끝날 때 wait()를 부른다.
+    """
+
+    def __init__(self, pool: "ForkServerPool", server: ForkServer, first: bytes):
+        self._pool = pool
+        self._server: Optional[ForkServer] = server
+        self._first = first
+        self.returncode: Optional[int] = None
+        self.stdout: Iterator[str] = self._lines()
+
+    def __enter__(self) -> "ForkedRun":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.wait()
+
+    def chunks(self) -> Iterator[bytes]:
+        """출력 조각을 받는 대로 내보냄 (끝나면 returncode가 정해짐)"""
+        if self._first:
+            first, self._first = self._first, b""
+            yield first
+        while self._server is not None:
+            try:
+                data, code = self._server.read_frame()
+            except ForkServerError:
+                self._pool.discard(self._server)
+                self._server, self.returncode = None, 1
+                return
+            if data:
+                yield data
+                continue
+            self._pool.release(self._server)
+            self._server, self.returncode = None, code
+
+    def wait(self) -> int:
+        """남은 출력을 버리고 exit code 반환"""
+        for _ in self.chunks():
+            pass
+        return self.returncode
+
+    def _lines(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        pending = ""
+        for chunk in self.chunks():
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+
+class ForkServerPool:
+    """
+    Python 인터프리터별 template 모음
+
+    쉬고 있는 template이 없을 때만 새로 띄우므로 template 수는 동시에 생성하는
+    CLI 수(completion-refresh --jobs)를 넘지 않는다. 실패한 template은 버린다.
+    """
+
+    def __init__(self):
+        self._idle: Dict[str, List[ForkServer]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, interpreter: str, script: str, argv: List[str]) -> ForkedRun:
+        """
+        interpreter의 template에서 script 실행 시작
+
+        첫 frame까지 받은 뒤 반환하므로, 죽은 template은 여기서 ForkServerError로
+        드러난다 (호출하는 쪽은 일반 자식 프로세스로 대신 실행할 수 있다).
+
+        Raises:
+            ForkServerError: template을 띄울 수 없거나 응답하지 않는 경우
+        """
+        with self._lock:
+            idle = self._idle.get(interpreter)
+            server = idle.pop() if idle else None
+        if server is None:
+            try:
+                server = ForkServer(interpreter)
+            except OSError as e:
+                raise ForkServerError(f"Cannot start {interpreter}: {e}") from e
+
+        try:
+            server.send(script, argv)
+            data, code = server.read_frame()
+        except ForkServerError:
+            self.discard(server)
+            raise
+
+        run = ForkedRun(self, server, data)
+        if not data:
+            # 출력 없이 끝남
+            self.release(server)
+            run._server, run.returncode = None, code
+        return run
+
+    def run(self, interpreter: str, script: str, argv: List[str]) -> Tuple[int, bytes]:
+        """
+        start와 같지만 출력을 모두 모아 (exit code, stdout)으로 반환
+
+        Raises:
+            ForkServerError: template을 띄울 수 없거나 응답하지 않는 경우
+        """
+        with self.start(interpreter, script, argv) as run:
+            data = b"".join(run.chunks())
+        return run.returncode, data
+
+    def release(self, server: ForkServer) -> None:
+        """요청을 끝낸 template을 다시 쉬게 함"""
+        with self._lock:
+            self._idle.setdefault(server.interpreter, []).append(server)
+
+    def discard(self, server: ForkServer) -> None:
+        """실패한 template 종료"""
+        server.close()
+
+    def close(self) -> None:
+        """모든 template 종료"""
+        with self._lock:
+            servers = [server for idle in self._idle.values() for server in idle]
+            self._idle.clear()
+        for server in servers:
+            server.close()
+
+
+_pool: Optional[ForkServerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ForkServerPool:
+    """프로세스 전체에서 같이 쓰는 pool (처음 쓸 때 만들고 종료할 때 정리)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ForkServerPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def python_interpreter(executable: str) -> Optional[str]:
+    """
+    실행 파일이 Python 스크립트면 shebang의 인터프리터 경로 반환
+
+    `#!/path/python`과 `#!/usr/bin/env python3` 형태만 인식한다. pyenv shim처럼
+    셸 스크립트이거나 바이너리면 None.
+    """
+    try:
+        with open(executable, "rb") as f:
+            first_line = f.readline(512)
+    except OSError:
+        return None
+    if not first_line.startswith(b"#!"):
+        return None
+
+    words = first_line[2:].decode("utf-8", "replace").split()
+    if words and os.path.basename(words[0]) == "env":
+        words = [word for word in words[1:] if not word.startswith("-")]
+        interpreter = which(words[0]) if words else None
+    else:
+        interpreter = words[0] if words else None
+
+    if not interpreter or not os.path.basename(interpreter).startswith("python"):
+        return None
+    return interpreter if os.access(interpreter, os.X_OK) else None
+
+
+def run_completions_forked(cli_name: str, shell: str = "bash") -> Optional[ForkedRun]:
+    """
+    `<cli> completions <shell>`을 template 인터프리터에서 fork한 자식으로 실행
+
+    프로세스 격리는 유지하면서 인터프리터 시작과 cleo import를 건너뛴다.
+
+    Returns:
+        실행 중인 ForkedRun (stdout을 줄 단위로 읽고 wait()로 exit code 확인)
+        또는 None (Python 스크립트가 아니거나 template이 실패한 경우, 호출하는
+        쪽은 일반 자식 프로세스로 실행한다)
+    """
+    executable = which(cli_name)
+    if executable is None:
+        return None
+    interpreter = python_interpreter(executable)
+    if interpreter is None:
+        return None
+
+    try:
+        return get_pool().start(interpreter, executable, ["completions", shell])
+    except ForkServerError:
+        return None
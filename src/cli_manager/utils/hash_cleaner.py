@@ -1,4 +1,5 @@
 import re
+from typing import Iterable, Iterator
 
 
 def extract_completion_function(content, cli_name):
@@ -44,3 +45,21 @@ def clean_content(content, cli_name):
     cleaned_content = content.replace(original_func, clean_func)
 
     return cleaned_content
+
+
+def clean_lines(lines: Iterable[str], cli_name: str) -> Iterator[str]:
+    """
+    clean_content의 스트리밍 버전
+
+    줄 단위로 읽으면서 처음 나온 completion 함수명을 찾고, 그 줄부터 끝까지
+    깔끔한 함수명으로 바꿔서 내보낸다. 전체 내용을 메모리에 올리지 않는다.
+    """
+    original_func = clean_func = None
+    for line in lines:
+        if original_func is None:
+            original_func = extract_completion_function(line, cli_name)
+            if original_func:
+                clean_func = clean_function_name(original_func, cli_name)
+        if clean_func:
+            line = line.replace(original_func, clean_func)
+        yield line
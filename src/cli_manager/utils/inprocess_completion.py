@@ -0,0 +1,53 @@
+import os
+from typing import Optional, Tuple
+
+from cleo.io.inputs.argv_input import ArgvInput
+from cleo.io.io import IO
+from cleo.io.outputs.buffered_output import BufferedOutput
+from cleo.io.outputs.null_output import NullOutput
+
+from .completion_daemon import load_application
+from .fingerprint import owns_console_script
+from .path_index import which
+
+
+# META의 "generator" 값: 이 CLI는 import하지 않고 항상 별도 프로세스로 생성
+SUBPROCESS_GENERATOR = "subprocess"
+
+
+def render_completion(cli_name: str, shell: str = "bash") -> Tuple[Optional[str], str]:
+    """
+    cleo console script의 completion을 자식 프로세스 없이 이 프로세스에서 생성
+
+    PATH의 실행 파일이 이 Python 환경에 설치된 console script일 때만,
+    importlib.metadata로 entry point를 불러 Application을 얻고 그 `completions`
+    명령을 직접 실행한다. 같은 패키지의 모듈은 한 번만 import된다.
+    프로그램 이름으로 실행 파일 경로를 넘기므로 `<cli> completions <shell>`의
+    stdout과 같은 내용(경로 해시가 붙은 함수 이름 포함)이 나온다. 호출하는 쪽은
+    자식 프로세스 출력과 똑같이 hash_cleaner로 정리한다.
+
+    Returns:
+        (completion_script, message): 이 프로세스에서 만들 수 없으면 script는 None
+        (호출하는 쪽은 자식 프로세스로 생성한다)
+    """
+    executable = which(cli_name)
+    if executable is None:
+        return None, f"{cli_name} not found in PATH"
+    resolved = os.path.realpath(executable)
+    if not owns_console_script(cli_name, resolved):
+        return None, f"{cli_name} is not a console script of this Python environment"
+
+    application = load_application(cli_name)
+    if application is None or not application.has("completions"):
+        return None, f"{cli_name} is not a cleo application"
+
+    output = BufferedOutput()
+    io = IO(ArgvInput([resolved, "completions", shell]), output, NullOutput())
+    try:
+        exit_code = application.get("completions").run(io)
+    except Exception as e:
+        return None, f"Failed to render completion for {cli_name} in-process: {e}"
+
+    if exit_code != 0:
+        return None, f"Failed to render completion for {cli_name} in-process: exit status {exit_code}"
+    return output.fetch(), f"Rendered completion for {cli_name} in-process"
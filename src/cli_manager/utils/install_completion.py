@@ -1,19 +1,73 @@
+import hashlib
+import io
+import os
 import subprocess
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional, Tuple
-from cli_manager.utils.hash_cleaner import clean_content
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from cli_manager.utils.hash_cleaner import clean_content, clean_lines
+from cli_manager.utils.completion_index import entry_matches_file, load_index
+from cli_manager.utils.completion_loader import BASHRC_LOADERS, get_loader_mode
+from cli_manager.utils.forkserver import run_completions_forked
+from cli_manager.utils.inprocess_completion import render_completion
+from cli_manager.utils.meta_parser import (
+    extract_complete_function,
+    extract_completion_commands,
+    parse_meta_from_completion,
+)
+from cli_manager.utils.safe_io import atomic_write_text, atomic_writer
+from cli_manager.utils.shells import (
+    BASH,
+    add_shell_loader,
+    get_shell_completion_file,
+)
+from cli_manager.utils.transaction import FileTransaction, transaction_scope
 
+# 자식 프로세스 stdout을 읽는 버퍼 크기 (줄 단위로 처리하므로 한 줄이 이보다 길어도 됨)
+STREAM_BUFFER_SIZE = 64 * 1024
 
-def generate_completion(cli_name: str) -> Tuple[Optional[str], str]:
+RESTART_MESSAGE = "Restart terminal to activate"
+
+# 본문 뒤에 붙일 내용, 또는 본문이 `complete -F`로 등록한 함수 이름을 받아 만드는 함수
+Footer = Union[str, Callable[[Optional[str]], str]]
+
+
+def generate_completion(
+    cli_name: str, shell: str = BASH, in_process: bool = True
+) -> Tuple[Optional[str], str]:
     """
     지정된 CLI의 completion 생성
 
+    이 Python 환경의 cleo console script는 자식 프로세스 없이 생성하고,
+    아니면 (또는 in_process=False면) `<cli> completions <shell>`을 실행한다.
+
+    Args:
+        cli_name: 원본 CLI 이름
+        shell: 생성할 completion 형식 ("bash", "zsh", "fish")
+        in_process: False면 항상 자식 프로세스로 생성 (import하면 안 되는 CLI)
+
     Returns:
         (completion_script, message): completion script와 상태 메시지
     """
+    if in_process:
+        completion_script, message = render_completion(cli_name, shell)
+        if completion_script is not None:
+            return clean_content(completion_script, cli_name), message
+
+    # Python 스크립트면 template 인터프리터에서 fork한 자식으로 실행
+    forked = run_completions_forked(cli_name, shell)
+    if forked is not None:
+        with forked:
+            output = "".join(forked.stdout)
+        returncode = forked.returncode
+        if returncode != 0:
+            error = subprocess.CalledProcessError(returncode, [cli_name, "completions", shell])
+            return None, f"Failed to generate completion for {cli_name}: {error}"
+        return clean_content(output, cli_name), f"Generated completion for {cli_name}"
+
     try:
         result = subprocess.run(
-            [cli_name, "completions", "bash"],
+            [cli_name, "completions", shell],
             capture_output=True,
             text=True,
             check=True,
@@ -27,90 +81,370 @@ def generate_completion(cli_name: str) -> Tuple[Optional[str], str]:
         return None, f"{cli_name} not found in PATH"
 
 
-def add_wrapper_completion(
-    completion_script: str, wrapper_name: str, cli_name: str
+class _GenerationFailed(Exception):
+    """stream_completion 안에서 임시 파일을 버리기 위한 예외"""
+
+
+class _Unchanged(Exception):
+    """생성 결과가 설치된 파일과 같아 임시 파일을 버릴 때 사용"""
+
+
+def stream_completion(
+    cli_name: str,
+    completion_file: Path,
+    header: str,
+    footer: Footer = "",
+    previous_sha256: Optional[str] = None,
+    transaction: Optional[FileTransaction] = None,
+    shell: str = BASH,
+    in_process: bool = True,
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    CLI의 completion 출력을 메모리에 모으지 않고 바로 completion 파일로 기록
+
+    이 Python 환경의 cleo console script는 자식 프로세스 없이 생성한 내용을
+    쓴다 (render_completion, in_process=False면 사용하지 않음). 그 외의 Python
+    스크립트는 fork server의 자식으로, 나머지는 자식 프로세스로 실행한다.
+    어느 쪽이든 출력을 줄 단위로 읽어 함수명을 정리(clean_lines)하면서
+    같은 디렉토리의 임시 파일에 header, 본문, footer 순서로 쓰고, 생성이
+    성공했을 때만 rename으로 교체한다. 실패하면 기존 파일은 그대로 남는다.
+    쓰면서 계산한 해시가 previous_sha256과 같으면 교체하지 않는다 (mtime 유지).
+    transaction이 주어지면 rename하지 않고 transaction에 stage한다.
+    zsh 스크립트의 첫 줄 `#compdef`는 compinit이 읽도록 header보다 앞에 둔다.
+
+    Returns:
+        (stats, message): stats는 {"size", "commands", "complete_function",
+        "sha256", "changed"} (실패 시 None)와 상태 메시지
+    """
+    command = [cli_name, "completions", shell]
+    rendered = render_completion(cli_name, shell)[0] if in_process else None
+    forked = run_completions_forked(cli_name, shell) if rendered is None else None
+    # forked도 Popen처럼 stdout을 줄 단위로 내보내고 wait()로 exit code를 줌
+    process: Any = forked
+    returncode = 0
+    output: Iterable[str]
+    if rendered is not None:
+        output = io.StringIO(rendered)
+    elif forked is not None:
+        output = forked.stdout
+    else:
+        try:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=STREAM_BUFFER_SIZE,
+            )
+        except FileNotFoundError:
+            return None, f"{cli_name} not found in PATH"
+        output = process.stdout
+    lines = clean_lines(output, cli_name)
+
+    completion_file.parent.mkdir(parents=True, exist_ok=True)
+    commands: List[str] = []
+    complete_function = None
+    digest = hashlib.sha256()
+
+    def write(text: str) -> None:
+        f.write(text)
+        digest.update(text.encode("utf-8"))
+
+    changed = True
+    writer = transaction.writer if transaction else atomic_writer
+    try:
+        with process or nullcontext(), writer(completion_file) as f:
+            has_body = False
+            pending_header = header
+            for line in lines:
+                if pending_header is not None and not line.startswith("#compdef"):
+                    write(pending_header)
+                    pending_header = None
+                has_body = has_body or bool(line.strip())
+                if line.lstrip().startswith(("complete", "compdef", "#compdef")):
+                    commands.extend(
+                        c for c in extract_completion_commands(line, shell) if c not in commands
+                    )
+                    complete_function = complete_function or extract_complete_function(
+                        line, shell
+                    )
+                write(line)
+            if pending_header is not None:
+                write(pending_header)
+            if callable(footer):
+                footer = footer(complete_function)
+            write(footer)
+            commands.extend(
+                c for c in extract_completion_commands(footer, shell) if c not in commands
+            )
+
+            # 생성이 실패하면 rename하지 않고 임시 파일만 버림
+            if process is not None:
+                returncode = process.wait()
+            if returncode != 0:
+                error = subprocess.CalledProcessError(returncode, command)
+                raise _GenerationFailed(
+                    f"Failed to generate completion for {cli_name}: {error}"
+                )
+            if not has_body:
+                raise _GenerationFailed(f"{cli_name} produced no completion script")
+
+            f.flush()
+            size = os.fstat(f.fileno()).st_size
+            if digest.hexdigest() == previous_sha256:
+                raise _Unchanged()
+    except _GenerationFailed as e:
+        return None, str(e)
+    except _Unchanged:
+        changed = False
+
+    stats = {
+        "size": size,
+        "commands": commands,
+        "complete_function": complete_function,
+        "sha256": digest.hexdigest(),
+        "changed": changed,
+    }
+    return stats, f"Generated completion for {cli_name}"
+
+
+def generate_and_install_completion(
+    cli_name: str,
+    header: str,
+    wrapper_name: Optional[str] = None,
+    footer: Footer = "",
+    transaction: Optional[FileTransaction] = None,
+    shell: str = BASH,
+    in_process: bool = True,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[Optional[bool], List[str], bool]:
+    """
+    completion 생성과 설치를 한 번에 (stream_completion 사용)
+
+    Args:
+        cli_name: 원본 CLI 이름
+        header: 본문 앞에 붙일 내용 (META 줄 포함)
+        wrapper_name: wrapper CLI 이름 (메시지용)
+        footer: 본문 뒤에 붙일 내용 (예: wrapper completion)
+        transaction: 주어지면 파일과 index를 여기에 stage만 함 (commit은 호출하는 쪽)
+        shell: completion 형식 (셸마다 다른 디렉토리와 index에 설치)
+        in_process: False면 console script도 자식 프로세스로 생성
+        index: 미리 읽어 둔 shell의 completion index (None이면 여기서 읽음)
+
+    Returns:
+        (success, messages, changed): 생성 자체가 실패하면 success는 None,
+        changed는 completion 파일을 실제로 바꿨는지(stage했는지) 여부
+    """
+    completion_file = get_shell_completion_file(shell, cli_name)
+    completion_dir = completion_file.parent
+    try:
+        with transaction_scope(transaction) as txn:
+            stats, gen_message = stream_completion(
+                cli_name,
+                completion_file,
+                header,
+                footer,
+                previous_sha256=_installed_sha256(completion_dir, completion_file, index),
+                transaction=txn,
+                shell=shell,
+                in_process=in_process,
+            )
+            if stats is None:
+                return None, [gen_message], False
+
+            if stats["changed"]:
+                txn.set_index_entry(
+                    completion_file,
+                    parse_meta_from_completion(header),
+                    stats["size"],
+                    stats["commands"],
+                    stats["complete_function"],
+                    stats["sha256"],
+                )
+            messages = _finish_install(
+                completion_file,
+                wrapper_name,
+                stats["changed"],
+                txn,
+                owned=transaction is None,
+                shell=shell,
+            )
+        return True, messages, stats["changed"]
+    except Exception as e:
+        return False, [f"Failed to install completion: {e}"], False
+
+
+def _installed_sha256(
+    completion_dir: Path,
+    completion_file: Path,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Optional[str]:
+    """index에 기록된 설치 파일 해시 (index 이후 파일이 바뀌었으면 None)"""
+    if not completion_file.exists():
+        return None
+    if index is None:
+        index = load_index(completion_dir)
+    for entry in index.values():
+        if entry["file"] == completion_file.name:
+            return entry.get("sha256") if entry_matches_file(entry, completion_file) else None
+    return None
+
+
+def wrapper_completion_snippet(
+    wrapper_name: str, cli_name: str, backend_function: Optional[str]
 ) -> str:
-    """wrapper script용 completion 추가"""
+    """
+    wrapper script용 completion 함수 (completion script 뒤에 붙임)
+
+    backend 함수 이름은 설치할 때 정해지므로 Tab마다 함수 목록을 뒤지지 않는다
+    (declare -F는 builtin이라 fork가 없다).
 
-    wrapper_completion = f"""
+    Args:
+        wrapper_name: wrapper CLI 이름
+        cli_name: 원본 CLI 이름
+        backend_function: 원본 CLI의 completion 함수 (None이면 _{cli_name}_complete)
+    """
+    backend_function = backend_function or f"_{cli_name}_complete"
+
+    return f"""
 # {wrapper_name} completion (wrapper for {cli_name})
 __{wrapper_name}_complete() {{
-    local cur prev words cword
-    _init_completion || return
-    
-    # {cli_name} completion 함수 찾아서 호출
-    local backend_func=$(declare -F | grep _{cli_name}.*_complete | head -1 | cut -d' ' -f3)
-    if [ -n "$backend_func" ]; then
-        $backend_func "$@"
-    fi
+    declare -F {backend_function} >/dev/null && {backend_function} "$@"
 }}
 
 complete -F __{wrapper_name}_complete {wrapper_name}
 """
 
-    return completion_script + wrapper_completion
+
+def add_wrapper_completion(
+    completion_script: str, wrapper_name: str, cli_name: str
+) -> str:
+    """wrapper script용 completion 추가"""
+    return completion_script + wrapper_completion_snippet(
+        wrapper_name, cli_name, extract_complete_function(completion_script)
+    )
 
 
 def install_completion(
-    cli_name: str, completion_script: str, wrapper_name: Optional[str] = None
-) -> Tuple[bool, list[str]]:
+    cli_name: str,
+    completion_script: str,
+    wrapper_name: Optional[str] = None,
+    transaction: Optional[FileTransaction] = None,
+    shell: str = BASH,
+) -> Tuple[bool, List[str], bool]:
     """
     completion 설치
 
+    transaction이 주어지면 파일과 index를 stage만 하고 commit은 호출하는 쪽이 한다.
+
     Returns:
-        (success, messages): 성공 여부와 메시지 리스트
+        (success, messages, changed): 성공 여부, 메시지 리스트, 내용이 달라
+        파일을 실제로 바꿨는지(stage했는지) 여부
     """
-    messages = []
-
     try:
-        # ~/.completions 폴더 설정
-        completion_dir = Path.home() / ".completions"
-        completion_dir.mkdir(exist_ok=True)
+        # ~/.completions 폴더 설정 (zsh/fish는 그 아래 셸별 디렉토리)
+        completion_file = get_shell_completion_file(shell, cli_name)
+        completion_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # completion 파일 설치 (셸이 반쯤 쓰인 파일을 source하지 않도록 rename으로 교체)
+        with transaction_scope(transaction) as txn:
+            changed = txn.write(completion_file, completion_script)
+            if changed:
+                txn.update_index_entry(completion_file, completion_script)
+            messages = _finish_install(
+                completion_file, wrapper_name, changed, txn, owned=transaction is None, shell=shell
+            )
+        return True, messages, changed
+
+    except Exception as e:
+        return False, [f"Failed to install completion: {e}"], False
+
 
-        # completion 파일 설치
-        completion_file = completion_dir / cli_name
-        completion_file.write_text(completion_script)
+def _finish_install(
+    completion_file: Path,
+    wrapper_name: Optional[str],
+    changed: bool,
+    transaction: FileTransaction,
+    owned: bool = True,
+    shell: str = BASH,
+) -> List[str]:
+    """
+    completion 파일을 stage한 뒤 셸 로더(.bashrc 등)를 확인하고 결과 메시지 생성
 
-        # .bashrc에 로더 추가 (한 번만)
-        bashrc_message = add_bashrc_loader()
-        if bashrc_message:
-            messages.append(bashrc_message)
+    로더는 transaction마다 셸별로 한 번만 확인한다. 여러 CLI를 묶은 transaction
+    (owned=False)이면 "Restart terminal" 안내는 commit하는 쪽이 한 번만 출력한다.
+    """
+    messages = []
 
-        messages.append(f"✅ Completion installed: {completion_file}")
+    if shell == BASH:
+        bashrc_message = transaction.run_once(
+            "bashrc_loader", lambda: add_bashrc_loader(transaction=transaction)
+        )
+    else:
+        bashrc_message = transaction.run_once(
+            f"{shell}_loader", lambda: add_shell_loader(shell, transaction)
+        )
+    if bashrc_message:
+        messages.append(bashrc_message)
 
-        if wrapper_name:
-            messages.append(f"✅ Wrapper completion added for: {wrapper_name}")
+    if not changed:
+        messages.append(f"Completion unchanged: {completion_file}")
+        return messages
 
-        messages.append("Restart terminal to activate")
+    messages.append(f"✅ Completion installed: {completion_file}")
 
-        return True, messages
+    if wrapper_name:
+        messages.append(f"✅ Wrapper completion added for: {wrapper_name}")
 
-    except Exception as e:
-        return False, [f"Failed to install completion: {e}"]
+    if owned:
+        messages.append(RESTART_MESSAGE)
+    return messages
 
 
-def add_bashrc_loader() -> Optional[str]:
+def add_bashrc_loader(
+    mode: Optional[str] = None, transaction: Optional[FileTransaction] = None
+) -> Optional[str]:
     """
     필요시 .bashrc에 completion 로더 추가
 
+    .bashrc는 rename으로 통째로 교체한다. 다른 supercli 프로세스와 겹치지 않도록
+    호출하는 쪽에서 exclusive_lock을 잡아야 한다. transaction이 주어지면
+    stage된 .bashrc 내용을 기준으로 확인하고 변경도 stage한다 (commit이 잠금을 잡음).
+
+    Args:
+        mode: 로더 모드 ("eager" 또는 "lazy", None이면 설정값 사용)
+        transaction: 변경을 stage할 transaction (선택사항)
+
     Returns:
-        메시지 (추가했을 경우만)
+        메시지 (추가하거나 바꿨을 경우만)
     """
     bashrc = Path.home() / ".bashrc"
+    mode = mode or get_loader_mode()
+    loader = BASHRC_LOADERS[mode]
 
-    if bashrc.exists() and "~/.completions" in bashrc.read_text():
+    if transaction:
+        content = transaction.read_text(bashrc)
+        write = transaction.write
+    else:
+        content = bashrc.read_text() if bashrc.exists() else ""
+        write = atomic_write_text
+    if loader in content:
         return None  # 이미 있음
 
-    loader = """
-# Auto-load custom completions
-for completion in ~/.completions/*; do
-    [ -r "$completion" ] && source "$completion"
-done
-"""
+    # 다른 모드의 로더가 있으면 교체
+    for other_loader in BASHRC_LOADERS.values():
+        if other_loader in content:
+            try:
+                write(bashrc, content.replace(other_loader, loader))
+                return f"Switched completion loader in ~/.bashrc to {mode} mode"
+            except Exception as e:
+                return f"Failed to update loader in .bashrc: {e}"
+
+    if "~/.completions" in content:
+        return None  # 사용자가 직접 작성한 로더는 건드리지 않음
 
     try:
-        with open(bashrc, "a") as f:
-            f.write(loader)
+        write(bashrc, content + loader)
         return "Added completion loader to ~/.bashrc"
     except Exception as e:
         return f"Failed to add loader to .bashrc: {e}"
@@ -1,14 +1,27 @@
 from pathlib import Path
-from typing import Optional, Tuple, List
-import shutil
+from typing import Any, Dict, List, Optional, Tuple
 
-from .install_completion import generate_completion, install_completion
-from .meta_parser import parse_meta_from_completion, add_meta_to_completion
+from .completion_engine import map_ordered
+from .install_completion import generate_and_install_completion
+from .fingerprint import compute_fingerprint, fingerprints_match
+from .inprocess_completion import SUBPROCESS_GENERATOR
+from .completion_index import load_index, rebuild_index
+from .meta_parser import format_meta_line
+from .missing_cache import clear_missing, is_known_missing, mark_missing
+from .shells import BASH, get_shell_completion_dir
+from .static_completion import STATIC_GENERATOR, install_static_completion
+from .transaction import FileTransaction, transaction_scope
 
 
 def refresh_cli_completion(
-    cli_name: str, backend_name: str, wrapper_name: Optional[str] = None
-) -> Tuple[bool, List[str]]:
+    cli_name: str,
+    backend_name: str,
+    wrapper_name: Optional[str] = None,
+    skip_unchanged: bool = False,
+    transaction: Optional[FileTransaction] = None,
+    shell: str = BASH,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[bool, List[str], bool]:
     """
     특정 CLI의 completion을 갱신하거나 제거
 
@@ -16,112 +29,210 @@ def refresh_cli_completion(
         cli_name: 원본 CLI 이름 (예: "docker")
         backend_name: backend 이름 (예: "supercli_backend")
         wrapper_name: wrapper CLI 이름 (선택사항)
+        skip_unchanged: True면 실행 파일 fingerprint가 그대로인 경우 재생성하지 않음
+        transaction: 주어지면 변경을 여기에 stage만 함 (commit은 호출하는 쪽)
+        shell: completion 형식 ("bash", "zsh", "fish")
+        index: 미리 읽어 둔 shell의 completion index (여러 CLI를 갱신할 때 한 번만
+            읽어 넘김, None이면 여기서 읽음)
 
     Returns:
-        (success, messages): 성공 여부와 상태 메시지 리스트
+        (success, messages, changed): 성공 여부, 상태 메시지 리스트, completion
+        파일을 설치하거나 제거했는지 여부 (그대로면 False)
     """
     messages = []
-    completion_dir = Path.home() / ".completions"
+    completion_dir = get_shell_completion_dir(shell)
+
+    if skip_unchanged and is_known_missing(cli_name):
+        return True, [f"Skipped {cli_name} (not found in PATH, cached)"], False
+
+    if index is None:
+        index = load_index(completion_dir)
+    fingerprint = compute_fingerprint(cli_name)
+
+    if skip_unchanged and fingerprint:
+        if _is_up_to_date(index, cli_name, fingerprint):
+            return True, [f"{cli_name} is up to date"], False
+
+    # 1. 생성과 설치를 한 번에 (CLI 출력을 META 줄 뒤에 바로 파일로 흘려 보냄)
+    # PATH index에 없는 CLI는 실행해 보지 않음
+    if fingerprint is None:
+        success, install_messages, changed = None, [f"{cli_name} not found in PATH"], False
+    else:
+        # completion-init으로 지정한 결과 캐시 설정과 생성 방식은 다시 생성해도 유지
+        previous = index.get(cli_name) or {}
+        if previous.get("generator") == STATIC_GENERATOR:
+            success, install_messages, changed = install_static_completion(
+                cli_name,
+                backend_name,
+                wrapper_name,
+                fingerprint=fingerprint,
+                cache=previous.get("cache"),
+                transaction=transaction,
+            )
+        else:
+            isolated = previous.get("generator") == SUBPROCESS_GENERATOR
+            meta_line = format_meta_line(
+                backend_name,
+                cli_name,
+                wrapper_name or cli_name,
+                fingerprint=fingerprint,
+                cache=previous.get("cache"),
+                shell=shell,
+                generator=SUBPROCESS_GENERATOR if isolated else None,
+            )
+            success, install_messages, changed = generate_and_install_completion(
+                cli_name,
+                meta_line + "\n",
+                wrapper_name,
+                transaction=transaction,
+                shell=shell,
+                in_process=not isolated,
+                index=index,
+            )
+
+    # 2. CLI가 없거나 생성에 실패함
+    if success is None:
+        if fingerprint is None:
+            mark_missing(cli_name)
 
-    # 1. CLI 존재 여부 확인
-    completion_script, gen_message = generate_completion(cli_name)
-    if not completion_script:
         # CLI가 없으면 기존 completion 파일 제거
-        completion_file = _find_completion_file(completion_dir, cli_name)
+        completion_file = _find_completion_file(completion_dir, cli_name, index)
         if completion_file:
             try:
-                completion_file.unlink()
+                with transaction_scope(transaction) as txn:
+                    txn.delete(completion_file)
+                    txn.remove_index_entry(completion_dir, cli_name)
                 messages.append(f"Removed completion for {cli_name} (CLI not found)")
-                return True, messages
+                return True, messages, True
             except Exception as e:
-                return False, [f"Failed to remove completion file: {e}"]
-        return True, [f"No completion file found for {cli_name}"]
+                return False, [f"Failed to remove completion file: {e}"], False
+        return True, [f"No completion file found for {cli_name}"], False
 
-    # 2. Meta 정보 추가
-    completion_with_meta = add_meta_to_completion(
-        backend_name, cli_name, wrapper_name or cli_name, completion_script
-    )
-
-    # 3. 설치 또는 갱신
-    success, install_messages = install_completion(
-        cli_name, completion_with_meta, wrapper_name
-    )
+    clear_missing(cli_name)
 
     messages.extend(install_messages)
-    return success, messages
+    return success, messages, changed
 
 
-def refresh_all_completions(backend_name: str) -> Tuple[bool, List[str]]:
+def refresh_all_completions(
+    backend_name: str, jobs: Optional[int] = None, force: bool = False, shell: str = BASH
+) -> Tuple[bool, List[str], Dict[str, bool]]:
     """
     모든 관리되는 completion 파일들을 검사하고 갱신
 
+    바뀐 completion 파일과 index는 transaction 하나로 모아 마지막에 한 번에
+    반영하므로, 반영이 실패하면 어떤 파일도 바뀌지 않는다.
+
     Args:
         backend_name: backend 이름 (예: "supercli_backend")
+        jobs: 동시에 갱신할 최대 CLI 수 (None이면 기본값)
+        force: True면 fingerprint와 관계없이 모두 재생성
+        shell: 갱신할 셸 (셸마다 completion 디렉토리와 index가 따로 있음)
 
     Returns:
-        (success, messages): 전체 성공 여부와 상태 메시지 리스트
+        (success, messages, changes): 전체 성공 여부, 상태 메시지 리스트,
+        처리한 CLI -> completion 파일을 바꿨는지 여부 (실패한 CLI는 빠짐)
     """
     messages = []
-    completion_dir = Path.home() / ".completions"
+    changes: Dict[str, bool] = {}
+    completion_dir = get_shell_completion_dir(shell)
 
     if not completion_dir.exists():
-        return True, ["No completions directory found"]
+        return True, ["No completions directory found"], changes
 
     overall_success = True
+    targets: List[Tuple[str, Optional[str]]] = []
+
+    # index에서 관리 대상 목록을 읽음 (--force면 META 헤더로부터 다시 만듦)
+    try:
+        index = rebuild_index(completion_dir) if force else load_index(completion_dir)
+    except Exception as e:
+        return False, [f"Error reading completion index: {e}"], changes
 
-    for completion_file in completion_dir.glob("*"):
-        if not completion_file.is_file():
+    for cli_name, entry in sorted(index.items()):
+        if not entry.get("managed"):  # 우리가 관리하지 않는 파일
             continue
 
         try:
-            content = completion_file.read_text()
-            meta = parse_meta_from_completion(content)
-
-            if not meta:  # 우리가 관리하지 않는 파일
-                continue
-
-            # Meta 정보로부터 CLI 정보 추출
-            cli_name = meta.get("source_cli")
-            wrapper_name = meta.get("wrapper_cli")
+            wrapper_name = entry.get("wrapper")
 
             if cli_name == wrapper_name:
                 wrapper_name = None
 
-            # 개별 CLI completion 갱신
-            success, cli_messages = refresh_cli_completion(
-                cli_name, backend_name, wrapper_name
-            )
-
-            messages.extend(cli_messages)
-            if not success:
-                overall_success = False
+            # 실행 파일이 바뀌지 않은 CLI는 다시 실행하지 않음
+            if not force:
+                if is_known_missing(cli_name):
+                    messages.append(f"Skipped {cli_name} (not found in PATH, cached)")
+                    changes[cli_name] = False
+                    continue
+                if fingerprints_match(
+                    entry.get("fingerprint"), compute_fingerprint(cli_name)
+                ):
+                    messages.append(f"{cli_name} is up to date")
+                    changes[cli_name] = False
+                    continue
+
+            targets.append((cli_name, wrapper_name))
 
         except Exception as e:
-            messages.append(f"Error processing {completion_file.name}: {e}")
+            messages.append(f"Error processing {entry['file']}: {e}")
+            overall_success = False
+
+    # 개별 CLI completion 갱신 (병렬, 결과는 파일 순서대로)
+    transaction = FileTransaction(completion_dir)
+    results = map_ordered(
+        lambda target: refresh_cli_completion(
+            target[0],
+            backend_name,
+            target[1],
+            transaction=transaction,
+            shell=shell,
+            index=index,
+        ),
+        targets,
+        jobs,
+    )
+    for (cli_name, _), result, error in results:
+        if error is not None:
+            messages.append(f"Error processing {cli_name}: {error}")
             overall_success = False
+            continue
 
-    return overall_success, messages
+        success, cli_messages, changed = result
+        messages.extend(cli_messages)
+        if success:
+            changes[cli_name] = changed
+        else:
+            overall_success = False
 
+    try:
+        transaction.commit()
+    except Exception as e:
+        return False, [f"Failed to apply completion changes (rolled back): {e}"], {}
 
-def _find_completion_file(completion_dir: Path, cli_name: str) -> Optional[Path]:
+    return overall_success, messages, changes
+
+
+def _find_completion_file(
+    completion_dir: Path, cli_name: str, index: Dict[str, Dict[str, Any]]
+) -> Optional[Path]:
     """
     CLI에 해당하는 completion 파일 찾기
-    Meta 정보를 확인하여 일치하는 파일 반환
+    completion index에서 source_cli가 일치하는 관리 파일 반환
     """
-    if not completion_dir.exists():
+    entry = index.get(cli_name)
+    if not entry or not entry.get("managed"):
         return None
 
-    for file in completion_dir.glob("*"):
-        if not file.is_file():
-            continue
+    completion_file = completion_dir / entry["file"]
+    if completion_file.is_file():
+        return completion_file
+    return None
 
-        try:
-            content = file.read_text()
-            meta = parse_meta_from_completion(content)
 
-            if meta and meta.get("source_cli") == cli_name:
-                return file
-        except:
-            continue
-
-    return None
+def _is_up_to_date(index: Dict[str, Dict[str, Any]], cli_name: str, fingerprint: dict) -> bool:
+    """index에 기록된 fingerprint가 현재 실행 파일과 같은지 확인"""
+    entry = index.get(cli_name)
+    return bool(entry and entry.get("managed")) and fingerprints_match(
+        entry.get("fingerprint"), fingerprint
+    )
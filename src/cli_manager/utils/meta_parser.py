@@ -1,39 +1,105 @@
 import json
+import os
 import re
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 
 META_PREFIX = "# META: "
+# completion 스크립트 형식 (META의 "shell", 없으면 bash)
+DEFAULT_SHELL = "bash"
+# META는 항상 첫 줄에 들어가므로 파일 앞부분만 읽으면 됨
+META_HEADER_LIMIT = 4096
+
+# complete ... -F func name1 name2 형태의 등록 줄
+COMPLETE_LINE_PATTERN = re.compile(r"^\s*complete\s+(.*)$", re.MULTILINE)
+# complete ... -F func ... 에서 함수 이름
+COMPLETE_FUNCTION_PATTERN = re.compile(r"^\s*complete\s.*?-F\s+(\S+)", re.MULTILINE)
+# zsh: 첫 줄의 `#compdef name1 name2`와 `compdef func name` 등록 줄
+COMPDEF_HEADER_PATTERN = re.compile(r"^#compdef\s+(.*)$", re.MULTILINE)
+COMPDEF_FUNCTION_PATTERN = re.compile(r"^\s*compdef\s+(\S+)", re.MULTILINE)
+# fish: complete -c name (또는 --command name)
+FISH_COMMAND_PATTERN = re.compile(r"^\s*complete\s.*?(?:-c|--command)[\s=]+(\S+)", re.MULTILINE)
+
+
+def format_meta_line(
+    backend_name: str,
+    source_cli: str,
+    wrapper_cli: str,
+    fingerprint: Optional[Dict[str, Any]] = None,
+    cache: Optional[Dict[str, Any]] = None,
+    shell: str = DEFAULT_SHELL,
+    generator: Optional[str] = None,
+) -> str:
+    """
+    completion 파일 맨 위에 들어가는 META 줄 생성 (줄바꿈 제외)
+
+    Args:
+        backend_name: supercli backend 이름 (예: "supercli_backend")
+        source_cli: 원본 CLI 이름 (예: "docker")
+        wrapper_cli: wrapper CLI 이름 (예: "my_docker")
+        fingerprint: 원본 CLI 실행 파일의 fingerprint (선택사항)
+        cache: 데몬 결과 캐시 설정 {"ttl": 초, "budget_ms": 밀리초} (선택사항)
+        shell: completion 스크립트의 셸 (bash가 아니면 META에 기록)
+        generator: CLI 출력이 아닌 다른 방식으로 만든 경우 그 이름 (예: "static")
+    """
+    meta_data: Dict[str, Any] = {
+        "backend": backend_name,
+        "source_cli": source_cli,
+        "wrapper_cli": wrapper_cli,
+    }
+    if fingerprint:
+        meta_data["fingerprint"] = fingerprint
+    if cache:
+        meta_data["cache"] = cache
+    if shell != DEFAULT_SHELL:
+        meta_data["shell"] = shell
+    if generator:
+        meta_data["generator"] = generator
+
+    return META_PREFIX + json.dumps(meta_data, separators=(",", ":"))
 
 
 def add_meta_to_completion(
-    backend_name: str, source_cli: str, wrapper_cli: str, completion_content: str
+    backend_name: str,
+    source_cli: str,
+    wrapper_cli: str,
+    completion_content: str,
+    fingerprint: Optional[Dict[str, Any]] = None,
+    cache: Optional[Dict[str, Any]] = None,
+    shell: str = DEFAULT_SHELL,
+    generator: Optional[str] = None,
 ) -> str:
     """
     completion 파일에 메타 정보를 추가
 
+    zsh의 `#compdef` 줄은 compinit이 첫 줄에서만 찾으므로 META는 그 다음 줄에 넣는다.
+
     Args:
         backend_name: supercli backend 이름 (예: "supercli_backend")
         source_cli: 원본 CLI 이름 (예: "docker")
         wrapper_cli: wrapper CLI 이름 (예: "my_docker")
         completion_content: 기존 completion script 내용
+        fingerprint: 원본 CLI 실행 파일의 fingerprint (선택사항)
+        cache: 데몬 결과 캐시 설정 (선택사항)
+        shell: completion 스크립트의 셸
+        generator: completion 생성 방식 (선택사항)
 
     Returns:
         메타 정보가 추가된 completion script
     """
-    meta_data = {
-        "backend": backend_name,
-        "source_cli": source_cli,
-        "wrapper_cli": wrapper_cli,
-    }
+    meta_line = format_meta_line(
+        backend_name, source_cli, wrapper_cli, fingerprint, cache, shell, generator
+    )
 
-    meta_line = META_PREFIX + json.dumps(meta_data, separators=(",", ":"))
+    if completion_content.startswith("#compdef"):
+        first_line, _, rest = completion_content.partition("\n")
+        return f"{first_line}\n{meta_line}\n{rest}"
 
     # 메타 정보를 맨 위에 추가
     return f"{meta_line}\n{completion_content}"
 
 
-def parse_meta_from_completion(completion_content: str) -> Optional[Dict[str, str]]:
+def parse_meta_from_completion(completion_content: str) -> Optional[Dict[str, Any]]:
     """
     completion 파일에서 메타 정보를 추출
 
@@ -43,16 +109,121 @@ def parse_meta_from_completion(completion_content: str) -> Optional[Dict[str, st
     Returns:
         메타 정보 dictionary 또는 None (메타 정보가 없는 경우)
     """
-    lines = completion_content.split("\n")
+    # 전체를 줄로 나누지 않고 META 줄 하나만 찾음 (보통 첫 줄)
+    if completion_content.startswith(META_PREFIX):
+        start = 0
+    else:
+        start = completion_content.find("\n" + META_PREFIX)
+        if start == -1:
+            return None
+        start += 1
+
+    end = completion_content.find("\n", start)
+    meta_json = completion_content[start + len(META_PREFIX) : end if end != -1 else None]
+    try:
+        return json.loads(meta_json)
+    except json.JSONDecodeError:
+        # 메타 정보 파싱 실패
+        return None
+
 
-    # 첫 번째 줄에서 메타 정보 찾기
-    for line in lines:
-        if line.startswith(META_PREFIX):
-            try:
-                meta_json = line[len(META_PREFIX) :]
-                return json.loads(meta_json)
-            except json.JSONDecodeError:
-                # 메타 정보 파싱 실패
-                return None
+def get_meta_shell(meta: Optional[Dict[str, Any]]) -> str:
+    """메타 정보의 셸 (기록되지 않았으면 bash)"""
+    return (meta or {}).get("shell") or DEFAULT_SHELL
+
+
+def read_meta_header(
+    path: Union[str, "os.PathLike[str]"], limit: int = META_HEADER_LIMIT
+) -> Optional[Dict[str, Any]]:
+    """
+    completion 파일 앞부분만 읽어서 메타 정보 추출
 
-    return None
+    os.scandir의 DirEntry도 그대로 받을 수 있다. META 줄이 limit보다 길면
+    그 줄 끝까지만 더 읽는다.
+
+    Args:
+        path: completion 파일 경로 (또는 os.DirEntry)
+        limit: 처음에 읽을 최대 바이트 수
+
+    Returns:
+        메타 정보 dictionary 또는 None (메타 정보가 없는 경우)
+
+    Raises:
+        OSError: 파일을 읽을 수 없는 경우
+    """
+    prefix = META_PREFIX.encode()
+    with open(os.fspath(path), "rb") as f:
+        head = f.read(limit)
+        meta_start = head.find(prefix)
+        if meta_start != -1 and b"\n" not in head[meta_start:]:
+            head += f.readline()
+
+    return parse_meta_from_completion(head.decode("utf-8", errors="replace"))
+
+
+def extract_completion_commands(
+    completion_content: str, shell: str = DEFAULT_SHELL
+) -> List[str]:
+    """
+    completion script가 `complete`로 등록하는 명령 이름 추출
+
+    Args:
+        completion_content: completion script 내용
+        shell: 스크립트 형식 (zsh는 `#compdef` 줄, fish는 `complete -c`)
+
+    Returns:
+        등록되는 명령 이름 리스트 (등장 순서, 중복 제거)
+    """
+    commands: List[str] = []
+    if shell == "zsh":
+        for match in COMPDEF_HEADER_PATTERN.finditer(completion_content):
+            is_pattern = False
+            for name in match.group(1).split():
+                if name.startswith("-"):
+                    # -p/-P 뒤는 명령 이름이 아니라 패턴 (-N이 나오면 다시 이름)
+                    is_pattern = name in ("-p", "-P") or (is_pattern and name != "-N")
+                # cleo는 실행 파일 경로도 함께 등록함
+                elif not is_pattern and "/" not in name and name not in commands:
+                    commands.append(name)
+        return commands
+    if shell == "fish":
+        for match in FISH_COMMAND_PATTERN.finditer(completion_content):
+            name = match.group(1).strip("'\"")
+            if name not in commands:
+                commands.append(name)
+        return commands
+
+    for match in COMPLETE_LINE_PATTERN.finditer(completion_content):
+        words = match.group(1).split()
+        names = []
+        skip_next = False
+        for word in words:
+            if skip_next:
+                skip_next = False
+            elif word.startswith("-"):
+                # 값을 받는 옵션 (-F func, -o default 등)
+                skip_next = word in ("-A", "-C", "-F", "-G", "-P", "-S", "-W", "-X", "-o")
+            else:
+                names.append(word)
+        for name in names:
+            if name not in commands:
+                commands.append(name)
+    return commands
+
+
+def extract_complete_function(
+    completion_content: str, shell: str = DEFAULT_SHELL
+) -> Optional[str]:
+    """
+    completion script가 `complete -F`로 등록하는 (첫 번째) 함수 이름 추출
+
+    zsh는 `compdef func`로 등록하는 함수, fish는 함수로 등록하지 않으므로 None.
+
+    Returns:
+        함수 이름 또는 None (`complete -F` 줄이 없는 경우)
+    """
+    if shell == "fish":
+        return None
+    pattern = COMPDEF_FUNCTION_PATTERN if shell == "zsh" else COMPLETE_FUNCTION_PATTERN
+    match = pattern.search(completion_content)
+    return match.group(1) if match else None
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .path_index import path_stamp
+from .safe_io import atomic_write_text, get_state_dir
+
+
+# PATH에서 찾지 못한 CLI를 다시 확인하기까지의 시간 (초)
+MISSING_TTL_SECONDS = 60 * 60
+
+_lock = threading.RLock()
+# 마지막으로 읽은 파일의 (경로, mtime_ns, 크기)와 내용 (바뀌지 않았으면 다시 parse하지 않음)
+_memo: Tuple[Optional[Tuple[str, int, int]], Dict[str, Dict[str, Any]]] = (None, {})
+
+
+def get_missing_cache_path() -> Path:
+    """negative cache 파일 경로 반환"""
+    return get_state_dir() / "missing.json"
+
+
+def _load() -> Dict[str, Dict[str, Any]]:
+    """
+    기록 읽기 (CLI 이름 -> {"at": 기록 시각, "path": 기록할 때의 path_stamp()})
+
+    파일의 mtime과 크기가 지난번과 같으면 parse하지 않고 그 내용을 쓰므로
+    completion-refresh가 CLI마다 불러도 파일은 한 번만 읽는다.
+    """
+    global _memo
+    cache_path = get_missing_cache_path()
+    with _lock:
+        try:
+            key = _file_key(cache_path)
+        except OSError:
+            return {}
+        if _memo[0] != key:
+            try:
+                data = json.loads(cache_path.read_text())
+            except (OSError, ValueError):
+                data = None
+            entries = (
+                {name: entry for name, entry in data.items() if isinstance(entry, dict)}
+                if isinstance(data, dict)
+                else {}
+            )
+            _memo = (key, entries)
+        return dict(_memo[1])
+
+
+def _save(entries: Dict[str, Dict[str, Any]]) -> None:
+    global _memo
+    cache_path = get_missing_cache_path()
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(cache_path, json.dumps(entries, separators=(",", ":")))
+    _memo = (_file_key(cache_path), dict(entries))
+
+
+def _file_key(path: Path) -> Tuple[str, int, int]:
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def is_known_missing(
+    cli_name: str, ttl: float = MISSING_TTL_SECONDS, now: Optional[float] = None
+) -> bool:
+    """
+    CLI가 TTL 이내에 PATH에서 없다고 기록되었는지 확인
+
+    기록한 뒤 PATH 값이나 PATH 디렉토리의 mtime이 바뀌었으면 (새로 설치되었을
+    수 있으므로) False를 반환한다. True면 PATH를 다시 찾아보지 않아도 된다.
+    """
+    entry = _load().get(cli_name)
+    if entry is None:
+        return False
+    now = time.time() if now is None else now
+    if now - entry.get("at", 0) >= ttl:
+        return False
+    return entry.get("path") == path_stamp()
+
+
+def mark_missing(cli_name: str, now: Optional[float] = None) -> None:
+    """CLI를 현재 PATH에 없는 것으로 기록"""
+    entry = {"at": time.time() if now is None else now, "path": path_stamp()}
+    with _lock:
+        entries = _load()
+        entries[cli_name] = entry
+        try:
+            _save(entries)
+        except OSError:
+            pass  # 캐시는 최적화일 뿐이므로 실패해도 무시
+
+
+def clear_missing(cli_name: str) -> None:
+    """CLI의 negative cache 항목 제거"""
+    with _lock:
+        entries = _load()
+        if cli_name not in entries:
+            return
+        del entries[cli_name]
+        try:
+            _save(entries)
+        except OSError:
+            pass
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .safe_io import atomic_write_text, get_state_dir
+
+
+# 1이면 PATH 디렉토리별 파일 목록을 디렉토리 mtime과 함께 저장해 다음 실행에서 재사용
+PATH_CACHE_ENV = "SUPERCLI_PATH_CACHE"
+PATH_CACHE_VERSION = 1
+
+_lock = threading.Lock()
+# PATH 문자열 -> [(디렉토리, 파일 이름 집합)] (프로세스당 한 번)
+_memo: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+# PATH 문자열 -> path_stamp() 값 (프로세스당 한 번)
+_stamps: Dict[str, str] = {}
+
+
+def get_path_cache_path() -> Path:
+    """PATH index 캐시 파일 경로 반환"""
+    return get_state_dir() / "path_index.json"
+
+
+def which(cli_name: str) -> Optional[str]:
+    """
+    shutil.which와 같지만 PATH 디렉토리를 한 번씩만 읽은 index 사용
+
+    이름이 있는 디렉토리에서만 실행 권한을 확인하므로 CLI가 많아도
+    PATH 디렉토리 수만큼의 stat이 반복되지 않는다.
+
+    Returns:
+        실행 파일 경로 또는 None (PATH에 없는 경우)
+    """
+    if os.sep in cli_name:
+        return shutil.which(cli_name)
+
+    for directory, names in get_path_index():
+        if cli_name not in names:
+            continue
+        path = os.path.join(directory, cli_name)
+        if os.access(path, os.X_OK) and not os.path.isdir(path):
+            return path
+    return None
+
+
+def get_path_index() -> List[Tuple[str, FrozenSet[str]]]:
+    """
+    현재 PATH의 디렉토리별 파일 이름 목록 (PATH 순서)
+
+    디렉토리당 os.scandir 한 번으로 만들고 프로세스 안에서는 PATH 값별로
+    재사용한다. SUPERCLI_PATH_CACHE=1이면 디렉토리 mtime이 바뀐 디렉토리만
+    다시 읽는다.
+    """
+    path_value = os.environ.get("PATH", os.defpath)
+    with _lock:
+        index = _memo.get(path_value)
+        if index is None:
+            index = _memo[path_value] = _build(_path_dirs(path_value))
+        return index
+
+
+def path_stamp() -> str:
+    """
+    PATH 값과 PATH 디렉토리들의 mtime으로 만든 짧은 해시
+
+    디렉토리에 파일이 생기거나 지워지면 그 디렉토리의 mtime이 바뀌므로, 값이
+    같으면 PATH에서 찾을 수 있는 실행 파일 목록도 같다고 본다. 디렉토리를
+    읽지 않고 stat만 하며 프로세스 안에서는 PATH 값별로 재사용한다.
+    """
+    path_value = os.environ.get("PATH", os.defpath)
+    with _lock:
+        stamp = _stamps.get(path_value)
+        if stamp is None:
+            mtimes = []
+            for directory in _path_dirs(path_value):
+                try:
+                    mtimes.append([directory, os.stat(directory).st_mtime_ns])
+                except OSError:
+                    mtimes.append([directory, None])  # 나중에 생기면 값이 바뀜
+            stamp = _stamps[path_value] = hashlib.sha256(
+                json.dumps(mtimes).encode()
+            ).hexdigest()[:16]
+        return stamp
+
+
+def clear_path_index() -> None:
+    """프로세스 안의 PATH index 버리기 (PATH 디렉토리 내용이 바뀐 경우)"""
+    with _lock:
+        _memo.clear()
+        _stamps.clear()
+
+
+def _path_dirs(path_value: str) -> List[str]:
+    dirs = []
+    for directory in path_value.split(os.pathsep):
+        directory = directory or os.curdir  # shutil.which와 같이 빈 항목은 현재 디렉토리
+        if directory not in dirs:
+            dirs.append(directory)
+    return dirs
+
+
+def _build(dirs: List[str]) -> List[Tuple[str, FrozenSet[str]]]:
+    persist = os.environ.get(PATH_CACHE_ENV, "") not in ("", "0")
+    cached = _load_cache() if persist else {}
+    changed = False
+
+    index = []
+    for directory in dirs:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+
+        entry = cached.get(directory)
+        if entry and entry.get("mtime_ns") == mtime_ns:
+            names = frozenset(entry["names"])
+        else:
+            names = _scan(directory)
+            cached[directory] = {"mtime_ns": mtime_ns, "names": sorted(names)}
+            changed = True
+        index.append((directory, names))
+
+    if persist and changed:
+        try:
+            cache_path = get_path_cache_path()
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(
+                cache_path,
+                json.dumps({"version": PATH_CACHE_VERSION, "dirs": cached}, separators=(",", ":")),
+            )
+        except OSError:
+            pass  # 캐시일 뿐이므로 저장 실패는 무시
+    return index
+
+
+def _scan(directory: str) -> FrozenSet[str]:
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _load_cache() -> Dict[str, Dict]:
+    try:
+        data = json.loads(get_path_cache_path().read_text())
+        if data.get("version") == PATH_CACHE_VERSION and isinstance(data.get("dirs"), dict):
+            return data["dirs"]
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .path_index import which
+from .safe_io import atomic_write_text, get_state_dir, shared_lock
+from .transaction import FileTransaction
+from .wrapper_utils import get_registered_clis
+
+
+REGISTRY_VERSION = 1
+REGISTRY_FILE_NAME = "registry.json"
+
+
+def get_registry_path() -> Path:
+    """registry 파일 경로 반환"""
+    return get_state_dir() / REGISTRY_FILE_NAME
+
+
+def make_record(
+    cli_name: str,
+    fingerprint: Optional[Dict[str, Any]] = None,
+    generation_seconds: Optional[float] = None,
+    added_at: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    등록된 CLI 하나의 registry 레코드 생성
+
+    Returns:
+        {"name", "path", "added_at", "fingerprint", "generation_seconds"}
+    """
+    if fingerprint:
+        path = fingerprint.get("path")
+    else:
+        executable = which(cli_name)
+        path = os.path.realpath(executable) if executable else None
+
+    return {
+        "name": cli_name,
+        "path": path,
+        "added_at": time.time() if added_at is None else added_at,
+        "fingerprint": fingerprint,
+        "generation_seconds": (
+            None if generation_seconds is None else round(generation_seconds, 4)
+        ),
+    }
+
+
+def load_registry() -> Dict[str, Dict[str, Any]]:
+    """
+    registry 읽기 (등록 순서 유지)
+
+    registry 파일이 아직 없으면 예전 wrapper script의 registered_clis 줄에서
+    목록을 가져온다. 이 경우 레코드에는 이름과 경로만 채워지고, 다음 저장 때
+    registry 파일로 옮겨진다.
+
+    Returns:
+        CLI 이름 -> 레코드 딕셔너리
+    """
+    try:
+        with shared_lock():
+            data = json.loads(get_registry_path().read_text())
+    except FileNotFoundError:
+        return {cli: make_record(cli, added_at=0) for cli in get_registered_clis()}
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Failed to read registry {get_registry_path()}: {e}")
+
+    if not isinstance(data, dict) or data.get("version") != REGISTRY_VERSION:
+        raise ValueError(f"Unsupported registry format: {get_registry_path()}")
+
+    return {record["name"]: record for record in data.get("clis", [])}
+
+
+def save_registry(
+    registry: Dict[str, Dict[str, Any]], transaction: Optional[FileTransaction] = None
+) -> Path:
+    """
+    registry 저장 (임시 파일에 쓴 뒤 rename)
+
+    load_registry부터 저장까지의 read-modify-write는 호출하는 쪽에서
+    exclusive_lock으로 감싸야 다른 프로세스의 변경을 잃지 않는다.
+    transaction이 주어지면 stage만 한다.
+    """
+    registry_path = get_registry_path()
+    registry_path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = {"version": REGISTRY_VERSION, "clis": list(registry.values())}
+    if transaction:
+        transaction.write(registry_path, json.dumps(data, indent=1))
+    else:
+        atomic_write_text(registry_path, json.dumps(data, indent=1))
+    return registry_path
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .safe_io import atomic_write_text
+
+
+# META의 "cache" 항목이 budget_ms를 지정하지 않았을 때의 응답 시간 한도 (밀리초)
+DEFAULT_BUDGET_MS = 50
+CACHE_VERSION = 1
+# CLI마다 남겨 두는 최대 결과 수 (넘으면 가장 오래 쓰이지 않은 것부터 지움)
+MAX_ENTRIES_PER_CLI = 256
+
+
+def parse_cache_settings(value: Any) -> Optional[Dict[str, float]]:
+    """
+    META의 "cache" 항목 검사 ({"ttl": 초, "budget_ms": 밀리초})
+
+    Returns:
+        {"ttl", "budget_ms"} 또는 None (캐시를 쓰지 않는 CLI이거나 값이 잘못된 경우)
+    """
+    if not isinstance(value, dict):
+        return None
+    try:
+        ttl = float(value["ttl"])
+        budget_ms = float(value.get("budget_ms", DEFAULT_BUDGET_MS))
+    except (KeyError, TypeError, ValueError):
+        return None
+    if ttl <= 0 or budget_ms < 0:
+        return None
+    return {"ttl": ttl, "budget_ms": budget_ms}
+
+
+def make_cache_key(cli_name: str, words: List[str], cword: int, cwd: str) -> str:
+    """
+    completion 요청의 캐시 키
+
+    CLI, 현재 단어까지의 명령 단어, 현재 단어, 작업 디렉토리 (파일 이름
+    completion은 디렉토리마다 결과가 다름)로 만든다.
+    """
+    words = words[: cword + 1]
+    data = json.dumps([CACHE_VERSION, cli_name, cwd, cword, words], separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+class ResultCache:
+    """
+    여러 셸이 같이 쓰는 completion 결과 캐시 (stale-while-revalidate)
+
+    결과는 사용자 전용 tmpfs 디렉토리(데몬 소켓과 같은 runtime 디렉토리)에
+    CLI별로 파일 하나씩 저장되므로 데몬을 다시 띄워도 남아 있고, 로그아웃하면
+    사라진다. 읽을 때마다 파일 mtime을 갱신하고, CLI마다 max_entries개를 넘으면
+    mtime이 가장 오래된 결과부터 지운다 (LRU).
+
+    계산은 모두 worker 스레드 하나에서 순서대로 실행한다 (completion 함수가
+    셸의 작업 디렉토리로 chdir한 상태에서 돌아야 하므로). 응답 시간 한도를
+    넘기면 오래된 결과를 바로 돌려주고, 계산은 worker에서 끝까지 진행되어
+    다음 요청부터 새 결과가 쓰인다.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = MAX_ENTRIES_PER_CLI):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="supercli-cache")
+        self._lock = threading.Lock()
+        # 캐시 키 -> 계산 중인 Future (같은 요청이 겹치면 한 번만 계산)
+        self._pending: Dict[str, Future] = {}
+
+    def run(self, compute: Callable[[], List[str]]) -> List[str]:
+        """캐시 없이 worker 스레드에서 계산 (캐시를 쓰지 않는 CLI용)"""
+        return self._executor.submit(compute).result()
+
+    def lookup(
+        self,
+        cli_name: str,
+        key: str,
+        settings: Dict[str, float],
+        compute: Callable[[], List[str]],
+    ) -> Optional[List[str]]:
+        """
+        캐시된 결과 또는 새로 계산한 결과 반환
+
+        - TTL 이내의 결과가 있으면 계산하지 않고 바로 반환
+        - 없거나 오래되었으면 계산을 시작하고 budget_ms까지 기다림
+        - 그 안에 끝나지 않으면 오래된 결과를 반환 (계산은 뒤에서 계속되어 캐시에 저장)
+
+        Returns:
+            completion 목록 또는 None (한도 안에 계산이 끝나지 않았고 캐시도 없는 경우)
+
+        Raises:
+            Exception: 계산이 실패했고 캐시도 없는 경우
+        """
+        cached = self.get(cli_name, key)
+        if cached is not None and cached[0] < settings["ttl"]:
+            return cached[1]
+
+        future = self._refresh(cli_name, key, compute)
+        try:
+            return future.result(timeout=settings["budget_ms"] / 1000)
+        except FutureTimeoutError:
+            return cached[1] if cached is not None else None
+        except Exception:
+            if cached is not None:
+                return cached[1]
+            raise
+
+    def get(self, cli_name: str, key: str) -> Optional[Tuple[float, List[str]]]:
+        """
+        저장된 결과 읽기
+
+        Returns:
+            (저장된 뒤 지난 시간(초), completion 목록) 또는 None
+        """
+        path = self._entry_path(cli_name, key)
+        try:
+            data = json.loads(path.read_text())
+            result = time.time() - data["created"], list(data["results"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        try:
+            os.utime(path)  # 최근에 쓰인 결과는 정리할 때 남김
+        except OSError:
+            pass
+        return result
+
+    def put(self, cli_name: str, key: str, results: List[str]) -> None:
+        """결과 저장 (다른 셸이 반쯤 쓴 파일을 읽지 않도록 rename으로 교체)"""
+        path = self._entry_path(cli_name, key)
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            atomic_write_text(
+                path, json.dumps({"created": time.time(), "results": results}), mode=0o600
+            )
+            self._prune(path.parent)
+        except OSError:
+            pass  # 캐시는 최적화일 뿐이므로 저장 실패는 무시
+
+    def shutdown(self) -> None:
+        """worker 스레드 종료 (진행 중인 계산은 기다리지 않음)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _refresh(self, cli_name: str, key: str, compute: Callable[[], List[str]]) -> Future:
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._executor.submit(
+                    self._compute_and_store, cli_name, key, compute
+                )
+            return future
+
+    def _compute_and_store(
+        self, cli_name: str, key: str, compute: Callable[[], List[str]]
+    ) -> List[str]:
+        try:
+            results = list(compute())
+            self.put(cli_name, key, results)
+            return results
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _prune(self, cli_dir: Path) -> None:
+        """CLI 디렉토리의 결과가 max_entries개를 넘으면 mtime이 오래된 것부터 삭제"""
+        entries = []
+        with os.scandir(cli_dir) as it:
+            for entry in it:
+                if entry.name.startswith("."):  # 다른 프로세스가 쓰는 중인 임시 파일
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _entry_path(self, cli_name: str, key: str) -> Path:
+        return self.cache_dir / cli_name / key
@@ -0,0 +1,178 @@
+import fcntl
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+
+
+# ~/.completions 아래 supercli 상태 디렉토리 (`.`으로 시작하여 로더 glob에서 제외됨)
+STATE_DIR_NAME = ".supercli"
+LOCK_FILE_NAME = "lock"
+
+# 스레드별로 잡고 있는 잠금 (같은 스레드에서 다시 잠글 때 재진입 허용)
+_held = threading.local()
+
+
+def get_completion_dir() -> Path:
+    """completion 스크립트 디렉토리 경로 반환"""
+    return Path.home() / ".completions"
+
+
+def get_state_dir() -> Path:
+    """
+    supercli 내부 상태(캐시 등) 디렉토리 경로 반환
+
+    Note:
+        숨김 디렉토리이므로 .bashrc 로더의 ~/.completions/* 에 포함되지 않음
+    """
+    return get_completion_dir() / STATE_DIR_NAME
+
+
+def get_lock_path() -> Path:
+    """supercli 상태 잠금 파일 경로 반환"""
+    return get_state_dir() / LOCK_FILE_NAME
+
+
+@contextmanager
+def _flock(exclusive: bool, blocking: bool = True) -> Iterator[bool]:
+    held = getattr(_held, "mode", None)
+    if held is not None:
+        # 이미 잡고 있는 잠금 안에서의 재진입
+        if exclusive and held != fcntl.LOCK_EX:
+            if not blocking:
+                yield False
+                return
+            raise RuntimeError("Cannot upgrade a shared supercli lock to exclusive")
+        yield True
+        return
+
+    lock_path = get_lock_path()
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, mode if blocking else mode | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        _held.mode = mode
+        try:
+            yield True
+        finally:
+            _held.mode = None
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def shared_lock():
+    """
+    registry 등 상태 파일을 읽는 동안 잡는 공유 잠금
+
+    여러 프로세스가 동시에 잡을 수 있고, exclusive_lock과는 배타적이다.
+    """
+    return _flock(exclusive=False)
+
+
+def exclusive_lock():
+    """
+    상태 파일의 read-modify-write 동안 잡는 배타 잠금
+
+    같은 스레드에서 다시 잡으면 그대로 통과한다 (재진입). 공유 잠금을 잡은
+    채로 배타 잠금을 요청하면 교착을 피하기 위해 RuntimeError를 낸다.
+    """
+    return _flock(exclusive=True)
+
+
+def try_exclusive_lock():
+    """
+    기다리지 않는 exclusive_lock: 잠금을 잡았는지를 블록에 넘겨줌
+
+    다른 프로세스나 스레드가 잠금을 잡고 있거나, 같은 스레드가 공유 잠금을
+    잡고 있으면 False를 넘기고 잠그지 않는다. 실패해도 괜찮은 캐시 저장에 사용한다.
+
+        with try_exclusive_lock() as locked:
+            if locked:
+                ...
+    """
+    return _flock(exclusive=True, blocking=False)
+
+
+@contextmanager
+def atomic_writer(path: Path, mode: Optional[int] = None) -> Iterator[TextIO]:
+    """
+    atomic_write_text의 스트리밍 버전: 임시 파일 객체를 넘겨주고 블록이 정상 종료되면 rename
+
+    블록 안에서 예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둔다.
+
+    Args:
+        path: 쓸 파일
+        mode: 파일 권한 (None이면 기존 파일 권한 유지, 새 파일은 0o644)
+    """
+    path = Path(os.path.realpath(path))
+    if mode is None:
+        try:
+            mode = path.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o644
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            yield f
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, content: str, mode: Optional[int] = None) -> None:
+    """
+    같은 디렉토리의 임시 파일에 쓴 뒤 rename하여 파일을 원자적으로 교체
+
+    읽는 쪽(셸 포함)은 항상 이전 내용이나 새 내용 전체만 보게 된다.
+    임시 파일 이름은 `.`으로 시작하므로 `~/.completions/*` glob에 걸리지 않는다.
+    심볼릭 링크(dotfile 관리 도구의 .bashrc 등)는 링크를 유지한 채 대상 파일을 교체한다.
+
+    Args:
+        path: 쓸 파일
+        content: 파일 내용
+        mode: 파일 권한 (None이면 기존 파일 권한 유지, 새 파일은 0o644)
+    """
+    with atomic_writer(path, mode) as f:
+        f.write(content)
+
+
+def write_if_changed(path: Path, content: str, mode: Optional[int] = None) -> bool:
+    """
+    내용(과 권한)이 이미 같으면 쓰지 않는 atomic_write_text
+
+    mtime이 바뀌지 않으므로 mtime으로 무효화하는 캐시(index, bundle 등)도
+    다시 만들어지지 않는다. 권한만 다르면 os.chmod만 한다.
+
+    Returns:
+        파일을 실제로 바꿨는지 여부
+    """
+    data = content.encode("utf-8")
+    real_path = Path(os.path.realpath(path))
+    try:
+        stat = real_path.stat()
+        same = stat.st_size == len(data) and real_path.read_bytes() == data
+    except OSError:
+        same = False
+
+    if not same:
+        atomic_write_text(path, content, mode)
+        return True
+    if mode is not None and stat.st_mode & 0o7777 != mode:
+        os.chmod(real_path, mode)
+        return True
+    return False
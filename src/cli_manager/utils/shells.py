@@ -0,0 +1,155 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+from .completion_index import COMPILED_SUFFIX
+from .meta_parser import DEFAULT_SHELL
+from .path_index import which
+from .safe_io import get_completion_dir
+from .transaction import FileTransaction
+
+
+BASH = DEFAULT_SHELL
+ZSH = "zsh"
+FISH = "fish"
+SHELLS = (BASH, ZSH, FISH)
+
+# ~/.zshrc에 추가되는 로더: fpath에 넣어 두면 compinit이 `#compdef` 줄만 읽고
+# 함수 본문은 첫 Tab에 autoload한다 (.zwc가 더 새로우면 그것을 읽음)
+ZSHRC_LOADER = """
+# supercli zsh completions (autoloaded from ~/.completions/.zsh)
+fpath=(~/.completions/.zsh $fpath)
+if (( $+functions[compdef] )); then
+    # compinit already ran: register them now, still loaded on first use
+    for _supercli_completion in ~/.completions/.zsh/_*(N); do
+        [[ $_supercli_completion == *.zwc ]] && continue
+        autoload -Uz ${_supercli_completion:t}
+        compdef ${_supercli_completion:t} ${${_supercli_completion:t}#_}
+    done
+    unset _supercli_completion
+fi
+"""
+
+# fish conf.d 파일: fish는 fish_complete_path에서 <명령>.fish를 첫 Tab에 autoload
+FISH_LOADER = """# supercli fish completions (generated by supercli, do not edit)
+contains -- ~/.completions/.fish $fish_complete_path
+or set -p fish_complete_path ~/.completions/.fish
+"""
+
+
+def validate_shell(shell: str) -> str:
+    """
+    지원하는 셸인지 확인
+
+    Raises:
+        ValueError: 지원하지 않는 셸인 경우
+    """
+    if shell not in SHELLS:
+        raise ValueError(f"Unknown shell '{shell}' (choose from: {', '.join(SHELLS)})")
+    return shell
+
+
+def get_shell_completion_dir(shell: str) -> Path:
+    """
+    셸별 completion 디렉토리 반환
+
+    bash는 ~/.completions, 나머지는 그 아래 숨김 디렉토리 (.bashrc 로더의
+    ~/.completions/* glob에 걸리지 않음). 디렉토리마다 index가 따로 있다.
+    """
+    if shell == BASH:
+        return get_completion_dir()
+    return get_completion_dir() / f".{shell}"
+
+
+def get_shell_completion_file(shell: str, cli_name: str) -> Path:
+    """셸이 autoload하는 이름의 completion 파일 경로 (zsh: _cli, fish: cli.fish)"""
+    completion_dir = get_shell_completion_dir(shell)
+    if shell == ZSH:
+        return completion_dir / f"_{cli_name}"
+    if shell == FISH:
+        return completion_dir / f"{cli_name}.fish"
+    return completion_dir / cli_name
+
+
+def get_shell_rc_path(shell: str) -> Path:
+    """zsh/fish 로더를 넣을 파일 경로 반환"""
+    if shell == ZSH:
+        return Path(os.environ.get("ZDOTDIR") or Path.home()) / ".zshrc"
+    config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(config_home) / "fish" / "conf.d" / "supercli.fish"
+
+
+def installed_shells() -> List[str]:
+    """completion이 설치된 셸 목록 (bash는 항상 포함)"""
+    return [BASH] + [
+        shell for shell in (ZSH, FISH) if get_shell_completion_dir(shell).is_dir()
+    ]
+
+
+def add_shell_loader(shell: str, transaction: FileTransaction) -> Optional[str]:
+    """
+    필요시 zsh/fish 로더 추가 (bash는 install_completion.add_bashrc_loader)
+
+    Returns:
+        메시지 (추가했을 경우만)
+    """
+    rc_path = get_shell_rc_path(shell)
+    if shell == FISH:
+        rc_path.parent.mkdir(parents=True, exist_ok=True)
+        if not transaction.write(rc_path, FISH_LOADER):
+            return None
+        return f"Added completion loader to {rc_path}"
+
+    content = transaction.read_text(rc_path)
+    if ZSHRC_LOADER in content or "~/.completions/.zsh" in content:
+        return None  # 이미 있거나 사용자가 직접 작성한 로더
+    transaction.write(rc_path, content + ZSHRC_LOADER)
+    return f"Added completion loader to {rc_path}"
+
+
+def compile_zsh_completions(completion_dir: Optional[Path] = None) -> Optional[str]:
+    """
+    zsh completion 파일을 zcompile로 .zwc로 컴파일
+
+    .zwc가 없거나 원본보다 오래된 파일만 zsh 프로세스 하나로 컴파일하고,
+    원본이 사라진 .zwc는 지운다. zsh가 없으면 아무것도 하지 않는다 (zsh는
+    .zwc가 없거나 오래되면 원본을 읽는다).
+
+    Returns:
+        메시지 (컴파일했거나 실패한 경우만)
+    """
+    completion_dir = completion_dir or get_shell_completion_dir(ZSH)
+    if not completion_dir.is_dir():
+        return None
+
+    stale = []
+    for path in sorted(completion_dir.iterdir()):
+        if path.name.startswith(".") or not path.is_file():
+            continue
+        if path.name.endswith(COMPILED_SUFFIX):
+            source = path.with_name(path.name[: -len(COMPILED_SUFFIX)])
+            if not source.exists():
+                path.unlink()
+            continue
+        compiled = path.with_name(path.name + COMPILED_SUFFIX)
+        try:
+            if compiled.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        stale.append(str(path))
+
+    zsh = which(ZSH)
+    if not stale or zsh is None:
+        return None
+
+    try:
+        subprocess.run(
+            [zsh, "-fc", 'for f; do zcompile -Uz -- "$f" || exit 1; done', ZSH, *stale],
+            check=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        return f"Failed to compile zsh completions: {e}"
+    return f"Compiled {len(stale)} zsh completion(s) with zcompile"
@@ -0,0 +1,171 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+PROFILE_OPTION = "--profile-startup"
+# json: JSON 출력, 경로(/가 들어가거나 .json으로 끝남): JSON 파일로 저장,
+# 0/false/no/빈 값: 끔, 그 밖의 값(1, table 등): 표 출력
+PROFILE_ENV = "SUPERCLI_PROFILE_STARTUP"
+DISABLED_VALUES = ("", "0", "false", "no")
+PROFILE_TOP_ENV = "SUPERCLI_PROFILE_TOP"
+# 프로파일 대상 supercli 자식 프로세스가 구성/실행 시간을 기록할 파일
+PROFILE_REPORT_ENV = "SUPERCLI_PROFILE_REPORT"
+
+DEFAULT_TOP = 15
+
+IMPORTTIME_PREFIX = "import time:"
+
+
+def requested_profile_mode(argv: List[str]) -> Optional[str]:
+    """
+    startup 프로파일링 요청 여부와 출력 방식 확인
+
+    --profile-startup 옵션은 환경 변수가 꺼져 있어도 표 출력으로 켠다.
+
+    Returns:
+        "table", "json", JSON 파일 경로 또는 None (요청하지 않은 경우)
+    """
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if value.lower() in DISABLED_VALUES:
+        return "table" if PROFILE_OPTION in argv else None
+    if value.lower() == "json":
+        return "json"
+    if os.sep in value or "/" in value or value.lower().endswith(".json"):
+        return value
+    return "table"
+
+
+def parse_importtime(stderr: str) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    -X importtime 출력 분리
+
+    Returns:
+        ([{"module", "self_us", "cumulative_us", "depth"}], importtime 외의 stderr)
+    """
+    imports = []
+    other_lines = []
+    for line in stderr.splitlines(keepends=True):
+        if not line.startswith(IMPORTTIME_PREFIX):
+            other_lines.append(line)
+            continue
+        try:
+            self_us, cumulative_us, name = line[len(IMPORTTIME_PREFIX):].split("|", 2)
+            entry = {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(name.rstrip("\n")) - len(name.strip()) - 1) // 2,
+            }
+        except ValueError:
+            continue  # 머리글 줄
+        imports.append(entry)
+    return imports, "".join(other_lines)
+
+
+def profile_command(
+    command: List[str], env: Optional[Dict[str, str]] = None, capture_stdout: bool = True
+) -> Dict[str, Any]:
+    """
+    명령을 import time 측정과 함께 실행
+
+    PYTHONPROFILEIMPORTTIME으로 켜므로 Python으로 된 CLI면 무엇이든
+    import 내역이 잡힌다 (Python이 아니면 imports가 비어 있음).
+
+    Returns:
+        {"command", "returncode", "wall_ms", "import_total_ms", "imports",
+         "stdout", "stderr"}
+    """
+    env = dict(os.environ if env is None else env, PYTHONPROFILEIMPORTTIME="1")
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            command,
+            env=env,
+            stdout=subprocess.PIPE if capture_stdout else None,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+    except FileNotFoundError:
+        returncode, stdout, stderr = 127, "", f"{command[0]} not found in PATH\n"
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    imports, other_stderr = parse_importtime(stderr)
+    return {
+        "command": command,
+        "returncode": returncode,
+        "wall_ms": round(wall_ms, 3),
+        "import_total_ms": round(sum(entry["self_us"] for entry in imports) / 1000, 3),
+        "imports": imports,
+        "stdout": stdout,
+        "stderr": other_stderr,
+    }
+
+
+def profile_supercli(argv: List[str], mode: str) -> int:
+    """
+    supercli 명령을 자식 프로세스로 다시 실행하며 startup 프로파일 출력
+
+    자식은 application 구성 시간과 명령 실행 시간을 PROFILE_REPORT_ENV
+    파일에 기록한다. 명령 출력은 그대로 터미널로 나간다.
+    """
+    argv = [arg for arg in argv if arg != PROFILE_OPTION]
+    with tempfile.TemporaryDirectory(prefix="supercli-profile-") as temp_dir:
+        report_path = Path(temp_dir) / "timings"
+        env = {key: value for key, value in os.environ.items() if key != PROFILE_ENV}
+        env[PROFILE_REPORT_ENV] = str(report_path)
+
+        profile = profile_command(
+            [sys.executable, "-m", "cli_manager.core", *argv], env, capture_stdout=False
+        )
+        try:
+            construct_ms, dispatch_ms = map(float, report_path.read_text().split())
+        except (OSError, ValueError):
+            construct_ms = dispatch_ms = None
+
+    sys.stderr.write(profile.pop("stderr"))
+    profile.pop("stdout")
+    profile["command"] = ["supercli", *argv]
+    profile["construct_ms"] = construct_ms
+    profile["dispatch_ms"] = dispatch_ms
+
+    top = int(os.environ.get(PROFILE_TOP_ENV) or DEFAULT_TOP)
+    if mode == "table":
+        print(format_profile(profile, top), file=sys.stderr)
+    elif mode == "json":
+        print(json.dumps(profile, indent=2), file=sys.stderr)
+    else:
+        Path(mode).write_text(json.dumps(profile, indent=2) + "\n")
+        print(f"Wrote startup profile to {mode}", file=sys.stderr)
+
+    return profile["returncode"]
+
+
+def format_profile(profile: Dict[str, Any], top: int = DEFAULT_TOP) -> str:
+    """프로파일 결과를 누적 import 시간 상위 N개 표로 만들기"""
+    lines = [f"Startup profile: {' '.join(profile['command'])}"]
+    rows = [
+        ("wall time", profile.get("wall_ms")),
+        ("construct app", profile.get("construct_ms")),
+        ("dispatch command", profile.get("dispatch_ms")),
+        ("imports (self total)", profile.get("import_total_ms")),
+    ]
+    for label, value in rows:
+        if value is not None:
+            lines.append(f"  {label:<22}{value:>10.1f} ms")
+
+    imports = sorted(profile["imports"], key=lambda e: e["cumulative_us"], reverse=True)
+    if imports:
+        lines.append(f"  Top {min(top, len(imports))} of {len(imports)} imports by cumulative time:")
+        lines.append(f"  {'cumul ms':>10} {'self ms':>9}  module")
+        for entry in imports[:top]:
+            lines.append(
+                f"  {entry['cumulative_us'] / 1000:>10.2f} {entry['self_us'] / 1000:>9.2f}  {entry['module']}"
+            )
+    return "\n".join(lines)
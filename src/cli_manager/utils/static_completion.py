@@ -0,0 +1,221 @@
+import shlex
+from typing import Dict, List, Optional, Tuple
+
+from cleo.application import Application
+from cleo.commands.command import Command
+from cleo.commands.help_command import HelpCommand
+from cleo.commands.list_command import ListCommand
+
+from .completion_daemon import load_application
+from .install_completion import add_wrapper_completion, install_completion
+from .meta_parser import add_meta_to_completion
+from .transaction import FileTransaction
+
+
+# META의 "generator" 값 (completion-refresh도 같은 방식으로 다시 만든다)
+STATIC_GENERATOR = "static"
+
+
+def _option_words(options) -> Tuple[List[str], List[str]]:
+    """
+    cleo 옵션 목록을 (완성할 단어, 값을 받는 옵션 단어)로 변환
+
+    Tab으로 제시하는 단어는 --long 이름만이고, 값을 받는 옵션은 단축형(-t)도
+    포함해 명령 단어를 찾을 때 그 다음 단어를 건너뛰는 데 쓴다.
+    """
+    names, value_options = [], []
+    for option in options:
+        names.append(f"--{option.name}")
+        if option.accepts_value():
+            value_options.append(f"--{option.name}")
+            if option.shortcut:
+                value_options.extend(f"-{s}" for s in option.shortcut.split("|"))
+    return names, value_options
+
+
+def _case_pattern(words: List[str]) -> str:
+    return "|".join(shlex.quote(word) for word in words)
+
+
+def _has_complete(command: Command) -> bool:
+    """명령이 complete(words, word)로 동적 completion을 구현하는지"""
+    return callable(getattr(command, "complete", None))
+
+
+def generate_static_completion(
+    application: Application, cli_name: str, backend_name: str
+) -> str:
+    """
+    cleo Application의 명령/옵션 정의로 순수 bash completion 생성
+
+    명령 이름, 옵션 이름, help/list의 인자는 미리 계산한 단어 목록과 case
+    분기로 완성하므로 Tab에 프로세스를 띄우지 않는다. complete()를 구현한
+    명령의 인자만 `<backend> completion-query`로 Python에 묻는다.
+
+    Args:
+        application: 정의를 읽을 cleo Application
+        cli_name: CLI 이름 (함수 이름과 complete 등록에 사용)
+        backend_name: 동적 completion을 물을 supercli 실행 파일 이름
+
+    Returns:
+        completion script
+    """
+    function = f"_{cli_name}_complete"
+    match_function = f"_{cli_name}_static_match"
+    query_function = f"_{cli_name}_static_query"
+
+    global_options, global_value_options = _option_words(application.definition.options)
+    commands: Dict[str, Command] = {
+        name: command for name, command in sorted(application.all().items()) if not command.hidden
+    }
+    command_names = " ".join(commands)
+
+    skip_value = (
+        f"            {_case_pattern(global_value_options)}) (( i++ )) ;;\n"
+        if global_value_options
+        else ""
+    )
+
+    branches = []
+    for name, command in commands.items():
+        options, value_options = _option_words(command.definition.options)
+        option_words = " ".join(global_options + options)
+        lines = [f"        ({shlex.quote(name)})"]
+        if _has_complete(command):
+            # 옵션 이름만 여기서, 인자와 옵션 값은 명령의 complete()가 결정
+            lines += [
+                '            if [[ $cur == -* ]]; then',
+                f'                {match_function} "$cur" {shlex.quote(option_words)}',
+                "            else",
+                f"                {query_function}",
+                "            fi",
+            ]
+        else:
+            value_options = global_value_options + value_options
+            if value_options:
+                # 옵션 값은 bash 기본(파일 이름) completion에 맡김
+                lines.append(
+                    f'            case ${{words[cword-1]}} in {_case_pattern(value_options)}) return 0 ;; esac'
+                )
+            # help는 명령 이름, list는 namespace를 인자로 받음
+            values = ""
+            if isinstance(command, HelpCommand):
+                values = command_names
+            elif isinstance(command, ListCommand):
+                values = " ".join(application.get_namespaces())
+            if values:
+                lines += [
+                    '            if [[ $cur == -* ]]; then',
+                    f'                {match_function} "$cur" {shlex.quote(option_words)}',
+                    "            else",
+                    f'                {match_function} "$cur" {shlex.quote(values)}',
+                    "            fi",
+                ]
+            elif command.definition.arguments:
+                lines.append(
+                    f'            [[ $cur == -* ]] && {match_function} "$cur" {shlex.quote(option_words)}'
+                )
+            else:
+                # 인자가 없는 명령은 옵션만 받음
+                lines.append(f'            {match_function} "$cur" {shlex.quote(option_words)}')
+        lines.append("            ;;")
+        branches.append("\n".join(lines))
+
+    return f"""# {cli_name} static completion (generated by {backend_name} from its cleo commands, do not edit)
+{match_function}() {{
+    local word
+    for word in $2; do
+        [[ $word == "$1"* ]] && COMPREPLY+=("$word")
+    done
+}}
+
+{query_function}() {{
+    local IFS=$'\\n'
+    COMPREPLY=($({shlex.quote(backend_name)} completion-query -- {shlex.quote(cli_name)} "$cword" "${{words[@]:0:cword+1}}" 2>/dev/null))
+}}
+
+{function}() {{
+    local cur words cword com= i
+    COMPREPLY=()
+    if declare -F _get_comp_words_by_ref >/dev/null; then
+        _get_comp_words_by_ref -n : cur words cword
+    else
+        cur=${{COMP_WORDS[COMP_CWORD]}} words=("${{COMP_WORDS[@]}}") cword=$COMP_CWORD
+    fi
+
+    # 명령 단어 찾기 (옵션과 옵션 값은 건너뜀)
+    for (( i = 1; i < cword; i++ )); do
+        case ${{words[i]}} in
+{skip_value}            -*) ;;
+            *) com=${{words[i]}}; break ;;
+        esac
+    done
+
+    case $com in
+        ('')
+            if [[ $cur == -* ]]; then
+                {match_function} "$cur" {shlex.quote(" ".join(global_options))}
+            else
+                {match_function} "$cur" {shlex.quote(command_names)}
+            fi
+            ;;
+{chr(10).join(branches)}
+    esac
+
+    declare -F __ltrim_colon_completions >/dev/null && __ltrim_colon_completions "$cur"
+    return 0
+}}
+
+complete -o default -F {function} {shlex.quote(cli_name)}
+"""
+
+
+def build_static_completion(cli_name: str, backend_name: str) -> Tuple[Optional[str], str]:
+    """
+    CLI의 cleo Application을 import하여 정적 completion 생성
+
+    Returns:
+        (completion_script, message): CLI를 import할 수 없으면 script는 None
+    """
+    application = load_application(cli_name)
+    if application is None:
+        return None, (
+            f"Cannot generate a static completion for {cli_name}: "
+            "it is not a cleo console script installed in this Python environment"
+        )
+    return (
+        generate_static_completion(application, cli_name, backend_name),
+        f"Generated static completion for {cli_name}",
+    )
+
+
+def install_static_completion(
+    cli_name: str,
+    backend_name: str,
+    wrapper_name: Optional[str] = None,
+    fingerprint: Optional[dict] = None,
+    cache: Optional[dict] = None,
+    transaction: Optional[FileTransaction] = None,
+) -> Tuple[Optional[bool], List[str], bool]:
+    """
+    정적 completion 생성과 설치 (generate_and_install_completion과 같은 반환값)
+
+    Returns:
+        (success, messages, changed): 생성 자체가 실패하면 success는 None
+    """
+    completion_script, message = build_static_completion(cli_name, backend_name)
+    if completion_script is None:
+        return None, [message], False
+
+    if wrapper_name:
+        completion_script = add_wrapper_completion(completion_script, wrapper_name, cli_name)
+    completion_script = add_meta_to_completion(
+        backend_name,
+        cli_name,
+        wrapper_name or cli_name,
+        completion_script,
+        fingerprint=fingerprint,
+        cache=cache,
+        generator=STATIC_GENERATOR,
+    )
+    return install_completion(cli_name, completion_script, wrapper_name, transaction)
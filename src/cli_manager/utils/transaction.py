@@ -0,0 +1,435 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from .completion_index import (
+    apply_index_changes,
+    load_index,
+    make_index_entry,
+)
+from .meta_parser import (
+    extract_complete_function,
+    extract_completion_commands,
+    get_meta_shell,
+    parse_meta_from_completion,
+)
+from .safe_io import STATE_DIR_NAME, exclusive_lock, get_completion_dir
+
+
+class FileTransaction:
+    """
+    여러 파일 변경을 모아 두었다가 한 번에 적용하는 transaction
+
+    add/remove처럼 CLI 여러 개를 다루는 명령이 completion 파일, wrapper
+    script, superclisubs completion, .bashrc 로더, registry, index를 CLI마다
+    따로 쓰지 않고 여기에 stage한 뒤 commit 한 번으로 반영한다.
+
+    - 내용은 임시 파일에 미리 써 둔다. completion 디렉토리의 파일은 그 아래
+      .supercli/에 두어 stage하는 동안 디렉토리 mtime(index 검증에 쓰임)이
+      바뀌지 않게 하고, 그 밖의 파일은 대상과 같은 디렉토리에 둔다 (`.`으로 시작)
+    - commit은 exclusive_lock 안에서 임시 파일 fsync, rename, index 저장,
+      디렉토리 fsync를 한 번씩만 한다
+    - commit 도중 실패하면 이미 바꾼 파일을 원래대로 되돌리고, commit하지 않은
+      transaction은 rollback으로 임시 파일만 지우면 된다
+
+    with 블록으로 쓰면 정상 종료 시 commit, 예외 시 rollback한다.
+    stage하는 메서드들은 여러 스레드에서 동시에 불러도 된다.
+    """
+
+    def __init__(self, completion_dir: Optional[Path] = None):
+        self.completion_dir = completion_dir or get_completion_dir()
+        self._lock = threading.RLock()
+        # 대상 파일 (realpath) -> (임시 파일, 권한)
+        self._writes: Dict[Path, Tuple[str, int]] = {}
+        self._deletes: Set[Path] = set()
+        # 내용은 같고 권한만 바꿀 파일 -> 권한 (mtime 유지)
+        self._chmods: Dict[Path, int] = {}
+        # completion 디렉토리 -> 파일 이름 -> make_index_entry 인자 (mtime 제외)
+        self._index_updates: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+        self._index_removals: Dict[Path, Set[str]] = {}
+        self._once: Dict[str, Any] = {}
+        self._closed = False
+
+    def __enter__(self) -> "FileTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    @property
+    def changed(self) -> bool:
+        """stage된 변경이 있는지 여부"""
+        with self._lock:
+            return bool(
+                self._writes
+                or self._deletes
+                or self._chmods
+                or any(self._index_updates.values())
+                or any(self._index_removals.values())
+            )
+
+    # stage
+
+    @contextmanager
+    def writer(self, path: Path, mode: Optional[int] = None) -> Iterator[TextIO]:
+        """
+        atomic_writer처럼 파일 객체를 넘겨주되, 블록이 끝나면 rename 대신 stage
+
+        블록 안에서 예외가 나면 임시 파일을 지우고 아무것도 stage하지 않는다.
+
+        Args:
+            path: 쓸 파일
+            mode: 파일 권한 (None이면 기존 파일 권한 유지, 새 파일은 0o644)
+        """
+        target = Path(os.path.realpath(path))
+        mode = _resolve_mode(target, mode)
+
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{target.name}.", suffix=".tmp", dir=_staging_dir(target)
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                yield f
+        except BaseException:
+            _unlink_quietly(tmp_name)
+            raise
+        self._stage(target, tmp_name, mode)
+
+    def write(self, path: Path, content: str, mode: Optional[int] = None) -> bool:
+        """
+        파일 내용 stage (write_if_changed처럼 내용과 권한이 이미 같으면 stage하지 않음)
+
+        Returns:
+            변경이 stage되었는지 여부
+        """
+        target = Path(os.path.realpath(path))
+        same, current_mode = self._compare(target, content.encode("utf-8"))
+        if same:
+            with self._lock:
+                self._discard(target)
+                if mode is None or current_mode == mode:
+                    return False
+                self._chmods[target] = mode  # write_if_changed처럼 chmod만
+            return True
+
+        with self.writer(target, mode) as f:
+            f.write(content)
+        return True
+
+    def delete(self, path: Path) -> bool:
+        """
+        파일 삭제 stage
+
+        Returns:
+            삭제할 파일이 있었는지 여부
+        """
+        target = Path(os.path.realpath(path))
+        with self._lock:
+            staged = target in self._writes
+            self._discard(target)
+            if not target.exists():
+                return staged
+            self._deletes.add(target)
+        return True
+
+    def read_text(self, path: Path) -> str:
+        """stage된 내용까지 반영한 파일 내용 (없으면 빈 문자열)"""
+        target = Path(os.path.realpath(path))
+        with self._lock:
+            if target in self._deletes:
+                return ""
+            source = self._writes.get(target, (str(target), 0))[0]
+        try:
+            return Path(source).read_text()
+        except FileNotFoundError:
+            return ""
+
+    def set_index_entry(
+        self,
+        completion_file: Path,
+        meta: Optional[Dict[str, Any]],
+        size: int,
+        commands: List[str],
+        complete_function: Optional[str] = None,
+        sha256: Optional[str] = None,
+    ) -> None:
+        """completion_index.set_index_entry의 stage 버전 (mtime은 commit할 때 기록)"""
+        completion_dir = completion_file.parent
+        with self._lock:
+            self._index_updates.setdefault(completion_dir, {})[completion_file.name] = {
+                "meta": meta,
+                "size": size,
+                "commands": commands,
+                "complete_function": complete_function,
+                "sha256": sha256,
+            }
+
+    def update_index_entry(self, completion_file: Path, completion_script: str) -> None:
+        """completion_index.update_index_entry의 stage 버전"""
+        data = completion_script.encode("utf-8")
+        meta = parse_meta_from_completion(completion_script)
+        shell = get_meta_shell(meta)
+        self.set_index_entry(
+            completion_file,
+            meta,
+            len(data),
+            extract_completion_commands(completion_script, shell),
+            extract_complete_function(completion_script, shell),
+            hashlib.sha256(data).hexdigest(),
+        )
+
+    def remove_index_entry(self, completion_dir: Path, cli_name: str) -> None:
+        """completion_index.remove_index_entry의 stage 버전"""
+        with self._lock:
+            updates = self._index_updates.get(completion_dir, {})
+            for file_name in [n for n, u in updates.items() if _source_cli(n, u) == cli_name]:
+                del updates[file_name]
+            updates.pop(cli_name, None)
+            self._index_removals.setdefault(completion_dir, set()).add(cli_name)
+
+    def index_view(self, completion_dir: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+        """stage된 index 변경까지 반영한 index (load_index와 같은 형태, 저장하지 않음)"""
+        completion_dir = completion_dir or self.completion_dir
+        entries = dict(load_index(completion_dir))
+        with self._lock:
+            removals = set(self._index_removals.get(completion_dir, ()))
+            updates = dict(self._index_updates.get(completion_dir, {}))
+
+        for cli_name in removals:
+            for name in [n for n, e in entries.items() if n == cli_name or e["file"] == cli_name]:
+                del entries[name]
+        for file_name, update in updates.items():
+            entry = make_index_entry(file_name, mtime_ns=None, **update)
+            for name in [n for n, e in entries.items() if e["file"] == file_name]:
+                del entries[name]
+            entries[entry["source_cli"]] = entry
+        return entries
+
+    def run_once(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        transaction 안에서 key마다 func를 한 번만 실행 (예: .bashrc 로더 확인)
+
+        Returns:
+            처음 호출한 경우 func의 반환값, 이후에는 None
+        """
+        with self._lock:
+            if key in self._once:
+                return None
+            self._once[key] = True
+            return func()
+
+    # commit / rollback
+
+    def commit(self) -> None:
+        """
+        stage된 변경을 한 번에 적용
+
+        Raises:
+            Exception: 적용 중 실패한 경우 (이미 바꾼 파일은 원래대로 되돌린 뒤)
+        """
+        with self._lock:
+            self._check_open()
+            self._closed = True
+            if not self.changed:
+                return
+            journal: List[Tuple[Path, Optional[str]]] = []
+            modes: List[Tuple[Path, int]] = []
+            try:
+                with exclusive_lock():
+                    # 1. 내용을 먼저 디스크에 (rename 뒤 빈 파일이 보이지 않도록)
+                    for tmp_name, _ in self._writes.values():
+                        _fsync_path(tmp_name)
+
+                    # 2. rename (되돌릴 수 있도록 기존 파일은 hard link로 보관)
+                    for target, (tmp_name, mode) in self._writes.items():
+                        journal.append((target, _backup(target)))
+                        os.chmod(tmp_name, mode)
+                        os.replace(tmp_name, target)
+                    for target in self._deletes:
+                        if target.exists():
+                            backup = _backup_name(target)
+                            os.replace(target, backup)
+                            journal.append((target, backup))
+                    for target, mode in self._chmods.items():
+                        modes.append((target, target.stat().st_mode & 0o7777))
+                        os.chmod(target, mode)
+
+                    # 3. index (바뀐 파일의 mtime을 기록해야 하므로 rename 뒤)
+                    for completion_dir in set(self._index_updates) | set(self._index_removals):
+                        entries = [
+                            make_index_entry(
+                                file_name,
+                                mtime_ns=(completion_dir / file_name).stat().st_mtime_ns,
+                                **update,
+                            )
+                            for file_name, update in self._index_updates.get(
+                                completion_dir, {}
+                            ).items()
+                        ]
+                        removed = sorted(self._index_removals.get(completion_dir, ()))
+                        if entries or removed:
+                            apply_index_changes(completion_dir, entries, removed)
+
+                    # 4. rename 결과를 디스크에 (디렉토리마다 한 번)
+                    for directory in sorted({target.parent for target, _ in journal}):
+                        _fsync_path(directory)
+            except BaseException:
+                for target, backup in reversed(journal):
+                    _restore(target, backup)
+                for target, mode in modes:
+                    os.chmod(target, mode)
+                self._cleanup()
+                raise
+
+            for _, backup in journal:
+                if backup:
+                    _unlink_quietly(backup)
+            self._reset()
+
+    def rollback(self) -> None:
+        """commit하지 않고 stage된 변경(임시 파일)을 모두 버림"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._cleanup()
+
+    # 내부
+
+    def _stage(self, target: Path, tmp_name: str, mode: int) -> None:
+        with self._lock:
+            self._check_open()
+            self._discard(target)
+            self._writes[target] = (tmp_name, mode)
+
+    def _discard(self, target: Path) -> None:
+        previous = self._writes.pop(target, None)
+        if previous:
+            _unlink_quietly(previous[0])
+        self._deletes.discard(target)
+        self._chmods.pop(target, None)
+
+    def _compare(self, target: Path, data: bytes) -> Tuple[bool, Optional[int]]:
+        """target이 (stage된 내용이 아니라) 디스크에서 이미 data와 같은지와 현재 권한"""
+        try:
+            stat = target.stat()
+            same = stat.st_size == len(data) and target.read_bytes() == data
+        except OSError:
+            return False, None
+        return same, stat.st_mode & 0o7777
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Transaction has already been committed or rolled back")
+
+    def _cleanup(self) -> None:
+        for tmp_name, _ in self._writes.values():
+            _unlink_quietly(tmp_name)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._writes.clear()
+        self._deletes.clear()
+        self._chmods.clear()
+        self._index_updates.clear()
+        self._index_removals.clear()
+
+
+@contextmanager
+def transaction_scope(
+    transaction: Optional[FileTransaction] = None,
+) -> Iterator[FileTransaction]:
+    """
+    transaction이 주어지면 그대로 쓰고, 없으면 새로 만들어 블록 끝에서 commit
+
+    한 파일만 바꾸는 호출도 여러 CLI를 묶는 호출과 같은 코드로 쓰기 위해 사용한다.
+    """
+    if transaction is not None:
+        yield transaction
+        return
+    with FileTransaction() as owned:
+        yield owned
+
+
+def _source_cli(file_name: str, update: Dict[str, Any]) -> str:
+    return (update.get("meta") or {}).get("source_cli") or file_name
+
+
+def _resolve_mode(target: Path, mode: Optional[int]) -> int:
+    if mode is not None:
+        return mode
+    try:
+        return target.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o644
+
+
+def _staging_dir(target: Path) -> Path:
+    """
+    target의 임시/백업 파일을 둘 디렉토리
+
+    completion 디렉토리(index가 있는 .supercli/를 가진 디렉토리)는 그 아래에
+    두어 rename 전까지 디렉토리 mtime이 바뀌지 않게 한다. 같은 파일 시스템이므로
+    rename은 그대로 원자적이다.
+    """
+    state_dir = target.parent / STATE_DIR_NAME
+    return state_dir if state_dir.is_dir() else target.parent
+
+
+def _backup_name(target: Path) -> str:
+    fd, name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".bak", dir=_staging_dir(target)
+    )
+    os.close(fd)
+    return name
+
+
+def _backup(target: Path) -> Optional[str]:
+    """교체 전 target 보관 (없으면 None). 같은 파일을 가리키는 hard link라 복사하지 않음"""
+    if not target.exists():
+        return None
+    backup = _backup_name(target)
+    os.unlink(backup)  # 이름만 확보하고 그 자리에 link를 만듦
+    try:
+        os.link(target, backup)
+    except OSError:
+        shutil.copy2(target, backup)  # hard link를 지원하지 않는 파일 시스템
+    return backup
+
+
+def _restore(target: Path, backup: Optional[str]) -> None:
+    try:
+        if backup:
+            os.replace(backup, target)
+        else:
+            os.unlink(target)
+    except OSError:
+        pass
+
+
+def _fsync_path(path: Any) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # 디렉토리 fsync를 지원하지 않는 플랫폼
+    finally:
+        os.close(fd)
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
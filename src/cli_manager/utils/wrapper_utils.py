@@ -1,6 +1,21 @@
-import subprocess
+import shlex
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+
+from .completion_index import INDEX_DIR_NAME, load_index
+from .config import get_config_value, set_config_value
+from .transaction import FileTransaction, transaction_scope
+
+
+WRAPPER_MODE_SCRIPT = "script"
+WRAPPER_MODE_FUNCTION = "function"
+WRAPPER_MODES = (WRAPPER_MODE_SCRIPT, WRAPPER_MODE_FUNCTION)
+
+# shell function 모드에서 .bashrc에 추가되는 로더
+BASHRC_WRAPPER_FUNCTION_LOADER = f"""
+# superclisubs as a shell function (no extra bash process per call)
+[ -r ~/.completions/{INDEX_DIR_NAME}/superclisubs.bash ] && source ~/.completions/{INDEX_DIR_NAME}/superclisubs.bash
+"""
 
 
 def get_wrapper_script_path() -> Path:
@@ -8,53 +23,279 @@ def get_wrapper_script_path() -> Path:
     return Path.home() / ".local" / "bin" / "superclisubs"
 
 
+def get_wrapper_function_path() -> Path:
+    """shell function 모드에서 .bashrc가 source하는 wrapper 함수 파일 경로 반환"""
+    return Path.home() / ".completions" / INDEX_DIR_NAME / "superclisubs.bash"
+
+
+def get_wrapper_completion_path() -> Path:
+    """superclisubs completion 파일 경로 반환 (다른 completion과 같이 로더가 읽음)"""
+    return Path.home() / ".completions" / "superclisubs"
+
+
+def get_wrapper_mode(transaction: Optional[FileTransaction] = None) -> str:
+    """설정된 wrapper 설치 모드 반환 (기본값 script, transaction에 stage된 설정 포함)"""
+    mode = get_config_value("wrapper_mode", transaction=transaction)
+    return mode if mode in WRAPPER_MODES else WRAPPER_MODE_SCRIPT
+
+
+def validate_wrapper_mode(mode: str) -> str:
+    """
+    wrapper 설치 모드 확인
+
+    Raises:
+        ValueError: 지원하지 않는 모드인 경우
+    """
+    if mode not in WRAPPER_MODES:
+        raise ValueError(
+            f"Unknown wrapper mode '{mode}' (choose from: {', '.join(WRAPPER_MODES)})"
+        )
+    return mode
+
+
+def set_wrapper_mode(mode: str, transaction: Optional[FileTransaction] = None) -> None:
+    """
+    wrapper 설치 모드 저장 (transaction이 주어지면 stage만 함)
+
+    Raises:
+        ValueError: 지원하지 않는 모드인 경우
+    """
+    set_config_value("wrapper_mode", validate_wrapper_mode(mode), transaction)
+
+
 def generate_wrapper_script(registered_clis: List[str]) -> str:
-    """wrapper script 내용 생성"""
+    """
+    wrapper script 내용 생성
+
+    등록 여부를 확인한 뒤 대상 CLI를 exec하므로 wrapper bash 프로세스가
+    남지 않는다. (script는 호출마다 목록 전체를 다시 parse하므로 case 분기나
+    연관 배열이 CLI 수가 많으면 [[ =~ ]]보다 느리다. 확인은 기존 정규식 비교를
+    유지한다. benchmarks/wrapper_dispatch.py의 case, assoc 참고)
+    """
     return f"""#!/bin/bash
 # superclisubs wrapper script
 
 registered_clis="{' '.join(registered_clis)}"
 
-if [[ " $registered_clis " =~ " $1 " ]]; then
-    "$@"
-else
-    echo "Unknown command: $1"
-    echo "Available commands: $registered_clis"
-    exit 1
+if [[ -n $1 && " $registered_clis " =~ " $1 " ]]; then
+    exec "$@"
 fi
+
+echo "Unknown command: $1"
+echo "Available commands: $registered_clis"
+exit 1
+"""
+
+
+def generate_wrapper_function(registered_clis: List[str]) -> str:
+    """
+    shell function 모드용 wrapper 함수 생성
+
+    대화형 셸 안에서 대상 CLI를 바로 실행하므로 /bin/bash fork+exec가 없다.
+    등록 목록은 source할 때 한 번 연관 배열로 만들어 두므로 호출마다의
+    확인 비용이 등록된 CLI 수와 무관하다.
+    """
+    entries = " ".join(f"[{shlex.quote(cli)}]=1" for cli in registered_clis)
+
+    return f"""# superclisubs shell function (generated by supercli, do not edit)
+declare -gA _superclisubs_registered=({entries})
+
+superclisubs() {{
+    if [[ -n $1 && -n ${{_superclisubs_registered[$1]}} ]]; then
+        "$@"
+        return
+    fi
+    echo "Unknown command: $1"
+    echo "Available commands: {' '.join(registered_clis)}"
+    return 1
+}}
 """
 
 
-def update_wrapper_script(registered_clis: List[str]) -> tuple[bool, str]:
+def collect_wrapper_routes(
+    registered_clis: List[str],
+    completion_dir: Optional[Path] = None,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Tuple[str, str, Path]]:
+    """
+    superclisubs completion이 넘겨줄 backend 목록 수집
+
+    설치할 때 index에 기록된 `complete -F` 함수를 쓰므로 completion 파일은
+    읽지 않는다. index가 주어지면 (예: transaction.index_view()) 그것을 쓴다.
+
+    Returns:
+        (CLI 이름, backend completion 함수, completion 파일) 리스트 (등록 순서)
+    """
+    completion_dir = completion_dir or Path.home() / ".completions"
+    if index is None:
+        index = load_index(completion_dir)
+    routes = []
+    for cli in registered_clis:
+        entry = index.get(cli)
+        if entry and entry.get("managed") and entry.get("complete_function"):
+            routes.append((cli, entry["complete_function"], completion_dir / entry["file"]))
+    return routes
+
+
+def generate_wrapper_completion(
+    registered_clis: List[str], routes: List[Tuple[str, str, Path]]
+) -> str:
+    """
+    superclisubs completion 생성
+
+    첫 단어는 등록된 CLI 이름으로 완성하고, 그 뒤는 CLI별 backend 함수에
+    첫 단어(superclisubs)를 뗀 COMP_* 변수로 넘긴다. backend 함수가 아직 없으면
+    그 CLI의 completion 파일을 처음 쓸 때 source한다. Tab마다 fork가 없다.
+
+    Args:
+        registered_clis: 등록된 CLI 목록 (첫 단어 후보)
+        routes: collect_wrapper_routes()의 결과
+    """
+    clis = " ".join(shlex.quote(cli) for cli in registered_clis)
+    functions = " ".join(f"[{shlex.quote(cli)}]={shlex.quote(func)}" for cli, func, _ in routes)
+    files = " ".join(
+        f"[{shlex.quote(cli)}]={shlex.quote(str(path))}" for cli, _, path in routes
+    )
+
+    return f"""# superclisubs completion (generated by supercli from the registry, do not edit)
+_superclisubs_complete_clis=({clis})
+declare -gA _superclisubs_complete_functions=({functions})
+declare -gA _superclisubs_complete_files=({files})
+
+_superclisubs_complete() {{
+    local cur=${{COMP_WORDS[COMP_CWORD]}} cli=${{COMP_WORDS[1]}} name
+    COMPREPLY=()
+    if (( COMP_CWORD == 1 )); then
+        for name in "${{_superclisubs_complete_clis[@]}}"; do
+            [[ $name == "$cur"* ]] && COMPREPLY+=("$name")
+        done
+        return 0
+    fi
+
+    local func=${{_superclisubs_complete_functions[$cli]}}
+    [[ -n $func ]] || return 0
+    if ! declare -F "$func" >/dev/null; then
+        local file=${{_superclisubs_complete_files[$cli]}}
+        [[ -r $file ]] && source "$file"
+        declare -F "$func" >/dev/null || return 0
+    fi
+
+    # backend에는 `cli args...`만 보이도록 앞의 superclisubs와 공백을 떼어냄
+    # (CLI 이름이 superclisubs의 일부여도 첫 단어 뒤에서부터 자름)
+    local rest=${{COMP_LINE#*"${{COMP_WORDS[0]}}"}}
+    rest=${{rest#"${{rest%%[![:space:]]*}}"}}
+    local prefix_length=$(( ${{#COMP_LINE}} - ${{#rest}} ))
+    local COMP_LINE=$rest
+    local COMP_POINT=$(( COMP_POINT - prefix_length ))
+    local -a COMP_WORDS=("${{COMP_WORDS[@]:1}}")
+    local COMP_CWORD=$(( COMP_CWORD - 1 ))
+    "$func" "$cli" "${{COMP_WORDS[COMP_CWORD]}}" "${{COMP_WORDS[COMP_CWORD-1]}}"
+}}
+
+complete -F _superclisubs_complete superclisubs
+"""
+
+
+def write_wrapper_completion(
+    registered_clis: List[str], transaction: Optional[FileTransaction] = None
+) -> Tuple[Path, bool]:
+    """
+    registry와 index로 superclisubs completion 파일을 다시 만들고 index에 반영
+
+    transaction이 주어지면 그 안에 stage된 completion까지 반영해서 만들고
+    파일과 index도 stage만 한다.
+
+    Returns:
+        (completion 파일 경로, 내용이 바뀌었는지 여부)
+    """
+    completion_path = get_wrapper_completion_path()
+    completion_dir = completion_path.parent
+    completion_dir.mkdir(parents=True, exist_ok=True)
+
+    with transaction_scope(transaction) as txn:
+        content = generate_wrapper_completion(
+            registered_clis,
+            collect_wrapper_routes(registered_clis, completion_dir, txn.index_view(completion_dir)),
+        )
+        changed = txn.write(completion_path, content)
+        if changed:
+            txn.update_index_entry(completion_path, content)
+    return completion_path, changed
+
+
+def add_bashrc_wrapper_function(
+    transaction: Optional[FileTransaction] = None,
+) -> Optional[str]:
+    """
+    필요시 .bashrc에 wrapper 함수 로더 추가
+
+    Returns:
+        메시지 (추가했을 경우만)
+    """
+    bashrc = Path.home() / ".bashrc"
+    with transaction_scope(transaction) as txn:
+        content = txn.read_text(bashrc)
+        if BASHRC_WRAPPER_FUNCTION_LOADER in content:
+            return None
+        txn.write(bashrc, content + BASHRC_WRAPPER_FUNCTION_LOADER)
+    return "Added superclisubs shell function loader to ~/.bashrc"
+
+
+def update_wrapper_script(
+    registered_clis: List[str], transaction: Optional[FileTransaction] = None
+) -> tuple[bool, str, bool]:
     """
     wrapper script 업데이트
 
+    shell function 모드면 wrapper 함수 파일도 갱신한다. 스크립트는 셸 함수를
+    쓸 수 없는 비대화형 호출을 위해 항상 유지한다. superclisubs completion도
+    같은 목록으로 다시 만든다. 내용이 같은 파일은 다시 쓰지 않는다.
+    transaction이 주어지면 모든 파일을 stage만 하고 commit은 호출하는 쪽이 한다.
+
     Returns:
-        (success, message): 성공 여부와 메시지
+        (success, message, changed): 성공 여부, 메시지, 파일을 하나라도 바꿨는지 여부
     """
     try:
         script_path = get_wrapper_script_path()
         script_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 스크립트 생성
-        script_content = generate_wrapper_script(registered_clis)
-        script_path.write_text(script_content)
+        details = []
+        function_path = get_wrapper_function_path()
+        with transaction_scope(transaction) as txn:
+            # 스크립트 생성 (실행 권한을 준 임시 파일을 rename하여 교체)
+            script_content = generate_wrapper_script(registered_clis)
+            changed = txn.write(script_path, script_content, mode=0o755)
+
+            if get_wrapper_mode(txn) == WRAPPER_MODE_FUNCTION:
+                function_path.parent.mkdir(parents=True, exist_ok=True)
+                changed |= txn.write(function_path, generate_wrapper_function(registered_clis))
+                details.append(f" and shell function at {function_path}")
+                bashrc_message = add_bashrc_wrapper_function(txn)
+                if bashrc_message:
+                    changed = True
+                    details.append(f" ({bashrc_message})")
+            else:
+                changed |= txn.delete(function_path)
 
-        # 실행 권한 설정
-        subprocess.run(["chmod", "+x", str(script_path)], check=True)
+            _, completion_changed = write_wrapper_completion(registered_clis, txn)
+            changed |= completion_changed
 
-        return True, f"Updated wrapper script at {script_path}"
+        if not changed:
+            return True, f"Wrapper script at {script_path} is up to date", False
+        return True, f"Updated wrapper script at {script_path}" + "".join(details), True
 
     except Exception as e:
-        return False, f"Failed to update wrapper script: {e}"
+        return False, f"Failed to update wrapper script: {e}", False
 
 
 def get_registered_clis() -> List[str]:
     """
-    현재 등록된 CLI 목록 읽기
+    wrapper script의 registered_clis 줄에서 등록된 CLI 목록 읽기
 
     Note:
         wrapper script가 없으면 빈 목록 반환
+        명령들은 registry.load_registry()를 사용하며, 이 함수는 registry
+        파일이 없던 시절의 wrapper에서 목록을 옮겨올 때만 쓰인다
     """
     try:
         script_path = get_wrapper_script_path()
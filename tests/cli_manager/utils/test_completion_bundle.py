@@ -0,0 +1,86 @@
+from cli_manager.utils.completion_bundle import (
+    build_bundle,
+    get_bundle_path,
+    minify_completion_script,
+    split_top_level_blocks,
+    write_bundle,
+)
+
+
+HELPER = """_shared_helper()
+{
+    echo helper
+}"""
+
+
+def test_minify_completion_script():
+    """Test removing comments, blank lines and META lines"""
+    content = """# META: {"source_cli":"cli"}
+# a comment
+
+_cli_complete() {
+    # inner comment
+    COMPREPLY=()
+}
+complete -F _cli_complete cli
+"""
+    assert minify_completion_script(content) == (
+        "_cli_complete() {\n    COMPREPLY=()\n}\ncomplete -F _cli_complete cli"
+    )
+
+
+def test_minify_keeps_heredoc_scripts():
+    """Test that scripts with heredocs only lose their META line"""
+    content = '# META: {}\ncat <<EOF\n# not a comment\nEOF'
+
+    assert minify_completion_script(content) == "cat <<EOF\n# not a comment\nEOF"
+
+
+def test_split_top_level_blocks():
+    """Test splitting function definitions from other lines"""
+    content = HELPER + "\ncomplete -F _f cli"
+
+    blocks = split_top_level_blocks(content)
+
+    assert blocks == [("_shared_helper", HELPER), (None, "complete -F _f cli")]
+
+
+def test_build_bundle_drops_duplicate_helpers(tmp_path):
+    """Test that identical helper definitions are emitted once"""
+    first = tmp_path / "cli1"
+    second = tmp_path / "cli2"
+    first.write_text(f"# META: {{}}\n{HELPER}\ncomplete -F _shared_helper cli1\n")
+    second.write_text(f"# META: {{}}\n{HELPER}\ncomplete -F _shared_helper cli2\n")
+
+    bundle = build_bundle([first, second])
+
+    assert bundle.count("_shared_helper()") == 1
+    assert "complete -F _shared_helper cli1" in bundle
+    assert "complete -F _shared_helper cli2" in bundle
+    assert "# META" not in bundle
+
+
+def test_build_bundle_keeps_redefinitions(tmp_path):
+    """Test that a different definition with the same name is kept"""
+    first = tmp_path / "cli1"
+    second = tmp_path / "cli2"
+    first.write_text(HELPER)
+    second.write_text(HELPER.replace("echo helper", "echo other"))
+
+    bundle = build_bundle([first, second])
+
+    assert bundle.count("_shared_helper()") == 2
+
+
+def test_write_bundle(mock_completion_dir):
+    """Test writing the bundle for every file in the completion directory"""
+    (mock_completion_dir / "cli1").write_text("complete -F _a cli1\n")
+    (mock_completion_dir / "cli2").write_text("# META: {}\ncomplete -F _b cli2\n")
+
+    bundle_path, file_count = write_bundle()
+
+    assert bundle_path == get_bundle_path()
+    assert file_count == 2
+    content = bundle_path.read_text()
+    assert content.index("cli1") < content.index("cli2")
+    assert not list(bundle_path.parent.glob("*.tmp"))
@@ -0,0 +1,182 @@
+import subprocess
+import sys
+import threading
+
+import pytest
+from cleo.application import Application
+
+from cli_manager.subcli.sub1 import ExampleCommand
+from cli_manager.utils.completion_daemon import (
+    complete_words,
+    create_server,
+    ensure_runtime_dir,
+    generate_daemon_client,
+    get_cache_dir,
+    get_socket_path,
+    load_application,
+    request_completion,
+)
+
+
+class FakeEntryPoint:
+    def __init__(self, func):
+        self.func = func
+
+    def load(self):
+        return self.func
+
+
+def _sub1_main():
+    app = Application()
+    app.add(ExampleCommand())
+    app.run()
+
+
+@pytest.fixture
+def app():
+    application = Application()
+    application.add(ExampleCommand())
+    return application
+
+
+@pytest.fixture
+def console_scripts(monkeypatch):
+    scripts = {"subcli1": FakeEntryPoint(_sub1_main)}
+    monkeypatch.setattr(
+        "cli_manager.utils.completion_daemon.get_console_scripts", lambda: scripts
+    )
+    return scripts
+
+
+def test_complete_words_commands_and_options(app):
+    """Test completing command names and command options"""
+    assert complete_words(app, ["subcli1", "ex"], 1) == ["example-command"]
+    assert complete_words(app, ["subcli1", "example-command", "--ty"], 2) == ["--type"]
+
+
+def test_complete_words_dynamic(app):
+    """Test calling a command's own complete() for dynamic values"""
+    words = ["subcli1", "example-command", "--type", ""]
+
+    assert complete_words(app, words, 3) == ["read", "write", "append"]
+
+
+def test_load_application_captures_run(console_scripts):
+    """Test getting the Application from a console script without running it"""
+    application = load_application("subcli1")
+
+    assert application is not None
+    assert application.has("example-command")
+    assert load_application("unknown") is None
+
+
+def test_load_application_restores_run_and_argv(console_scripts):
+    """Test that a failing entry point leaves Application.run and sys.argv untouched"""
+    run, argv = Application.run, sys.argv
+
+    def broken_main():
+        assert sys.argv == ["broken"]
+        raise SystemExit(2)
+
+    console_scripts["broken"] = FakeEntryPoint(broken_main)
+
+    assert load_application("broken") is None
+    assert load_application("subcli1") is not None
+    assert Application.run is run and sys.argv is argv
+
+
+def test_server_round_trip(temp_home, tmp_path, monkeypatch, console_scripts):
+    """Test answering a request over the Unix socket"""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    server = create_server(["subcli1"])
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        completions = request_completion(
+            "subcli1", ["subcli1", "example-command", "--type", "w"], 3
+        )
+        unsupported = request_completion("other", ["other", ""], 1)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert server.served_clis == ["subcli1"]
+    assert get_socket_path().parent == tmp_path / "supercli"
+    assert completions == ["read", "write", "append"]
+    assert unsupported is None
+
+
+def test_server_caches_results(temp_home, tmp_path, monkeypatch, console_scripts):
+    """Test that CLIs with a META cache setting have their answers cached"""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    completion_dir = temp_home / ".completions"
+    completion_dir.mkdir()
+    (completion_dir / "subcli1").write_text(
+        '# META: {"backend":"supercli","source_cli":"subcli1","wrapper_cli":"subcli1",'
+        '"cache":{"ttl":60,"budget_ms":1000}}\n'
+    )
+
+    server = create_server(["subcli1"])
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        words = ["subcli1", "example-command", "--type", ""]
+        completions = request_completion("subcli1", words, 3)
+        assert server.get_cache_settings("subcli1") == {"ttl": 60.0, "budget_ms": 1000.0}
+        assert [p.parent.name for p in get_cache_dir().glob("*/*")] == ["subcli1"]
+        assert request_completion("subcli1", words, 3) == completions
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert completions == ["read", "write", "append"]
+
+
+def test_request_completion_without_daemon(temp_home, tmp_path, monkeypatch):
+    """Test that clients get None when no daemon is running"""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    assert request_completion("subcli1", ["subcli1", ""], 1) is None
+
+
+def test_daemon_client_falls_back(tmp_path, monkeypatch):
+    """Test that the bash client sources and calls the regular completion without a daemon"""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    completion_file = tmp_path / "mycli"
+    completion_file.write_text(
+        '_mycli_complete() { COMPREPLY=(regular); }\ncomplete -F _mycli_complete mycli\n'
+    )
+    client = tmp_path / "daemon.bash"
+    client.write_text(generate_daemon_client([("mycli", "_mycli_complete", completion_file)]))
+
+    result = subprocess.run(
+        ["bash", "-c", f"source {client}; _supercli_daemon_complete mycli; echo ${{COMPREPLY[*]}}; complete -p mycli"],
+        capture_output=True, text=True
+    )
+
+    assert result.stdout.splitlines() == [
+        "regular",
+        "complete -o default -F _supercli_daemon_complete mycli",
+    ]
+    # Without socat the client never starts an interpreter per Tab
+    assert "python" not in client.read_text()
+
+
+def test_runtime_dir_must_be_private(tmp_path, monkeypatch):
+    """Test that a socket directory other users can reach is refused"""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    runtime_dir = ensure_runtime_dir()
+    assert runtime_dir.stat().st_mode & 0o777 == 0o700
+
+    runtime_dir.chmod(0o777)
+    with pytest.raises(RuntimeError, match="accessible by other users"):
+        create_server(["subcli1"])
+
+    runtime_dir.rmdir()
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    runtime_dir.symlink_to(target)
+    with pytest.raises(RuntimeError, match="not a directory"):
+        ensure_runtime_dir()
@@ -0,0 +1,75 @@
+import time
+import pytest
+from unittest.mock import patch
+
+from cli_manager.utils.completion_engine import (
+    default_jobs,
+    parse_jobs,
+    map_ordered,
+    generate_completions,
+)
+
+
+def test_parse_jobs_default():
+    """Test that missing --jobs falls back to the default worker count"""
+    assert parse_jobs(None) == default_jobs()
+    assert parse_jobs("4") == 4
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "abc"])
+def test_parse_jobs_invalid(value):
+    """Test that invalid --jobs values are rejected"""
+    with pytest.raises(ValueError):
+        parse_jobs(value)
+
+
+def test_map_ordered_keeps_input_order():
+    """Test that results come back in input order even if later items finish first"""
+    def slow_for_first(n):
+        time.sleep(0.05 if n == 0 else 0)
+        return n * 10
+
+    results = map_ordered(slow_for_first, [0, 1, 2, 3], jobs=4)
+
+    assert [item for item, _, _ in results] == [0, 1, 2, 3]
+    assert [result for _, result, _ in results] == [0, 10, 20, 30]
+
+
+def test_map_ordered_captures_errors():
+    """Test that one failing item does not discard the others"""
+    def fail_on_two(n):
+        if n == 2:
+            raise RuntimeError("boom")
+        return n
+
+    results = map_ordered(fail_on_two, [1, 2, 3], jobs=2)
+
+    assert results[0] == (1, 1, None)
+    assert results[1][1] is None
+    assert isinstance(results[1][2], RuntimeError)
+    assert results[2] == (3, 3, None)
+
+
+def test_map_ordered_empty():
+    """Test mapping over no items"""
+    assert map_ordered(lambda x: x, [], jobs=4) == []
+
+
+def test_generate_completions():
+    """Test parallel generation returns one entry per CLI in order"""
+    def fake_generate(cli_name):
+        if cli_name == "missing":
+            return None, f"{cli_name} not found in PATH"
+        return f"script for {cli_name}", f"Generated completion for {cli_name}"
+
+    with patch(
+        "cli_manager.utils.completion_engine.generate_completion",
+        side_effect=fake_generate,
+    ):
+        results = generate_completions(["cli1", "missing", "cli2"], jobs=3)
+
+    assert results == [
+        ("cli1", "script for cli1", "Generated completion for cli1"),
+        ("missing", None, "missing not found in PATH"),
+        ("cli2", "script for cli2", "Generated completion for cli2"),
+    ]
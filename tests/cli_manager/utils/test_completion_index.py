@@ -0,0 +1,131 @@
+import json
+import os
+import pytest
+
+from cli_manager.utils.completion_index import (
+    get_index_path,
+    load_index,
+    lookup_completion_file,
+    rebuild_index,
+    remove_index_entry,
+    update_index_entry,
+)
+from cli_manager.utils.safe_io import shared_lock
+
+
+MANAGED = '# META: {"backend":"supercli","source_cli":"%s","wrapper_cli":"superclisubs"}\ncomplete'
+
+
+@pytest.fixture
+def completion_dir(tmp_path):
+    """Setup completion directory with one managed and one unmanaged file"""
+    completion_dir = tmp_path / ".completions"
+    completion_dir.mkdir()
+    (completion_dir / "managed-cli").write_text(MANAGED % "managed-cli")
+    (completion_dir / "unmanaged-cli").write_text("# Some completion")
+    return completion_dir
+
+
+def test_load_index_builds_from_meta(completion_dir):
+    """Test that a missing index is rebuilt from META headers"""
+    index = load_index(completion_dir)
+
+    assert get_index_path(completion_dir).exists()
+    assert index["managed-cli"]["managed"] is True
+    assert index["managed-cli"]["backend"] == "supercli"
+    assert index["managed-cli"]["wrapper"] == "superclisubs"
+    assert index["unmanaged-cli"]["managed"] is False
+
+
+def test_load_index_does_not_rescan(completion_dir, monkeypatch):
+    """Test that a valid index is read without opening completion files"""
+    load_index(completion_dir)
+
+    def fail_rebuild(_):
+        raise AssertionError("index should not be rebuilt")
+
+    monkeypatch.setattr(
+        "cli_manager.utils.completion_index._rebuild_locked", fail_rebuild
+    )
+
+    assert "managed-cli" in load_index(completion_dir)
+
+
+def test_load_index_rebuilds_when_corrupt(completion_dir):
+    """Test that a corrupt index is rebuilt"""
+    load_index(completion_dir)
+    get_index_path(completion_dir).write_text("{not json")
+
+    assert "managed-cli" in load_index(completion_dir)
+
+
+def test_load_index_rebuilds_after_external_change(completion_dir):
+    """Test that files added behind supercli's back are picked up"""
+    load_index(completion_dir)
+    (completion_dir / "other-cli").write_text(MANAGED % "other-cli")
+    # make sure the directory mtime differs even on coarse timestamps
+    stat = completion_dir.stat()
+    os.utime(completion_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert "other-cli" in load_index(completion_dir)
+
+
+def test_update_and_remove_entry(completion_dir):
+    """Test transactional updates from install and remove"""
+    load_index(completion_dir)
+    completion_file = completion_dir / "new-cli"
+    script = MANAGED % "new-cli"
+    completion_file.write_text(script)
+
+    update_index_entry(completion_dir, completion_file, script)
+
+    assert lookup_completion_file(completion_dir, "new-cli") == completion_file
+    data = json.loads(get_index_path(completion_dir).read_text())
+    assert data["entries"]["new-cli"]["size"] == len(script)
+
+    completion_file.unlink()
+    remove_index_entry(completion_dir, "new-cli")
+
+    assert lookup_completion_file(completion_dir, "new-cli") is None
+
+
+def test_lookup_ignores_unmanaged(completion_dir):
+    """Test that unmanaged files are not returned as managed completions"""
+    assert lookup_completion_file(completion_dir, "unmanaged-cli") is None
+
+
+def test_rebuild_index_missing_dir(tmp_path):
+    """Test rebuilding the index of a missing directory"""
+    assert rebuild_index(tmp_path / "missing") == {}
+
+
+def test_rebuild_reads_only_changed_bodies(completion_dir, monkeypatch):
+    """Test that a rescan reuses command lists of files that did not change"""
+    load_index(completion_dir)
+    (completion_dir / "other-cli").write_text(MANAGED % "other-cli" + " -F _f other-cli")
+
+    scanned = []
+
+    def tracking_extract(content, shell="bash"):
+        scanned.append(content)
+        return ["other-cli"]
+
+    monkeypatch.setattr(
+        "cli_manager.utils.completion_index.extract_completion_commands", tracking_extract
+    )
+    index = rebuild_index(completion_dir)
+
+    assert len(scanned) == 1
+    assert index["other-cli"]["commands"] == ["other-cli"]
+    assert index["managed-cli"]["managed"] is True
+
+
+def test_rebuild_does_not_write_without_exclusive_lock(completion_dir, temp_home):
+    """Test that a rebuild under a shared lock returns entries without saving them"""
+    with shared_lock():
+        index = load_index(completion_dir)
+
+    assert index["managed-cli"]["managed"] is True
+    assert not get_index_path(completion_dir).exists()
+    load_index(completion_dir)
+    assert get_index_path(completion_dir).exists()
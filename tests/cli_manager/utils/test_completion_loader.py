@@ -0,0 +1,96 @@
+import pytest
+from pathlib import Path
+
+from cli_manager.utils.completion_bundle import get_bundle_path
+from cli_manager.utils.completion_loader import (
+    LOADER_BUNDLE,
+    LOADER_EAGER,
+    LOADER_LAZY,
+    collect_lazy_stubs,
+    generate_lazy_loader,
+    get_lazy_loader_path,
+    get_loader_mode,
+    set_loader_mode,
+    sync_completion_loader,
+)
+
+
+@pytest.fixture
+def managed_cli(mock_completion_dir, tmp_path, monkeypatch):
+    """Create a managed completion file whose CLI is on PATH"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    cli_path = bin_dir / "mycli"
+    cli_path.write_text("#!/bin/bash\n")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    (mock_completion_dir / "mycli").write_text(
+        '# META: {"backend":"supercli","source_cli":"mycli","wrapper_cli":"mycli"}\n'
+        "_mycli_complete() { :; }\n"
+        "complete -o default -F _mycli_complete mycli\n"
+    )
+    (mock_completion_dir / "gonecli").write_text(
+        '# META: {"backend":"supercli","source_cli":"gonecli","wrapper_cli":"gonecli"}\n'
+        "complete -F _gonecli_complete gonecli\n"
+    )
+    return mock_completion_dir
+
+
+def test_loader_mode_default(temp_home):
+    """Test that the eager loader is used when nothing is configured"""
+    assert get_loader_mode() == LOADER_EAGER
+
+
+def test_set_loader_mode(temp_home):
+    """Test persisting the loader mode"""
+    set_loader_mode(LOADER_LAZY)
+
+    assert get_loader_mode() == LOADER_LAZY
+
+
+def test_set_loader_mode_invalid(temp_home):
+    """Test rejecting unknown loader modes"""
+    with pytest.raises(ValueError):
+        set_loader_mode("sometimes")
+
+
+def test_collect_lazy_stubs_skips_missing_commands(managed_cli):
+    """Test that only commands found in PATH get a stub"""
+    stubs = collect_lazy_stubs()
+
+    assert stubs == [("mycli", managed_cli / "mycli")]
+
+
+def test_generate_lazy_loader():
+    """Test lazy loader script content"""
+    script = generate_lazy_loader([("mycli", Path("/home/u/.completions/mycli"))])
+
+    assert "[mycli]=/home/u/.completions/mycli" in script
+    assert "return 124" in script
+    assert 'complete -F _supercli_lazy_load "${!_supercli_lazy_files[@]}"' in script
+
+
+def test_sync_completion_loader(managed_cli):
+    """Test that stubs are written in lazy mode and removed in eager mode"""
+    assert sync_completion_loader(LOADER_EAGER) is None
+    assert not get_lazy_loader_path().exists()
+
+    message = sync_completion_loader(LOADER_LAZY)
+
+    assert "1 command(s)" in message
+    assert "[mycli]=" in get_lazy_loader_path().read_text()
+
+    sync_completion_loader(LOADER_EAGER)
+    assert not get_lazy_loader_path().exists()
+
+
+def test_sync_completion_loader_bundle(managed_cli):
+    """Test that bundle mode rebuilds the bundle and drops lazy stubs"""
+    sync_completion_loader(LOADER_LAZY)
+
+    message = sync_completion_loader(LOADER_BUNDLE)
+
+    assert "Rebuilt completion bundle from 2 file(s)" in message
+    assert get_bundle_path().exists()
+    assert not get_lazy_loader_path().exists()
@@ -14,8 +14,11 @@ class TestCompletionUtils:
     @pytest.fixture
     def mock_completion_dir(self, tmp_path: Path) -> Path:
         """Create a temporary completion directory for testing"""
-        with patch('cli_manager.utils.completion_utils.get_completion_dir') as mock_dir:
-            mock_dir.return_value = tmp_path
+        def shell_dir(shell: str) -> Path:
+            return tmp_path if shell == "bash" else tmp_path / f".{shell}"
+
+        with patch('cli_manager.utils.shells.get_shell_completion_dir', side_effect=shell_dir), \
+                patch('cli_manager.utils.completion_utils.get_shell_completion_dir', side_effect=shell_dir):
             yield tmp_path
 
     @patch('cli_manager.utils.completion_utils.generate_completion')
@@ -28,7 +31,7 @@ class TestCompletionUtils:
         """Test successful CLI completion update"""
         # Arrange
         mock_generate.return_value = ("test_script", "Generated script")
-        mock_install.return_value = (True, ["Installation successful"])
+        mock_install.return_value = (True, ["Installation successful"], True)
         
         # Act
         success, messages = update_cli_completion("test_cli")
@@ -69,7 +72,7 @@ class TestCompletionUtils:
         registered_clis = ["cli1", "cli2"]
         mock_add_wrapper.return_value = "wrapper_script"
         mock_add_meta.return_value = "meta_script"
-        mock_install.return_value = (True, ["Wrapper installation successful"])
+        mock_install.return_value = (True, ["Wrapper installation successful"], True)
         
         # Act
         success, messages = update_wrapper_completion(registered_clis)
@@ -138,8 +141,9 @@ class TestCompletionUtils:
         completion_file = mock_completion_dir / cli_name
         completion_file.touch()
         
-        with patch('pathlib.Path.unlink') as mock_unlink:
-            mock_unlink.side_effect = Exception("Test error")
+        # The removal is applied by the transaction commit (a rename)
+        with patch('cli_manager.utils.transaction.os.replace') as mock_replace:
+            mock_replace.side_effect = Exception("Test error")
             
             # Act
             success, message = remove_cli_completion(cli_name)
@@ -147,4 +151,31 @@ class TestCompletionUtils:
             # Assert
             assert success is False
             assert message.startswith(f"Failed to remove completion for {cli_name}")
-            assert "Test error" in message 
\ No newline at end of file
+            assert "Test error" in message
+        assert completion_file.exists()
+
+    def test_remove_cli_completion_every_shell(
+        self,
+        mock_completion_dir: Path
+    ) -> None:
+        """Test that zsh/fish completions and compiled .zwc files are removed too"""
+        cli_name = "test_cli"
+        (mock_completion_dir / cli_name).touch()
+        zsh_dir = mock_completion_dir / ".zsh"
+        fish_dir = mock_completion_dir / ".fish"
+        zsh_dir.mkdir()
+        fish_dir.mkdir()
+        (zsh_dir / f"_{cli_name}").write_text(f"#compdef {cli_name}\n")
+        (zsh_dir / f"_{cli_name}.zwc").write_bytes(b"compiled")
+        (fish_dir / f"{cli_name}.fish").write_text(f"complete -c {cli_name}\n")
+        (fish_dir / "other.fish").write_text("complete -c other\n")
+
+        success, message = remove_cli_completion(cli_name)
+
+        assert success is True
+        assert message == f"Removed completion for {cli_name}"
+        assert not (mock_completion_dir / cli_name).exists()
+        assert sorted(p.name for p in zsh_dir.iterdir() if not p.name.startswith(".")) == []
+        assert sorted(p.name for p in fish_dir.iterdir() if not p.name.startswith(".")) == [
+            "other.fish"
+        ] 
\ No newline at end of file
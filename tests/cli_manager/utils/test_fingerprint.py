@@ -0,0 +1,163 @@
+import pytest
+
+from cli_manager.utils.fingerprint import (
+    CONTENT_HASH_MAX_SIZE,
+    compute_fingerprint,
+    fingerprints_match,
+)
+
+
+@pytest.fixture
+def mock_cli(tmp_path, monkeypatch):
+    """Create a mock CLI executable on PATH"""
+    cli_path = tmp_path / "mock_cli"
+    cli_path.write_text("#!/bin/bash\necho 'some completion'")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    return cli_path
+
+
+def test_compute_fingerprint(mock_cli):
+    """Test fingerprint of a small executable includes stat info and content hash"""
+    fingerprint = compute_fingerprint("mock_cli")
+
+    assert fingerprint["path"] == str(mock_cli.resolve())
+    assert fingerprint["size"] == mock_cli.stat().st_size
+    assert fingerprint["mtime_ns"] == mock_cli.stat().st_mtime_ns
+    assert len(fingerprint["sha256"]) == 64
+
+
+def test_compute_fingerprint_large_file_has_no_hash(mock_cli):
+    """Test that large executables are fingerprinted by stat only"""
+    mock_cli.write_bytes(b"#" * (CONTENT_HASH_MAX_SIZE + 1))
+
+    fingerprint = compute_fingerprint("mock_cli")
+
+    assert "sha256" not in fingerprint
+
+
+def test_compute_fingerprint_not_found(monkeypatch, tmp_path):
+    """Test fingerprint of a CLI missing from PATH"""
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert compute_fingerprint("nonexistent_cli") is None
+
+
+def test_fingerprints_match():
+    """Test fingerprint comparison rules"""
+    base = {"path": "/bin/cli", "size": 10, "mtime_ns": 1, "sha256": "aa"}
+
+    assert fingerprints_match(base, dict(base))
+    # touched but identical content
+    assert fingerprints_match(base, {**base, "mtime_ns": 2})
+    assert not fingerprints_match(base, {**base, "sha256": "bb"})
+    assert not fingerprints_match(base, {**base, "path": "/usr/bin/cli"})
+    assert not fingerprints_match(None, base)
+    assert not fingerprints_match(base, None)
+
+
+def test_fingerprints_match_without_hash():
+    """Test stat-based comparison when no content hash is available"""
+    base = {"path": "/bin/cli", "size": 10, "mtime_ns": 1}
+
+    assert fingerprints_match(base, dict(base))
+    assert not fingerprints_match(base, {**base, "mtime_ns": 2})
+    assert not fingerprints_match(base, {**base, "size": 11})
+
+
+class FakeHash:
+    def __init__(self, value):
+        self.mode = "sha256"
+        self.value = value
+
+
+class FakeFile:
+    def __init__(self, path, hash_value=None):
+        self.path = path
+        self.name = path.rsplit("/", 1)[-1]
+        self.hash = FakeHash(hash_value) if hash_value else None
+
+    def __str__(self):
+        return self.path
+
+
+class FakeDist:
+    def __init__(self, bin_dir, version, module_hash):
+        self.metadata = {"Name": "fake-dist"}
+        self.version = version
+        self.files = [
+            FakeFile("../mock_cli", "shimhash"),
+            FakeFile("fake_pkg/cli.py", module_hash),
+        ]
+        self._root = bin_dir / "site-packages"
+
+    def locate_file(self, path):
+        return self._root / str(path)
+
+
+class FakeEntryPoint:
+    module = "fake_pkg.cli"
+
+    def __init__(self, dist):
+        self.dist = dist
+
+
+@pytest.fixture
+def console_script(mock_cli, monkeypatch):
+    """Register mock_cli as a console script of a fake distribution"""
+    scripts = {}
+    monkeypatch.setattr(
+        "cli_manager.utils.fingerprint.get_console_scripts", lambda: scripts
+    )
+
+    def install(version, module_hash):
+        bin_dir = mock_cli.parent
+        scripts["mock_cli"] = FakeEntryPoint(FakeDist(bin_dir, version, module_hash))
+
+    return install
+
+
+def test_compute_fingerprint_console_script(console_script):
+    """Test that owned console scripts are keyed on distribution, not stat"""
+    console_script("1.0.0", "aaa")
+
+    fingerprint = compute_fingerprint("mock_cli")
+
+    assert fingerprint["dist"] == "fake-dist"
+    assert fingerprint["version"] == "1.0.0"
+    assert fingerprint["module_hash"] == "sha256=aaa"
+    assert "size" not in fingerprint
+
+
+def test_console_script_upgrade_detected_with_identical_shim(console_script, mock_cli):
+    """Test that an upgrade is detected even though the shim is byte-identical"""
+    console_script("1.0.0", "aaa")
+    before = compute_fingerprint("mock_cli")
+
+    console_script("1.1.0", "bbb")
+    after = compute_fingerprint("mock_cli")
+
+    assert mock_cli.exists()
+    assert not fingerprints_match(before, after)
+
+
+def test_console_script_reinstall_is_unchanged(console_script, mock_cli):
+    """Test that reinstalling the same version does not count as a change"""
+    console_script("1.0.0", "aaa")
+    before = compute_fingerprint("mock_cli")
+
+    mock_cli.write_text("#!/bin/bash\necho 'rewritten shim'")
+    after = compute_fingerprint("mock_cli")
+
+    assert fingerprints_match(before, after)
+
+
+def test_console_script_without_module_hash_keeps_stat(console_script):
+    """Test that editable installs (no RECORD hash) also compare stat info"""
+    console_script("1.0.0", None)
+
+    fingerprint = compute_fingerprint("mock_cli")
+
+    assert fingerprint["dist"] == "fake-dist"
+    assert fingerprint["module_hash"] is None
+    assert "size" in fingerprint
@@ -0,0 +1,134 @@
+import subprocess
+import sys
+
+import pytest
+
+from cli_manager.utils.forkserver import (
+    ForkServerError,
+    ForkServerPool,
+    python_interpreter,
+    run_completions_forked,
+)
+from cli_manager.utils.install_completion import stream_completion
+
+
+def _script(path, body, shebang=f"#!{sys.executable}"):
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(f"{shebang}\n{body}\n")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def pool():
+    pool = ForkServerPool()
+    yield pool
+    pool.close()
+
+
+def test_python_interpreter(temp_home, monkeypatch):
+    """Test that only Python shebangs are recognized"""
+    bin_dir = temp_home / "bin"
+    python = _script(bin_dir / "python3", "", shebang="#!/bin/sh")
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    assert python_interpreter(str(_script(bin_dir / "a", "", shebang=f"#!{python}"))) == str(python)
+    assert python_interpreter(str(_script(bin_dir / "b", "", shebang="#!/usr/bin/env -S python3"))) == str(python)
+    assert python_interpreter(str(_script(bin_dir / "c", "", shebang="#!/bin/sh"))) is None
+    assert python_interpreter(str(bin_dir / "missing")) is None
+
+
+def test_pool_runs_scripts_in_forked_children(temp_home, pool):
+    """Test argv patching, exit codes and that children do not leak state into the template"""
+    script = _script(
+        temp_home / "bin" / "tool",
+        "import sys\n"
+        "print(sys.argv, hasattr(sys, 'marker'))\n"
+        "sys.marker = True\n"
+        "sys.exit(int(sys.argv[2]))",
+    )
+
+    code, output = pool.run(sys.executable, str(script), ["completions", "0"])
+    assert code == 0
+    assert output == f"[{str(script)!r}, 'completions', '0'] False\n".encode()
+
+    code, output = pool.run(sys.executable, str(script), ["completions", "3"])
+    assert code == 3
+    assert output.endswith(b"False\n")
+
+    # The same template served both requests
+    assert len(pool._idle[sys.executable]) == 1
+
+
+def test_pool_replaces_a_dead_template(temp_home, pool):
+    """Test that a template that died is discarded"""
+    script = _script(temp_home / "bin" / "tool", "print('ok')")
+    pool.run(sys.executable, str(script), [])
+    pool._idle[sys.executable][0].process.kill()
+    pool._idle[sys.executable][0].process.wait()
+
+    with pytest.raises(ForkServerError):
+        pool.run(sys.executable, str(script), [])
+    assert pool.run(sys.executable, str(script), []) == (0, b"ok\n")
+
+
+def test_stream_completion_uses_fork_server(temp_home, monkeypatch):
+    """Test that Python CLIs that are not imported are generated without a fresh interpreter"""
+    _script(
+        temp_home / "bin" / "tcli",
+        "import sys\n"
+        "assert sys.argv[1:] == ['completions', 'bash']\n"
+        "print('_tcli_1a2b_complete() { :; }')\n"
+        "print('complete -F _tcli_1a2b_complete tcli')",
+    )
+    monkeypatch.setenv("PATH", str(temp_home / "bin"))
+    spawned = []
+    popen = subprocess.Popen
+
+    def recording_popen(args, *rest, **kwargs):
+        spawned.append(args[0])
+        return popen(args, *rest, **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", recording_popen)
+
+    stats, message = stream_completion(
+        "tcli", temp_home / "tcli", "# META: {}\n", in_process=False
+    )
+
+    # Only a template interpreter was started, never the CLI itself
+    assert "tcli" not in spawned
+    assert stats["complete_function"] == "_tcli_complete"
+    assert (temp_home / "tcli").read_text() == (
+        "# META: {}\n_tcli_complete() { :; }\ncomplete -F _tcli_complete tcli\n"
+    )
+
+
+def test_run_completions_forked_skips_non_python(temp_home, monkeypatch):
+    """Test that shell scripts and binaries are left to a regular subprocess"""
+    _script(temp_home / "bin" / "tcli", "echo hi", shebang="#!/bin/sh")
+    monkeypatch.setenv("PATH", str(temp_home / "bin"))
+
+    assert run_completions_forked("tcli") is None
+
+
+def test_forked_run_streams_lines(temp_home, pool):
+    """Test that output arrives as lines while the child is still running"""
+    script = _script(
+        temp_home / "bin" / "tool",
+        "import sys\n"
+        "print('x' * 200000)\n"
+        "sys.stdout.flush()\n"
+        "print('é' * 3, end='')\n"
+        "sys.exit(4)",
+    )
+
+    with pool.start(sys.executable, str(script), []) as run:
+        first = next(run.stdout)
+        assert run.returncode is None
+        rest = list(run.stdout)
+
+    assert first == "x" * 200000 + "\n"
+    assert rest == ["ééé"]
+    assert run.returncode == 4
+    # The template went back to the pool once the output was read
+    assert len(pool._idle[sys.executable]) == 1
@@ -1,5 +1,6 @@
 import pytest
 from cli_manager.utils.hash_cleaner import (
+    clean_lines,
     extract_completion_function,
     clean_function_name,
     clean_content
@@ -89,3 +90,14 @@ _cli_complete() {
     # Test with empty content
     cleaned = clean_content("", "cli")
     assert cleaned == ""
+
+
+def test_clean_lines_matches_clean_content():
+    content = """# header
+_cli_dd335f68b4aa246c_complete() {
+    echo "test"
+}
+complete -F _cli_dd335f68b4aa246c_complete cli
+"""
+    streamed = "".join(clean_lines(content.splitlines(keepends=True), "cli"))
+    assert streamed == clean_content(content, "cli")
@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+import pytest
+from cleo.application import Application
+
+from cli_manager.subcli import sub1
+from cli_manager.subcli.sub1 import ExampleCommand
+from cli_manager.utils.install_completion import generate_completion, stream_completion
+from cli_manager.utils.inprocess_completion import render_completion
+
+
+def _application():
+    application = Application()
+    application.add(ExampleCommand())
+    return application
+
+
+@pytest.fixture
+def console_script(temp_home, monkeypatch):
+    """subcli1 on PATH as a real Python script, treated as a console script of this environment"""
+    bin_dir = temp_home / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "subcli1"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "from cli_manager.subcli.sub1 import main\n"
+        "main()\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setenv("PYTHONPATH", str(Path(sub1.__file__).parents[2]))
+
+    loads = []
+
+    def load_application(cli_name):
+        loads.append(cli_name)
+        return _application()
+
+    monkeypatch.setattr(
+        "cli_manager.utils.inprocess_completion.owns_console_script", lambda name, path: True
+    )
+    monkeypatch.setattr(
+        "cli_manager.utils.inprocess_completion.load_application", load_application
+    )
+    return loads
+
+
+@pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+def test_render_matches_subprocess_output(console_script, shell):
+    """Test that rendering in-process gives the cleaned output of `subcli1 completions`"""
+    rendered, _ = generate_completion("subcli1", shell)
+    spawned, _ = generate_completion("subcli1", shell, in_process=False)
+
+    assert console_script == ["subcli1"]
+    assert rendered == spawned
+    assert "subcli1" in rendered
+
+
+@pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+def test_streamed_files_match(console_script, temp_home, shell):
+    """Test that in-process and subprocess generation install identical files"""
+    stream_completion("subcli1", temp_home / "rendered", "# META: {}\n", shell=shell)
+    stream_completion(
+        "subcli1", temp_home / "spawned", "# META: {}\n", shell=shell, in_process=False
+    )
+
+    assert console_script == ["subcli1"]
+    assert (temp_home / "rendered").read_text() == (temp_home / "spawned").read_text()
+
+
+def test_stream_completion_renders_in_process(console_script, temp_home, monkeypatch):
+    """Test that stream_completion does not spawn the CLI when it can render it"""
+    monkeypatch.setattr(
+        "cli_manager.utils.install_completion.subprocess.Popen",
+        lambda *args, **kwargs: pytest.fail("spawned the CLI"),
+    )
+
+    stats, message = stream_completion("subcli1", temp_home / "subcli1", "# META: {}\n")
+
+    assert stats["commands"][0] == "subcli1"
+    assert stats["complete_function"] == "_subcli1_complete"
+    assert (temp_home / "subcli1").read_text().startswith("# META: {}\n_subcli1_complete()")
+
+
+def test_isolated_generation_spawns_the_cli(console_script, temp_home):
+    """Test that in_process=False keeps generating in a separate process"""
+    stats, message = stream_completion(
+        "subcli1", temp_home / "subcli1", "# META: {}\n", in_process=False
+    )
+
+    assert stats["complete_function"] == "_subcli1_complete"
+    assert console_script == []
+
+
+def test_render_requires_console_script_of_this_environment(temp_home, monkeypatch):
+    """Test that a CLI installed elsewhere is not imported"""
+    bin_dir = temp_home / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "subcli1").write_text("#!/bin/sh\n")
+    (bin_dir / "subcli1").chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setattr(
+        "cli_manager.utils.inprocess_completion.load_application",
+        lambda name: pytest.fail("imported a CLI from another environment"),
+    )
+
+    rendered, message = render_completion("subcli1")
+
+    assert rendered is None
+    assert "not a console script of this Python environment" in message
@@ -1,13 +1,17 @@
+import hashlib
 import subprocess
 import pytest
 from pathlib import Path
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch
 from cli_manager.utils.install_completion import (
     generate_completion,
     add_wrapper_completion,
     install_completion,
-    add_bashrc_loader
+    add_bashrc_loader,
+    stream_completion,
+    generate_and_install_completion,
 )
+from cli_manager.utils.completion_index import load_index
 
 
 def test_generate_completion_success():
@@ -75,7 +79,7 @@ def mock_path(tmp_path):
 def test_install_completion_success(mock_path):
     """Test successful completion installation"""
     with patch('pathlib.Path.home', return_value=mock_path):
-        success, messages = install_completion(
+        success, messages, _ = install_completion(
             "test-cli",
             "test completion script"
         )
@@ -88,7 +92,7 @@ def test_install_completion_success(mock_path):
 def test_install_completion_with_wrapper(mock_path):
     """Test completion installation with wrapper"""
     with patch('pathlib.Path.home', return_value=mock_path):
-        success, messages = install_completion(
+        success, messages, _ = install_completion(
             "test-cli",
             "test completion script",
             wrapper_name="wrapper-cli"
@@ -101,7 +105,7 @@ def test_install_completion_with_wrapper(mock_path):
 def test_install_completion_failure():
     """Test completion installation failure"""
     with patch('pathlib.Path.home', side_effect=Exception("Test error")):
-        success, messages = install_completion(
+        success, messages, _ = install_completion(
             "test-cli",
             "test completion script"
         )
@@ -116,7 +120,7 @@ def test_install_completion_existing_dir(mock_path):
     # Directory already exists from fixture
     
     with patch('pathlib.Path.home', return_value=mock_path):
-        success, messages = install_completion(
+        success, messages, _ = install_completion(
             "test-cli",
             "test completion script"
         )
@@ -137,16 +141,31 @@ def test_add_bashrc_loader_already_exists():
                 assert result is None
 
 
-def test_add_bashrc_loader_success():
+def test_add_bashrc_loader_success(temp_home):
     """Test successful loader addition to .bashrc"""
-    with patch('pathlib.Path.home') as mock_home:
-        mock_home.return_value = Path('/mock/home')
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.read_text', return_value=""):
-                with patch('builtins.open', mock_open()) as mock_file:
-                    result = add_bashrc_loader()
-                    assert "Added completion loader" in result
-                    mock_file.assert_called_once()
+    bashrc = temp_home / ".bashrc"
+    bashrc.write_text("# user settings\n")
+    bashrc.chmod(0o600)
+
+    result = add_bashrc_loader()
+
+    assert "Added completion loader" in result
+    assert bashrc.read_text().startswith("# user settings\n")
+    assert "for completion in ~/.completions/*" in bashrc.read_text()
+    assert bashrc.stat().st_mode & 0o777 == 0o600
+
+
+def test_add_bashrc_loader_keeps_symlink(temp_home):
+    """Test that a symlinked .bashrc (dotfile managers) stays a symlink"""
+    target = temp_home / "dotfiles" / "bashrc"
+    target.parent.mkdir()
+    target.write_text("")
+    (temp_home / ".bashrc").symlink_to(target)
+
+    add_bashrc_loader()
+
+    assert (temp_home / ".bashrc").is_symlink()
+    assert "~/.completions" in target.read_text()
 
 
 def test_add_bashrc_loader_failure():
@@ -157,4 +176,155 @@ def test_add_bashrc_loader_failure():
             with patch('pathlib.Path.read_text', return_value=""):
                 with patch('builtins.open', side_effect=Exception("Test error")):
                     result = add_bashrc_loader()
-                    assert "Failed to add loader to .bashrc" in result 
\ No newline at end of file
+                    assert "Failed to add loader to .bashrc" in result 
+
+def test_add_bashrc_loader_switches_mode(temp_home):
+    """Test switching the .bashrc loader between eager and lazy modes"""
+    bashrc = temp_home / ".bashrc"
+    bashrc.write_text("# user settings\n")
+
+    assert "Added completion loader" in add_bashrc_loader("eager")
+    assert add_bashrc_loader("eager") is None
+
+    result = add_bashrc_loader("lazy")
+
+    content = bashrc.read_text()
+    assert "lazy mode" in result
+    assert "# user settings" in content
+    assert "lazy.bash" in content
+    assert "for completion in ~/.completions/*" not in content
+
+
+def _fake_cli(bin_dir, name, body, monkeypatch):
+    bin_dir.mkdir(exist_ok=True)
+    cli_path = bin_dir / name
+    cli_path.write_text(f"#!/bin/sh\n{body}\n")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+
+def test_stream_completion_writes_file(temp_home, monkeypatch):
+    """Test streaming generation renames the function and prepends the header"""
+    _fake_cli(
+        temp_home / "bin",
+        "tcli",
+        "echo '_tcli_1a2b_complete() { :; }'\n"
+        "echo 'complete -F _tcli_1a2b_complete tcli tc'",
+        monkeypatch,
+    )
+    completion_file = temp_home / "tcli"
+
+    stats, message = stream_completion("tcli", completion_file, "# META: {}\n", "# end\n")
+
+    assert "Generated completion" in message
+    content = completion_file.read_text()
+    assert content == (
+        "# META: {}\n"
+        "_tcli_complete() { :; }\n"
+        "complete -F _tcli_complete tcli tc\n"
+        "# end\n"
+    )
+    assert stats == {
+        "size": len(content.encode()),
+        "commands": ["tcli", "tc"],
+        "complete_function": "_tcli_complete",
+        "sha256": hashlib.sha256(content.encode()).hexdigest(),
+        "changed": True,
+    }
+    assert [p.name for p in temp_home.iterdir() if p.name.startswith(".tcli")] == []
+
+
+def test_stream_completion_failure_keeps_existing(temp_home, monkeypatch):
+    """Test a failing CLI leaves the installed file untouched"""
+    _fake_cli(temp_home / "bin", "test-cli", "echo partial; exit 3", monkeypatch)
+    completion_file = temp_home / "test-cli"
+    completion_file.write_text("old")
+
+    stats, message = stream_completion("test-cli", completion_file, "# META: {}\n")
+
+    assert stats is None
+    assert "non-zero exit status 3" in message
+    assert completion_file.read_text() == "old"
+    assert sorted(p.name for p in temp_home.iterdir()) == ["bin", "test-cli"]
+
+
+def test_stream_completion_zsh_keeps_compdef_first(temp_home, monkeypatch):
+    """Test that the META header goes after the #compdef line compinit reads"""
+    _fake_cli(
+        temp_home / "bin",
+        "tcli",
+        '[ "$2" = zsh ] || exit 1\n'
+        "echo '#compdef tcli'\n"
+        "echo '_tcli_1a2b_complete() { :; }'\n"
+        "echo 'compdef _tcli_1a2b_complete /usr/bin/tcli'",
+        monkeypatch,
+    )
+    completion_file = temp_home / "_tcli"
+
+    stats, message = stream_completion(
+        "tcli", completion_file, "# META: {}\n", shell="zsh"
+    )
+
+    assert "Generated completion" in message
+    assert completion_file.read_text() == (
+        "#compdef tcli\n"
+        "# META: {}\n"
+        "_tcli_complete() { :; }\n"
+        "compdef _tcli_complete /usr/bin/tcli\n"
+    )
+    assert stats["commands"] == ["tcli"]
+    assert stats["complete_function"] == "_tcli_complete"
+
+
+def test_stream_completion_not_found(temp_home, monkeypatch):
+    """Test a CLI missing from PATH"""
+    monkeypatch.setenv("PATH", str(temp_home))
+
+    stats, message = stream_completion("test-cli", temp_home / "test-cli", "")
+
+    assert stats is None
+    assert message == "test-cli not found in PATH"
+    assert not (temp_home / "test-cli").exists()
+
+
+def test_generate_and_install_completion_updates_index(mock_completion_dir, monkeypatch):
+    """Test streamed installs are indexed without re-reading the file"""
+    _fake_cli(
+        mock_completion_dir.parent / "bin",
+        "test-cli",
+        "echo 'complete -F _test-cli_complete test-cli'",
+        monkeypatch,
+    )
+    header = '# META: {"backend":"backend","source_cli":"test-cli","wrapper_cli":"tc"}\n'
+
+    with patch('cli_manager.utils.install_completion.add_bashrc_loader', return_value=None):
+        success, messages, _ = generate_and_install_completion("test-cli", header, "tc")
+
+    assert success
+    assert "✅ Wrapper completion added for: tc" in messages
+    entry = load_index(mock_completion_dir)["test-cli"]
+    assert entry["wrapper"] == "tc"
+    assert entry["commands"] == ["test-cli"]
+    assert entry["size"] == (mock_completion_dir / "test-cli").stat().st_size
+
+
+def test_generate_and_install_completion_skips_identical(mock_completion_dir, monkeypatch):
+    """Test regenerating identical output leaves the file and its mtime alone"""
+    _fake_cli(
+        mock_completion_dir.parent / "bin",
+        "test-cli",
+        "echo 'complete -F _test-cli_complete test-cli'",
+        monkeypatch,
+    )
+    header = '# META: {"backend":"backend","source_cli":"test-cli","wrapper_cli":"test-cli"}\n'
+    completion_file = mock_completion_dir / "test-cli"
+
+    with patch('cli_manager.utils.install_completion.add_bashrc_loader', return_value=None):
+        assert generate_and_install_completion("test-cli", header)[2] is True
+        mtime_ns = completion_file.stat().st_mtime_ns
+        success, messages, changed = generate_and_install_completion("test-cli", header)
+
+    assert success and not changed
+    assert messages == [f"Completion unchanged: {completion_file}"]
+    assert completion_file.stat().st_mtime_ns == mtime_ns
+    assert [p.name for p in mock_completion_dir.iterdir() if p.name.startswith(".test-cli")] == []
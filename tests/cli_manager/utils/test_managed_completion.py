@@ -1,12 +1,13 @@
 import pytest
 from pathlib import Path
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import ANY, patch
 
 from cli_manager.utils.managed_completion import (
     refresh_cli_completion,
     refresh_all_completions,
     _find_completion_file
 )
+from cli_manager.utils.completion_index import load_index
 
 
 @pytest.fixture
@@ -20,10 +21,10 @@ def mock_completion_dir(tmp_path):
 def test_refresh_cli_completion_cli_not_found(mock_completion_dir):
     """Test refreshing completion when CLI is not found"""
     with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
-        with patch('cli_manager.utils.managed_completion.generate_completion') as mock_gen:
-            mock_gen.return_value = (None, "CLI not found")
+        with patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen:
+            mock_gen.return_value = (None, ["CLI not found"], False)
             
-            success, messages = refresh_cli_completion("test-cli", "backend")
+            success, messages, _ = refresh_cli_completion("test-cli", "backend")
             
             assert success
             assert "No completion file found" in messages[0]
@@ -35,10 +36,10 @@ def test_refresh_cli_completion_remove_existing(mock_completion_dir):
     completion_file.write_text('# META: {"source_cli":"test-cli","backend":"backend"}')
     
     with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
-        with patch('cli_manager.utils.managed_completion.generate_completion') as mock_gen:
-            mock_gen.return_value = (None, "CLI not found")
+        with patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen:
+            mock_gen.return_value = (None, ["CLI not found"], False)
             
-            success, messages = refresh_cli_completion("test-cli", "backend")
+            success, messages, _ = refresh_cli_completion("test-cli", "backend")
             
             assert success
             assert "Removed completion" in messages[0]
@@ -47,20 +48,24 @@ def test_refresh_cli_completion_remove_existing(mock_completion_dir):
 
 def test_refresh_cli_completion_success(mock_completion_dir):
     """Test successful completion refresh"""
-    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
-        with patch('cli_manager.utils.managed_completion.generate_completion') as mock_gen:
-            with patch('cli_manager.utils.managed_completion.install_completion') as mock_install:
-                mock_gen.return_value = ("completion script", "Generated")
-                mock_install.return_value = (True, ["Installed"])
-                
-                success, messages = refresh_cli_completion(
-                    "test-cli",
-                    "backend",
-                    "wrapper-cli"
-                )
-                
-                assert success
-                assert "Installed" in messages[0]
+    fingerprint = {"path": "/bin/test-cli", "size": 1, "mtime_ns": 1}
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent), \
+            patch('cli_manager.utils.managed_completion.compute_fingerprint', return_value=fingerprint):
+        with patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen:
+            mock_gen.return_value = (True, ["Installed"], True)
+
+            success, messages, _ = refresh_cli_completion(
+                "test-cli",
+                "backend",
+                "wrapper-cli"
+            )
+
+            assert success
+            assert "Installed" in messages[0]
+            header = mock_gen.call_args[0][1]
+            assert header.startswith("# META: ")
+            assert '"wrapper_cli":"wrapper-cli"' in header
 
 
 def test_refresh_all_completions_no_dir():
@@ -68,7 +73,7 @@ def test_refresh_all_completions_no_dir():
     with patch('pathlib.Path.home') as mock_home:
         mock_home.return_value = Path('/nonexistent')
         
-        success, messages = refresh_all_completions("backend")
+        success, messages, _ = refresh_all_completions("backend")
         
         assert success
         assert "No completions directory found" in messages[0]
@@ -88,13 +93,15 @@ def test_refresh_all_completions_mixed_files(mock_completion_dir):
     
     with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
         with patch('cli_manager.utils.managed_completion.refresh_cli_completion') as mock_refresh:
-            mock_refresh.return_value = (True, ["Refreshed"])
+            mock_refresh.return_value = (True, ["Refreshed"], True)
             
-            success, messages = refresh_all_completions("backend")
+            success, messages, _ = refresh_all_completions("backend")
             
             assert success
             assert mock_refresh.call_count == 1  # Only managed file processed
-            mock_refresh.assert_called_with("managed-cli", "backend", None)
+            mock_refresh.assert_called_with(
+                "managed-cli", "backend", None, transaction=ANY, shell="bash", index=ANY
+            )
 
 
 def test_find_completion_file(mock_completion_dir):
@@ -105,13 +112,167 @@ def test_find_completion_file(mock_completion_dir):
         '# META: {"source_cli":"test-cli","backend":"backend"}'
     )
     
-    result = _find_completion_file(mock_completion_dir, "test-cli")
+    result = _find_completion_file(mock_completion_dir, "test-cli", load_index(mock_completion_dir))
     
     assert result == test_file
 
 
 def test_find_completion_file_not_found(mock_completion_dir):
     """Test when completion file is not found"""
-    result = _find_completion_file(mock_completion_dir, "nonexistent")
+    result = _find_completion_file(mock_completion_dir, "nonexistent", load_index(mock_completion_dir))
     
-    assert result is None 
\ No newline at end of file
+    assert result is None 
+
+def test_refresh_cli_completion_skips_unchanged(mock_completion_dir):
+    """Test that an unchanged executable is not spawned again"""
+    fingerprint = {"path": "/bin/test-cli", "size": 1, "mtime_ns": 1}
+    completion_file = mock_completion_dir / "test-cli"
+    completion_file.write_text(
+        '# META: {"source_cli":"test-cli","backend":"backend","wrapper_cli":"test-cli",'
+        '"fingerprint":{"path":"/bin/test-cli","size":1,"mtime_ns":1}}'
+    )
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
+        with patch('cli_manager.utils.managed_completion.compute_fingerprint', return_value=fingerprint):
+            with patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen:
+                success, messages, _ = refresh_cli_completion(
+                    "test-cli", "backend", skip_unchanged=True
+                )
+
+                assert success
+                assert "up to date" in messages[0]
+                mock_gen.assert_not_called()
+
+
+def test_refresh_cli_completion_records_fingerprint(mock_completion_dir, monkeypatch):
+    """Test that the fingerprint is written into the META header"""
+    fingerprint = {"path": "/bin/test-cli", "size": 1, "mtime_ns": 1}
+    bin_dir = mock_completion_dir.parent / "bin"
+    bin_dir.mkdir()
+    cli_path = bin_dir / "test-cli"
+    cli_path.write_text("#!/bin/sh\necho 'complete -F _test-cli_complete test-cli'\n")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
+        with patch('cli_manager.utils.managed_completion.compute_fingerprint', return_value=fingerprint):
+            with patch('cli_manager.utils.install_completion.add_bashrc_loader', return_value=None):
+                success, _, _ = refresh_cli_completion("test-cli", "backend")
+
+                assert success
+                content = (mock_completion_dir / "test-cli").read_text()
+                assert '"fingerprint":{"path":"/bin/test-cli"' in content
+
+
+def test_refresh_cli_completion_uses_negative_cache(mock_completion_dir):
+    """Test that a CLI recently missing from PATH is not probed again"""
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
+        with patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen:
+            mock_gen.return_value = (None, ["test-cli not found in PATH"], False)
+            refresh_cli_completion("test-cli", "backend")
+
+            success, messages, _ = refresh_cli_completion(
+                "test-cli", "backend", skip_unchanged=True
+            )
+
+            assert success
+            assert "cached" in messages[0]
+            # absent from the PATH index, so it was never spawned at all
+            mock_gen.assert_not_called()
+
+
+def test_refresh_all_completions_skips_unchanged(mock_completion_dir):
+    """Test refresh all only regenerates CLIs whose fingerprint changed"""
+    fingerprint = {"path": "/bin/same-cli", "size": 1, "mtime_ns": 1}
+    (mock_completion_dir / "same-cli").write_text(
+        '# META: {"source_cli":"same-cli","backend":"backend","wrapper_cli":"same-cli",'
+        '"fingerprint":{"path":"/bin/same-cli","size":1,"mtime_ns":1}}'
+    )
+    (mock_completion_dir / "changed-cli").write_text(
+        '# META: {"source_cli":"changed-cli","backend":"backend","wrapper_cli":"changed-cli",'
+        '"fingerprint":{"path":"/bin/changed-cli","size":1,"mtime_ns":1}}'
+    )
+
+    def fake_fingerprint(cli_name):
+        if cli_name == "same-cli":
+            return fingerprint
+        return {"path": "/bin/changed-cli", "size": 2, "mtime_ns": 2}
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
+        with patch('cli_manager.utils.managed_completion.compute_fingerprint', side_effect=fake_fingerprint):
+            with patch('cli_manager.utils.managed_completion.refresh_cli_completion') as mock_refresh:
+                mock_refresh.return_value = (True, ["Refreshed"], True)
+
+                success, messages, _ = refresh_all_completions("backend")
+
+                assert success
+                assert "same-cli is up to date" in messages
+                mock_refresh.assert_called_once_with(
+                    "changed-cli", "backend", None, transaction=ANY, shell="bash", index=ANY
+                )
+
+                mock_refresh.reset_mock()
+                refresh_all_completions("backend", force=True)
+                assert mock_refresh.call_count == 2
+
+
+def test_refresh_cli_completion_keeps_static_generator(mock_completion_dir):
+    """Test that a CLI installed with --static is regenerated statically"""
+    (mock_completion_dir / "test-cli").write_text(
+        '# META: {"source_cli":"test-cli","backend":"backend","generator":"static"}\n'
+    )
+    fingerprint = {"path": "/bin/test-cli", "size": 1, "mtime_ns": 1}
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent), \
+            patch('cli_manager.utils.managed_completion.compute_fingerprint', return_value=fingerprint), \
+            patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen, \
+            patch('cli_manager.utils.managed_completion.install_static_completion') as mock_static:
+        mock_static.return_value = (True, ["Installed"], True)
+
+        success, messages, _ = refresh_cli_completion("test-cli", "backend")
+
+        assert success
+        mock_gen.assert_not_called()
+        mock_static.assert_called_once_with(
+            "test-cli", "backend", None, fingerprint=fingerprint, cache=None, transaction=None
+        )
+
+
+def test_refresh_cli_completion_keeps_isolated_generation(mock_completion_dir):
+    """Test that a CLI installed with --isolated is still generated in a subprocess"""
+    (mock_completion_dir / "test-cli").write_text(
+        '# META: {"source_cli":"test-cli","backend":"backend","generator":"subprocess"}\n'
+    )
+    fingerprint = {"path": "/bin/test-cli", "size": 1, "mtime_ns": 1}
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent), \
+            patch('cli_manager.utils.managed_completion.compute_fingerprint', return_value=fingerprint), \
+            patch('cli_manager.utils.managed_completion.generate_and_install_completion') as mock_gen:
+        mock_gen.return_value = (True, ["Installed"], True)
+
+        success, messages, _ = refresh_cli_completion("test-cli", "backend")
+
+        assert success
+        header = mock_gen.call_args.args[1]
+        assert '"generator":"subprocess"' in header
+        assert mock_gen.call_args.kwargs["in_process"] is False
+
+
+def test_refresh_all_reads_index_once(mock_completion_dir):
+    """Test that refreshing many CLIs shares one index snapshot"""
+    for cli in ("a-cli", "b-cli", "c-cli"):
+        (mock_completion_dir / cli).write_text(
+            f'# META: {{"source_cli":"{cli}","backend":"backend","wrapper_cli":"{cli}"}}\n'
+        )
+    load_index(mock_completion_dir)
+
+    with patch('pathlib.Path.home', return_value=mock_completion_dir.parent):
+        with patch('cli_manager.utils.managed_completion.compute_fingerprint', return_value=None):
+            with patch(
+                'cli_manager.utils.managed_completion.load_index', wraps=load_index
+            ) as mock_load:
+                success, messages, _ = refresh_all_completions("backend", force=False)
+
+    assert success
+    assert mock_load.call_count == 1
+    assert "Removed completion for b-cli (CLI not found)" in messages
@@ -2,6 +2,9 @@ import pytest
 from cli_manager.utils.meta_parser import (
     add_meta_to_completion,
     parse_meta_from_completion,
+    extract_complete_function,
+    extract_completion_commands,
+    read_meta_header,
     META_PREFIX
 )
 
@@ -186,4 +189,68 @@ def test_parse_meta_from_completion():
 
     # Test with only meta prefix
     result = parse_meta_from_completion(META_PREFIX)
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+
+def test_extract_completion_commands():
+    # cleo style registration for the name and the resolved path
+    content = """_cli_complete() {
+    :
+}
+
+complete -o default -F _cli_complete cli
+complete -o default -F _cli_complete /usr/bin/cli
+"""
+    assert extract_completion_commands(content) == ["cli", "/usr/bin/cli"]
+
+    # several names on one line, duplicates removed
+    content = "complete -F _f a b\ncomplete -F _f b"
+    assert extract_completion_commands(content) == ["a", "b"]
+
+    # no registration
+    assert extract_completion_commands("echo 'no completion here'") == []
+
+
+def test_extract_zsh_and_fish_commands():
+    # zsh: names come from the #compdef line, the function from compdef
+    content = """#compdef cli cl -p cli-*
+_cli_complete() {
+    :
+}
+_cli_complete "$@"
+compdef _cli_complete /usr/bin/cli
+"""
+    assert extract_completion_commands(content, "zsh") == ["cli", "cl"]
+    assert extract_complete_function(content, "zsh") == "_cli_complete"
+
+    # fish: names come from complete -c
+    content = "complete -c cli -f\ncomplete -c cli -n '__fish_use_subcommand' -a list\n"
+    assert extract_completion_commands(content, "fish") == ["cli"]
+    assert extract_complete_function(content, "fish") is None
+
+
+def test_add_meta_after_compdef():
+    # compinit only reads #compdef on the first line
+    result = add_meta_to_completion(
+        "backend", "cli", "cli", "#compdef cli\n_cli_complete() { :; }\n", shell="zsh"
+    )
+    lines = result.split("\n")
+    assert lines[0] == "#compdef cli"
+    assert parse_meta_from_completion(result)["shell"] == "zsh"
+
+
+def test_read_meta_header(tmp_path):
+    # Only the header is needed even for a large body
+    completion_file = tmp_path / "cli"
+    completion_file.write_text(
+        f'{META_PREFIX}{{"source_cli":"cli","padding":"{"x" * 100}"}}\n' + "echo body\n" * 10000
+    )
+    assert read_meta_header(completion_file, limit=32)["source_cli"] == "cli"
+
+    # META after a few leading lines inside the prefix is still found
+    completion_file.write_text(f'#!/bin/bash\n{META_PREFIX}{{"source_cli":"cli"}}\n')
+    assert read_meta_header(completion_file)["source_cli"] == "cli"
+
+    # No META in the prefix
+    completion_file.write_text("echo body\n" * 1000 + f'{META_PREFIX}{{"source_cli":"cli"}}\n')
+    assert read_meta_header(completion_file) is None
@@ -0,0 +1,97 @@
+import json
+import os
+from unittest.mock import patch
+
+from cli_manager.utils import missing_cache
+from cli_manager.utils.missing_cache import (
+    MISSING_TTL_SECONDS,
+    clear_missing,
+    get_missing_cache_path,
+    is_known_missing,
+    mark_missing,
+)
+from cli_manager.utils.path_index import clear_path_index
+
+
+def test_mark_and_check_missing(temp_home):
+    """Test that a missing CLI is remembered within the TTL"""
+    mark_missing("gone-cli", now=1000.0)
+
+    assert get_missing_cache_path().exists()
+    assert is_known_missing("gone-cli", now=1000.0 + MISSING_TTL_SECONDS - 1)
+    assert not is_known_missing("other-cli", now=1000.0)
+
+
+def test_missing_entry_expires(temp_home):
+    """Test that a missing CLI is probed again after the TTL"""
+    mark_missing("gone-cli", now=1000.0)
+
+    assert not is_known_missing("gone-cli", now=1000.0 + MISSING_TTL_SECONDS)
+
+
+def test_clear_missing(temp_home):
+    """Test clearing a negative cache entry"""
+    mark_missing("gone-cli")
+    clear_missing("gone-cli")
+
+    assert not is_known_missing("gone-cli")
+
+
+def test_corrupt_cache_is_ignored(temp_home):
+    """Test that a corrupt cache file is treated as empty"""
+    cache_path = get_missing_cache_path()
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text("not json")
+
+    assert not is_known_missing("gone-cli")
+    mark_missing("gone-cli")
+    assert is_known_missing("gone-cli")
+
+
+def test_cached_miss_is_dropped_when_cli_appears(temp_home, monkeypatch):
+    """Test that a CLI installed after being cached as missing is probed again"""
+    bin_dir = temp_home / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", str(bin_dir))
+    mark_missing("new-cli")
+    assert is_known_missing("new-cli")
+
+    executable = bin_dir / "new-cli"
+    executable.write_text("#!/bin/sh\n")
+    executable.chmod(0o755)
+    os.utime(bin_dir, ns=(0, bin_dir.stat().st_mtime_ns + 1))
+    clear_path_index()
+
+    assert not is_known_missing("new-cli")
+
+
+def test_cached_miss_is_dropped_when_path_changes(temp_home, monkeypatch):
+    """Test that a cached miss only holds for the PATH it was recorded with"""
+    monkeypatch.setenv("PATH", str(temp_home))
+    mark_missing("gone-cli")
+
+    monkeypatch.setenv("PATH", f"{temp_home}{os.pathsep}{temp_home / 'bin'}")
+
+    assert not is_known_missing("gone-cli")
+
+
+def test_cached_miss_skips_the_path_lookup(temp_home):
+    """Test that a cached miss is trusted without looking the CLI up again"""
+    mark_missing("gone-cli")
+
+    with patch("cli_manager.utils.path_index.get_path_index") as get_path_index:
+        assert is_known_missing("gone-cli")
+
+    get_path_index.assert_not_called()
+
+
+def test_cache_file_is_parsed_once(temp_home):
+    """Test that repeated checks reuse the parsed cache file"""
+    mark_missing("gone-cli")
+    missing_cache._memo = (None, {})
+
+    with patch("cli_manager.utils.missing_cache.json.loads", wraps=json.loads) as loads:
+        for name in ("gone-cli", "other-cli", "gone-cli"):
+            is_known_missing(name)
+
+    assert loads.call_count == 1
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+
+from cli_manager.utils.path_index import (
+    PATH_CACHE_ENV,
+    clear_path_index,
+    get_path_cache_path,
+    which,
+)
+
+
+def _make_executable(directory, name, mode=0o755):
+    path = directory / name
+    path.write_text("#!/bin/sh\n")
+    path.chmod(mode)
+    return path
+
+
+def test_which_matches_shutil(tmp_path, monkeypatch):
+    """Test that PATH order, permissions and directories behave like shutil.which"""
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    _make_executable(first, "tool")
+    _make_executable(second, "tool")
+    _make_executable(first, "plain", mode=0o644)
+    _make_executable(second, "plain")
+    (first / "dir").mkdir()
+    monkeypatch.setenv("PATH", os.pathsep.join([str(first), str(tmp_path / "missing"), str(second)]))
+
+    for name in ["tool", "plain", "dir", "nonexistent"]:
+        assert which(name) == shutil.which(name)
+
+
+def test_which_scans_each_directory_once(tmp_path, monkeypatch):
+    """Test that lookups reuse the per-process index"""
+    _make_executable(tmp_path, "tool")
+    monkeypatch.setenv("PATH", str(tmp_path))
+    scanned = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr("cli_manager.utils.path_index.os.scandir", counting_scandir)
+
+    assert [which(name) for name in ["tool", "a", "b", "c"]] == [str(tmp_path / "tool"), None, None, None]
+    assert scanned == [str(tmp_path)]
+
+
+def test_persisted_index_rescans_changed_dirs(temp_home, tmp_path, monkeypatch):
+    """Test that the persisted index is reused until a directory's mtime changes"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _make_executable(bin_dir, "tool")
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setenv(PATH_CACHE_ENV, "1")
+    scanned = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr("cli_manager.utils.path_index.os.scandir", counting_scandir)
+
+    assert which("tool")
+    data = json.loads(get_path_cache_path().read_text())
+    assert data["dirs"][str(bin_dir)]["names"] == ["tool"]
+
+    # a new process reuses the cache file without listing the directory
+    clear_path_index()
+    assert which("tool")
+    assert len(scanned) == 1
+
+    _make_executable(bin_dir, "other")
+    stat = bin_dir.stat()
+    os.utime(bin_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    clear_path_index()
+
+    assert which("other") == str(bin_dir / "other")
+    assert len(scanned) == 2
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from cli_manager.utils.registry import (
+    get_registry_path,
+    load_registry,
+    make_record,
+    save_registry,
+)
+from cli_manager.utils.wrapper_utils import generate_wrapper_script, get_wrapper_script_path
+
+
+def test_load_registry_empty(temp_home):
+    """Test that a fresh home has no registered CLIs"""
+    assert load_registry() == {}
+
+
+def test_load_registry_migrates_legacy_wrapper(temp_home):
+    """Test reading the CLI list from a wrapper script written before the registry"""
+    wrapper_path = get_wrapper_script_path()
+    wrapper_path.parent.mkdir(parents=True)
+    wrapper_path.write_text(generate_wrapper_script(["cli1", "cli2"]))
+
+    registry = load_registry()
+
+    assert list(registry) == ["cli1", "cli2"]
+    assert registry["cli1"]["name"] == "cli1"
+    assert not get_registry_path().exists()
+
+
+def test_save_and_load_registry(temp_home):
+    """Test round-tripping records in registration order"""
+    fingerprint = {"path": "/usr/bin/cli2", "size": 10}
+    registry = {
+        "cli2": make_record("cli2", fingerprint=fingerprint, generation_seconds=0.123456),
+        "cli1": make_record("cli1", added_at=1.0),
+    }
+
+    save_registry(registry)
+    loaded = load_registry()
+
+    assert list(loaded) == ["cli2", "cli1"]
+    assert loaded["cli2"]["path"] == "/usr/bin/cli2"
+    assert loaded["cli2"]["fingerprint"] == fingerprint
+    assert loaded["cli2"]["generation_seconds"] == 0.1235
+    assert loaded["cli1"]["added_at"] == 1.0
+    assert json.loads(get_registry_path().read_text())["version"] == 1
+
+
+def test_load_registry_corrupt(temp_home):
+    """Test that a corrupt registry is reported instead of looking empty"""
+    get_registry_path().parent.mkdir(parents=True)
+    get_registry_path().write_text("{not json")
+
+    with pytest.raises(ValueError):
+        load_registry()
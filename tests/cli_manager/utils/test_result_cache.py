@@ -0,0 +1,100 @@
+import os
+import threading
+
+import pytest
+
+from cli_manager.utils.result_cache import (
+    DEFAULT_BUDGET_MS,
+    ResultCache,
+    make_cache_key,
+    parse_cache_settings,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache")
+    yield result_cache
+    result_cache.shutdown()
+
+
+def test_parse_cache_settings():
+    """Test validating the META "cache" setting"""
+    assert parse_cache_settings({"ttl": 5}) == {"ttl": 5.0, "budget_ms": DEFAULT_BUDGET_MS}
+    assert parse_cache_settings({"ttl": "2", "budget_ms": 0}) == {"ttl": 2.0, "budget_ms": 0.0}
+    assert parse_cache_settings(None) is None
+    assert parse_cache_settings({"ttl": 0}) is None
+    assert parse_cache_settings({"ttl": "soon"}) is None
+
+
+def test_make_cache_key():
+    """Test that words after the current one are ignored but the directory is not"""
+    key = make_cache_key("cli", ["cli", "cmd", "a", "later"], 2, "/work")
+
+    assert key == make_cache_key("cli", ["cli", "cmd", "a"], 2, "/work")
+    assert key != make_cache_key("cli", ["cli", "cmd", "ab"], 2, "/work")
+    assert key != make_cache_key("cli", ["cli", "cmd", "a"], 2, "/other")
+
+
+def test_fresh_results_are_not_recomputed(cache):
+    """Test that a result inside its TTL is served from the cache"""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["read", "write"]
+
+    settings = {"ttl": 60, "budget_ms": 1000}
+    assert cache.lookup("cli", "key", settings, compute) == ["read", "write"]
+    assert cache.lookup("cli", "key", settings, compute) == ["read", "write"]
+    assert calls == [1]
+
+    # Another cache object (another daemon) on the same directory shares it
+    other = ResultCache(cache.cache_dir)
+    try:
+        assert other.get("cli", "key")[1] == ["read", "write"]
+    finally:
+        other.shutdown()
+
+
+def test_stale_result_while_revalidating(cache):
+    """Test that a slow refresh returns the stale answer and updates the cache later"""
+    cache.put("cli", "key", ["old"])
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return ["new"]
+
+    # Expired (ttl) and the refresh is slower than the budget
+    settings = {"ttl": 1e-9, "budget_ms": 10}
+    assert cache.lookup("cli", "key", settings, slow) == ["old"]
+
+    release.set()
+    cache._executor.submit(lambda: None).result(5)  # wait for the refresh to finish
+    assert cache.get("cli", "key")[1] == ["new"]
+
+
+def test_timeout_without_cached_result(cache):
+    """Test that None is returned when nothing is cached and the budget runs out"""
+    release = threading.Event()
+
+    assert cache.lookup("cli", "key", {"ttl": 60, "budget_ms": 10}, lambda: release.wait(5) and []) is None
+    release.set()
+
+
+def test_least_recently_used_results_are_pruned(tmp_path):
+    """Test that each CLI keeps at most max_entries results, dropping the least recently used"""
+    cache = ResultCache(tmp_path / "cache", max_entries=2)
+    try:
+        cache.put("cli", "a", ["1"])
+        cache.put("cli", "b", ["2"])
+        # Make "a" the most recently used one
+        os.utime(cache.cache_dir / "cli" / "b", ns=(0, 0))
+        assert cache.get("cli", "a") is not None
+        cache.put("cli", "c", ["3"])
+    finally:
+        cache.shutdown()
+
+    assert sorted(p.name for p in (tmp_path / "cache" / "cli").iterdir()) == ["a", "c"]
+    assert (tmp_path / "cache" / "cli" / "a").stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,102 @@
+import pytest
+
+from cli_manager.utils.shells import (
+    FISH_LOADER,
+    ZSHRC_LOADER,
+    add_shell_loader,
+    compile_zsh_completions,
+    get_shell_completion_dir,
+    get_shell_completion_file,
+    get_shell_rc_path,
+    installed_shells,
+    validate_shell,
+)
+from cli_manager.utils.transaction import FileTransaction
+
+
+def test_shell_paths(temp_home, monkeypatch):
+    """Test per-shell completion files and loader locations"""
+    monkeypatch.delenv("ZDOTDIR", raising=False)
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    completion_dir = temp_home / ".completions"
+
+    assert get_shell_completion_file("bash", "cli") == completion_dir / "cli"
+    assert get_shell_completion_file("zsh", "cli") == completion_dir / ".zsh" / "_cli"
+    assert get_shell_completion_file("fish", "cli") == completion_dir / ".fish" / "cli.fish"
+    assert get_shell_rc_path("zsh") == temp_home / ".zshrc"
+    assert get_shell_rc_path("fish") == temp_home / ".config" / "fish" / "conf.d" / "supercli.fish"
+
+    monkeypatch.setenv("ZDOTDIR", str(temp_home / "zdot"))
+    assert get_shell_rc_path("zsh") == temp_home / "zdot" / ".zshrc"
+
+    with pytest.raises(ValueError, match="Unknown shell"):
+        validate_shell("tcsh")
+
+
+def test_installed_shells(mock_completion_dir):
+    """Test that bash is always listed and zsh/fish only once installed"""
+    assert installed_shells() == ["bash"]
+    get_shell_completion_dir("fish").mkdir()
+    assert installed_shells() == ["bash", "fish"]
+
+
+def test_add_shell_loader(temp_home, mock_completion_dir, monkeypatch):
+    """Test that zsh/fish loaders are added once and existing rc content is kept"""
+    monkeypatch.delenv("ZDOTDIR", raising=False)
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    zshrc = temp_home / ".zshrc"
+    zshrc.write_text("autoload -Uz compinit && compinit\n")
+
+    with FileTransaction() as transaction:
+        assert add_shell_loader("zsh", transaction) == f"Added completion loader to {zshrc}"
+        assert add_shell_loader("fish", transaction).startswith("Added completion loader")
+
+    assert zshrc.read_text() == "autoload -Uz compinit && compinit\n" + ZSHRC_LOADER
+    assert get_shell_rc_path("fish").read_text() == FISH_LOADER
+
+    with FileTransaction() as transaction:
+        assert add_shell_loader("zsh", transaction) is None
+        assert add_shell_loader("fish", transaction) is None
+        assert not transaction.changed
+
+
+def _fake_zsh(bin_dir, monkeypatch):
+    """zsh stand-in whose zcompile writes <file>.zwc and logs each run"""
+    bin_dir.mkdir(exist_ok=True)
+    zsh = bin_dir / "zsh"
+    zsh.write_text(
+        "#!/bin/sh\n"
+        f'echo run >> "{bin_dir}/runs"\n'
+        "shift 3\n"
+        'for f; do echo compiled > "$f.zwc"; done\n'
+    )
+    zsh.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+
+def test_compile_zsh_completions(temp_home, mock_completion_dir, monkeypatch):
+    """Test that only new or changed completions are compiled, in one zsh run"""
+    _fake_zsh(temp_home / "bin", monkeypatch)
+    zsh_dir = get_shell_completion_dir("zsh")
+    zsh_dir.mkdir()
+    (zsh_dir / "_a").write_text("#compdef a\n")
+    (zsh_dir / "_b").write_text("#compdef b\n")
+    (zsh_dir / "_gone.zwc").write_text("compiled")
+
+    assert compile_zsh_completions() == "Compiled 2 zsh completion(s) with zcompile"
+    assert sorted(p.name for p in zsh_dir.iterdir()) == ["_a", "_a.zwc", "_b", "_b.zwc"]
+
+    # Nothing is stale: zsh is not started again
+    assert compile_zsh_completions() is None
+    assert (temp_home / "bin" / "runs").read_text() == "run\n"
+
+
+def test_compile_zsh_completions_without_zsh(temp_home, mock_completion_dir, monkeypatch):
+    """Test that compilation is skipped when zsh is not installed"""
+    monkeypatch.setenv("PATH", str(temp_home / "empty"))
+    zsh_dir = get_shell_completion_dir("zsh")
+    zsh_dir.mkdir()
+    (zsh_dir / "_a").write_text("#compdef a\n")
+
+    assert compile_zsh_completions() is None
+    assert [p.name for p in zsh_dir.iterdir()] == ["_a"]
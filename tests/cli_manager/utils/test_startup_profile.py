@@ -0,0 +1,91 @@
+import sys
+
+import pytest
+
+from cli_manager.utils.startup_profile import (
+    format_profile,
+    parse_importtime,
+    profile_command,
+    requested_profile_mode,
+)
+
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       223 |        223 |   _io
+some warning
+import time:       435 |       1178 | _frozen_importlib_external
+"""
+
+
+def test_parse_importtime():
+    """Test splitting importtime lines from other stderr output"""
+    imports, other = parse_importtime(IMPORTTIME)
+
+    assert imports == [
+        {"module": "_io", "self_us": 223, "cumulative_us": 223, "depth": 1},
+        {"module": "_frozen_importlib_external", "self_us": 435, "cumulative_us": 1178, "depth": 0},
+    ]
+    assert other == "some warning\n"
+
+
+def test_requested_profile_mode(monkeypatch):
+    """Test the --profile-startup option and SUPERCLI_PROFILE_STARTUP values"""
+    monkeypatch.delenv("SUPERCLI_PROFILE_STARTUP", raising=False)
+    assert requested_profile_mode(["show"]) is None
+    assert requested_profile_mode(["show", "--profile-startup"]) == "table"
+
+    monkeypatch.setenv("SUPERCLI_PROFILE_STARTUP", "1")
+    assert requested_profile_mode(["show"]) == "table"
+
+    monkeypatch.setenv("SUPERCLI_PROFILE_STARTUP", "out.json")
+    assert requested_profile_mode(["show", "--profile-startup"]) == "out.json"
+
+    monkeypatch.setenv("SUPERCLI_PROFILE_STARTUP", "0")
+    assert requested_profile_mode(["show"]) is None
+
+
+@pytest.mark.parametrize("value", ["", "0", "false", "False", "no", " NO "])
+def test_requested_profile_mode_disabled_values(monkeypatch, value):
+    """Test that false-like values turn profiling off instead of naming a file"""
+    monkeypatch.setenv("SUPERCLI_PROFILE_STARTUP", value)
+
+    assert requested_profile_mode(["show"]) is None
+    assert requested_profile_mode(["show", "--profile-startup"]) == "table"
+
+
+@pytest.mark.parametrize(
+    "value, mode",
+    [
+        ("true", "table"),
+        ("yes", "table"),
+        ("table", "table"),
+        ("json", "json"),
+        ("JSON", "json"),
+        ("report.json", "report.json"),
+        ("/tmp/startup", "/tmp/startup"),
+        ("reports/startup.txt", "reports/startup.txt"),
+    ],
+)
+def test_requested_profile_mode_values(monkeypatch, value, mode):
+    """Test that only values with a path separator or a .json suffix are paths"""
+    monkeypatch.setenv("SUPERCLI_PROFILE_STARTUP", value)
+
+    assert requested_profile_mode(["show"]) == mode
+
+
+def test_profile_command():
+    """Test profiling a Python command and formatting the report"""
+    profile = profile_command([sys.executable, "-c", "import json; print('hi')"])
+
+    assert profile["returncode"] == 0
+    assert profile["stdout"] == "hi\n"
+    assert any(entry["module"] == "json" for entry in profile["imports"])
+    assert "json" in format_profile(profile)
+
+
+def test_profile_command_not_found():
+    """Test profiling a command that does not exist"""
+    profile = profile_command(["definitely-not-a-cli-xyz"])
+
+    assert profile["returncode"] == 127
+    assert profile["imports"] == []
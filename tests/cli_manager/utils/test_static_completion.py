@@ -0,0 +1,150 @@
+import shutil
+import subprocess
+
+import pytest
+from cleo.application import Application
+from cleo.commands.command import Command
+from cleo.helpers import argument, option
+
+from cli_manager.utils.completion_index import load_index
+from cli_manager.utils.static_completion import (
+    generate_static_completion,
+    install_static_completion,
+)
+
+
+class DeployCommand(Command):
+    name = "deploy"
+    description = "Deploy a target"
+
+    arguments = [argument("target", "Target to deploy", optional=True)]
+    options = [
+        option("env", "e", "Environment", flag=False),
+        option("dry-run", None, "Only print what would happen", flag=True),
+    ]
+
+    def handle(self):
+        return 0
+
+
+class StatusCommand(Command):
+    name = "status"
+    description = "Show status"
+
+    def handle(self):
+        return 0
+
+
+class PickCommand(Command):
+    name = "pick"
+    description = "Pick with dynamic completion"
+
+    arguments = [argument("item", "Item", optional=True)]
+
+    def handle(self):
+        return 0
+
+    def complete(self, words, word):
+        return ["apple", "avocado"]
+
+
+def _application():
+    application = Application("tool")
+    for command in (DeployCommand(), StatusCommand(), PickCommand()):
+        application.add(command)
+    return application
+
+
+@pytest.fixture
+def complete_in_bash(tmp_path, monkeypatch):
+    """Run the generated completion function in bash and return COMPREPLY"""
+    if shutil.which("bash") is None:
+        pytest.skip("bash is not installed")
+
+    script = tmp_path / "tool.bash"
+    script.write_text(generate_static_completion(_application(), "tool", "supercli"))
+
+    # Stand-in backend that records how it was queried
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    backend = bin_dir / "supercli"
+    backend.write_text(f'#!/bin/sh\necho "$*" > "{tmp_path}/query"\nprintf "apple\\navocado\\n"\n')
+    backend.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+
+    def complete(*words):
+        result = subprocess.run(
+            [
+                "bash",
+                "--norc",
+                "-c",
+                'source "$1"; shift; COMP_WORDS=("$@"); COMP_CWORD=$(( $# - 1 )); '
+                '_tool_complete; printf "%s\\n" "${COMPREPLY[@]}"',
+                "bash",
+                str(script),
+                *words,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return [line for line in result.stdout.split("\n") if line]
+
+    complete.query_log = tmp_path / "query"
+    return complete
+
+
+def test_static_completion_commands_and_options(complete_in_bash):
+    """Test that command and option names are completed without any query"""
+    assert complete_in_bash("tool", "") == ["deploy", "help", "list", "pick", "status"]
+    assert complete_in_bash("tool", "-q", "de") == ["deploy"]
+    assert complete_in_bash("tool", "deploy", "--d") == ["--dry-run"]
+    # Commands without arguments only take options
+    assert "--help" in complete_in_bash("tool", "status", "")
+    # help takes a command name
+    assert complete_in_bash("tool", "help", "st") == ["status"]
+    assert not complete_in_bash.query_log.exists()
+
+
+def test_static_completion_option_values_fall_back_to_files(complete_in_bash):
+    """Test that the value of an option that takes one is left to bash defaults"""
+    assert complete_in_bash("tool", "deploy", "--env", "") == []
+    assert complete_in_bash("tool", "deploy", "-e", "") == []
+
+
+def test_static_completion_queries_only_complete_commands(complete_in_bash):
+    """Test that only commands implementing complete() call back into Python"""
+    assert complete_in_bash("tool", "deploy", "") == []
+    assert not complete_in_bash.query_log.exists()
+
+    assert complete_in_bash("tool", "pick", "a") == ["apple", "avocado"]
+    assert complete_in_bash.query_log.read_text() == "completion-query -- tool 2 tool pick a\n"
+
+
+def test_install_static_completion(mock_completion_dir, monkeypatch):
+    """Test that the installed file records the static generator for refreshes"""
+    monkeypatch.setattr(
+        "cli_manager.utils.static_completion.load_application", lambda name: _application()
+    )
+
+    success, messages, _ = install_static_completion("tool", "supercli")
+
+    assert success
+    assert any(msg.startswith("✅") for msg in messages)
+    entry = load_index(mock_completion_dir)["tool"]
+    assert entry["generator"] == "static"
+    assert entry["commands"] == ["tool"]
+    assert entry["complete_function"] == "_tool_complete"
+
+
+def test_install_static_completion_not_importable(mock_completion_dir, monkeypatch):
+    """Test a CLI that is not a cleo console script"""
+    monkeypatch.setattr(
+        "cli_manager.utils.static_completion.load_application", lambda name: None
+    )
+
+    success, messages, _ = install_static_completion("tool", "supercli")
+
+    assert success is None
+    assert "not a cleo console script" in messages[0]
+    assert not (mock_completion_dir / "tool").exists()
@@ -0,0 +1,142 @@
+from unittest.mock import patch
+
+import pytest
+
+from cli_manager.utils.completion_index import load_index
+from cli_manager.utils.transaction import FileTransaction
+
+
+def _meta(cli):
+    return f'# META: {{"backend":"supercli","source_cli":"{cli}","wrapper_cli":"{cli}"}}\n'
+
+
+def test_nothing_is_written_before_commit(mock_completion_dir):
+    """Test that staged files, deletes and index entries only appear on commit"""
+    old = mock_completion_dir / "old"
+    old.write_text(_meta("old"))
+    load_index(mock_completion_dir)
+
+    transaction = FileTransaction(mock_completion_dir)
+    new = mock_completion_dir / "new"
+    script = _meta("new") + "complete -F _new_complete new\n"
+    assert transaction.write(new, script)
+    transaction.update_index_entry(new, script)
+    assert transaction.delete(old)
+    transaction.remove_index_entry(mock_completion_dir, "old")
+
+    # Staged contents are visible through the transaction only
+    assert not new.exists() and old.exists()
+    assert transaction.read_text(new) == script
+    assert transaction.read_text(old) == ""
+    view = transaction.index_view()
+    assert view["new"]["complete_function"] == "_new_complete" and "old" not in view
+
+    transaction.commit()
+
+    assert new.read_text() == script and not old.exists()
+    index = load_index(mock_completion_dir)
+    assert set(index) == {"new"}
+    assert index["new"]["mtime_ns"] == new.stat().st_mtime_ns
+    # Temporary and backup files are gone
+    assert sorted(p.name for p in mock_completion_dir.iterdir()) == [".supercli", "new"]
+
+
+def test_identical_content_is_not_staged(mock_completion_dir):
+    """Test that writing the current content stages nothing (mtime is kept)"""
+    path = mock_completion_dir / "same"
+    path.write_text("content")
+    path.chmod(0o755)
+    mtime_ns = path.stat().st_mtime_ns
+
+    transaction = FileTransaction(mock_completion_dir)
+    assert not transaction.write(path, "content")
+    assert not transaction.changed
+
+    # Only the mode differs: chmod without rewriting
+    assert transaction.write(path, "content", mode=0o644)
+    transaction.commit()
+    assert path.stat().st_mode & 0o777 == 0o644
+    assert path.stat().st_mtime_ns == mtime_ns
+
+
+def test_failed_commit_restores_every_file(mock_completion_dir):
+    """Test that a failure in the middle of commit rolls back files already replaced"""
+    first = mock_completion_dir / "first"
+    second = mock_completion_dir / "second"
+    removed = mock_completion_dir / "removed"
+    first.write_text("old first")
+    removed.write_text("keep me")
+
+    transaction = FileTransaction(mock_completion_dir)
+    transaction.write(first, "new first")
+    transaction.write(second, "new second")
+    transaction.delete(removed)
+    transaction.set_index_entry(first, None, 9, [])
+
+    with patch(
+        "cli_manager.utils.transaction.apply_index_changes", side_effect=OSError("disk full")
+    ):
+        with pytest.raises(OSError, match="disk full"):
+            transaction.commit()
+
+    assert first.read_text() == "old first"
+    assert not second.exists()
+    assert removed.read_text() == "keep me"
+    assert sorted(p.name for p in mock_completion_dir.iterdir()) == [".supercli", "first", "removed"]
+
+
+def test_rollback_discards_staged_files(mock_completion_dir):
+    """Test that an exception inside the with block leaves the disk untouched"""
+    path = mock_completion_dir / "cli"
+
+    with pytest.raises(RuntimeError):
+        with FileTransaction(mock_completion_dir) as transaction:
+            with transaction.writer(path) as f:
+                f.write("partial")
+            raise RuntimeError("generation failed")
+
+    assert list(mock_completion_dir.iterdir()) == []
+    with pytest.raises(RuntimeError):
+        transaction.commit()
+
+
+def test_run_once(mock_completion_dir):
+    """Test that per-transaction work (e.g. the .bashrc check) runs a single time"""
+    transaction = FileTransaction(mock_completion_dir)
+    calls = []
+
+    assert transaction.run_once("loader", lambda: calls.append(1) or "added") == "added"
+    assert transaction.run_once("loader", lambda: calls.append(1) or "added") is None
+    assert calls == [1]
+
+
+def test_staging_keeps_completion_dir_mtime(mock_completion_dir, monkeypatch):
+    """Test that staging and committing do not invalidate the index"""
+    for name in ("a", "b"):
+        (mock_completion_dir / name).write_text(_meta(name))
+    load_index(mock_completion_dir)
+    dir_mtime_ns = mock_completion_dir.stat().st_mtime_ns
+
+    transaction = FileTransaction(mock_completion_dir)
+    for name in ("c", "d"):
+        script = _meta(name) + f"complete -F _{name}_complete {name}\n"
+        transaction.write(mock_completion_dir / name, script)
+        transaction.update_index_entry(mock_completion_dir / name, script)
+    transaction.delete(mock_completion_dir / "a")
+    transaction.remove_index_entry(mock_completion_dir, "a")
+
+    # Temporary files live under .supercli/ until commit
+    assert mock_completion_dir.stat().st_mtime_ns == dir_mtime_ns
+
+    def fail_rebuild(*args):
+        raise AssertionError("index should not be rebuilt")
+
+    monkeypatch.setattr("cli_manager.utils.completion_index._rebuild_locked", fail_rebuild)
+    transaction.index_view()
+    transaction.commit()
+
+    assert set(load_index(mock_completion_dir)) == {"b", "c", "d"}
+    assert sorted(p.name for p in (mock_completion_dir / ".supercli").iterdir()) == [
+        "index.json",
+        "lock",
+    ]
@@ -1,12 +1,20 @@
+import subprocess
 import pytest
 from pathlib import Path
-from unittest.mock import patch, mock_open, MagicMock, PropertyMock
+from unittest.mock import patch
 
 from cli_manager.utils.wrapper_utils import (
     get_wrapper_script_path,
     generate_wrapper_script,
     update_wrapper_script,
-    get_registered_clis
+    get_registered_clis,
+    generate_wrapper_function,
+    generate_wrapper_completion,
+    get_wrapper_completion_path,
+    get_wrapper_function_path,
+    set_wrapper_mode,
+    WRAPPER_MODE_FUNCTION,
+    WRAPPER_MODE_SCRIPT,
 )
 
 
@@ -28,43 +36,31 @@ def test_generate_wrapper_script():
     # 필수 요소들 확인
     assert '#!/bin/bash' in script
     assert 'registered_clis="cli1 cli2 cli3"' in script
-    assert 'if [[ " $registered_clis " =~ " $1 " ]]' in script
-    assert '"$@"' in script
+    assert 'exec "$@"' in script
     assert 'Unknown command: $1' in script
     assert 'Available commands: $registered_clis' in script
 
 
-def test_update_wrapper_script_success():
+def test_update_wrapper_script_success(temp_home):
     """Test successful wrapper script update"""
     clis = ["cli1", "cli2"]
-    
-    with patch('pathlib.Path.home') as mock_home:
-        mock_home.return_value = Path('/home/test')
-        with patch('pathlib.Path.write_text') as mock_write:
-            with patch('subprocess.run') as mock_run:
-                # Mock parent directory and mkdir
-                mock_parent = MagicMock()
-                with patch('pathlib.Path.parent', new_callable=PropertyMock) as mock_parent_prop:
-                    mock_parent_prop.return_value = mock_parent
-                    
-                    success, message = update_wrapper_script(clis)
-                    
-                    assert success
-                    assert "Updated wrapper script" in message
-                    mock_write.assert_called_once()
-                    mock_parent.mkdir.assert_called_once_with(parents=True, exist_ok=True)
-                    mock_run.assert_called_once_with(
-                        ["chmod", "+x", "/home/test/.local/bin/superclisubs"],
-                        check=True
-                    )
+
+    success, message, _ = update_wrapper_script(clis)
+
+    script_path = temp_home / ".local" / "bin" / "superclisubs"
+    assert success
+    assert "Updated wrapper script" in message
+    assert 'registered_clis="cli1 cli2"' in script_path.read_text()
+    assert script_path.stat().st_mode & 0o777 == 0o755
+    assert [p.name for p in script_path.parent.iterdir()] == ["superclisubs"]
 
 
 def test_update_wrapper_script_failure():
     """Test wrapper script update failure"""
     with patch('pathlib.Path.home') as mock_home:
         mock_home.return_value = Path('/home/test')
-        with patch('pathlib.Path.write_text', side_effect=Exception("Test error")):
-            success, message = update_wrapper_script(["cli1"])
+        with patch('cli_manager.utils.wrapper_utils.generate_wrapper_script', side_effect=Exception("Test error")):
+            success, message, _ = update_wrapper_script(["cli1"])
             
             assert not success
             assert "Failed to update wrapper script" in message
@@ -108,4 +104,168 @@ some invalid content
             with patch('pathlib.Path.read_text', return_value=script_content):
                 clis = get_registered_clis()
                 
-                assert clis == [] 
\ No newline at end of file
+                assert clis == [] 
+
+def test_generate_wrapper_script_dispatch(tmp_path):
+    """Test that the generated wrapper execs registered CLIs and rejects others"""
+    script_path = tmp_path / "superclisubs"
+    script_path.write_text(generate_wrapper_script(["echo", "true"]))
+
+    ok = subprocess.run(
+        ["bash", str(script_path), "echo", "hello"], capture_output=True, text=True
+    )
+    unknown = subprocess.run(
+        ["bash", str(script_path), "ls"], capture_output=True, text=True
+    )
+
+    assert ok.returncode == 0
+    assert ok.stdout == "hello\n"
+    assert unknown.returncode == 1
+    assert "Unknown command: ls" in unknown.stdout
+    assert "Available commands: echo true" in unknown.stdout
+
+
+def test_generate_wrapper_function():
+    """Test the shell function variant of the wrapper"""
+    function = generate_wrapper_function(["cli1", "cli2"])
+
+    assert "superclisubs() {" in function
+    assert "[cli1]=1 [cli2]=1" in function
+    assert "exec" not in function
+    assert "return 1" in function
+
+
+def test_generate_wrapper_function_dispatch(tmp_path):
+    """Test that the wrapper function runs registered CLIs and rejects others"""
+    function_path = tmp_path / "superclisubs.bash"
+    function_path.write_text(generate_wrapper_function(["echo", "odd name"]))
+
+    result = subprocess.run(
+        ["bash", "-c", f"source {function_path}; superclisubs echo hello; superclisubs ls; echo $?"],
+        capture_output=True, text=True
+    )
+
+    assert result.stdout.splitlines() == [
+        "hello",
+        "Unknown command: ls",
+        "Available commands: echo odd name",
+        "1",
+    ]
+
+
+def test_update_wrapper_script_function_mode(temp_home):
+    """Test that function mode also writes the function file and .bashrc loader"""
+    set_wrapper_mode(WRAPPER_MODE_FUNCTION)
+
+    success, message, _ = update_wrapper_script(["cli1"])
+
+    assert success
+    assert "shell function" in message
+    assert "[cli1]=1" in get_wrapper_function_path().read_text()
+    assert "superclisubs.bash" in (temp_home / ".bashrc").read_text()
+
+    set_wrapper_mode(WRAPPER_MODE_SCRIPT)
+    update_wrapper_script(["cli1"])
+
+    assert not get_wrapper_function_path().exists()
+
+
+def test_set_wrapper_mode_invalid(temp_home):
+    """Test rejecting unknown wrapper modes"""
+    with pytest.raises(ValueError):
+        set_wrapper_mode("alias")
+
+
+def test_generate_wrapper_completion_routes_lazily(tmp_path):
+    """Test that superclisubs completion sources a backend on first use and shifts words"""
+    backend = tmp_path / "foo"
+    backend.write_text(
+        '_foo_complete() { COMPREPLY=("${COMP_WORDS[0]}|$COMP_CWORD|$COMP_LINE|$COMP_POINT|$1"); }\n'
+    )
+    router = tmp_path / "superclisubs"
+    router.write_text(
+        generate_wrapper_completion(["foo", "bar"], [("foo", "_foo_complete", backend)])
+    )
+
+    result = subprocess.run(
+        [
+            "bash",
+            "-c",
+            f"""
+source {router}
+COMP_WORDS=(superclisubs f); COMP_CWORD=1; COMP_LINE="superclisubs f"; COMP_POINT=14
+_superclisubs_complete; echo "${{COMPREPLY[*]}}"
+declare -F _foo_complete || echo "not loaded"
+COMP_WORDS=(superclisubs foo bu); COMP_CWORD=2; COMP_LINE="superclisubs foo bu"; COMP_POINT=19
+_superclisubs_complete; echo "${{COMPREPLY[*]}}"
+COMP_WORDS=(superclisubs bar x); COMP_CWORD=2; _superclisubs_complete; echo "[${{COMPREPLY[*]}}]"
+""",
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.splitlines() == ["foo", "not loaded", "foo|1|foo bu|6|foo", "[]"]
+
+
+def test_generate_wrapper_completion_cli_inside_wrapper_name(tmp_path):
+    """Test that a CLI named like part of 'superclisubs' gets the right COMP_LINE"""
+    backend = tmp_path / "sub"
+    backend.write_text('_sub_complete() { COMPREPLY=("$COMP_LINE|$COMP_POINT"); }\n')
+    router = tmp_path / "superclisubs"
+    router.write_text(
+        generate_wrapper_completion(["sub"], [("sub", "_sub_complete", backend)])
+    )
+
+    result = subprocess.run(
+        [
+            "bash",
+            "-c",
+            f"""
+source {router}
+COMP_WORDS=(superclisubs sub bu); COMP_CWORD=2; COMP_LINE="superclisubs  sub bu"; COMP_POINT=20
+_superclisubs_complete; echo "${{COMPREPLY[*]}}"
+""",
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.splitlines() == ["sub bu|6"]
+
+
+def test_update_wrapper_script_writes_completion(temp_home):
+    """Test that superclisubs completion is generated from the registry and index"""
+    completion_dir = temp_home / ".completions"
+    completion_dir.mkdir()
+    (completion_dir / "foo").write_text(
+        '# META: {"backend":"supercli","source_cli":"foo","wrapper_cli":"superclisubs"}\n'
+        "complete -F _foo_complete foo\n"
+    )
+
+    success, _, _ = update_wrapper_script(["foo", "bar"])
+
+    assert success
+    content = get_wrapper_completion_path().read_text()
+    assert "_superclisubs_complete_clis=(foo bar)" in content
+    assert f"[foo]={completion_dir / 'foo'}" in content
+    assert "[foo]=_foo_complete" in content
+    assert "[bar]" not in content
+
+
+def test_update_wrapper_script_skips_identical(temp_home):
+    """Test an unchanged registry does not rewrite the wrapper files"""
+    update_wrapper_script(["cli1"])
+    script_path = get_wrapper_script_path()
+    mtime_ns = script_path.stat().st_mtime_ns
+    script_path.chmod(0o700)
+
+    success, message, _ = update_wrapper_script(["cli1"])
+
+    assert success
+    assert message == f"Updated wrapper script at {script_path}"
+    assert script_path.stat().st_mode & 0o777 == 0o755  # only chmod'ed back
+    assert script_path.stat().st_mtime_ns == mtime_ns
+
+    success, message, _ = update_wrapper_script(["cli1"])
+    assert message == f"Wrapper script at {script_path} is up to date"
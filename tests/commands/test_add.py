@@ -1,6 +1,6 @@
 import pytest
-from pathlib import Path
 from cli_manager.commands.add import AddCommand
+from cli_manager.utils.registry import load_registry
 from cleo.testers.command_tester import CommandTester
 
 
@@ -130,20 +130,128 @@ def test_add_existing_cli_with_force(
 def test_add_mixed_success_failure(
     command_tester, mock_wrapper_dir, mock_completion_dir, monkeypatch, mock_cli
 ):
-    """Test adding mixed existing and non-existing CLIs. No error should be raised."""
+    """Test adding mixed existing and non-existing CLIs. The new one is still added."""
     # Arrange
     monkeypatch.setenv("PATH", str(mock_cli.parent))
     cli_name = mock_cli.name
 
     # First add cli1 to make it fail on second try
-    command_tester.execute([cli_name])
+    command_tester.execute(cli_name)
 
     # Act - try to add both (one exists, one doesn't)
-    exit_code = command_tester.execute([cli_name, "nonexistent_cli"])
+    exit_code = command_tester.execute(f"{cli_name} nonexistent_cli")
     output = command_tester.io.fetch_output()
 
     # Assert
-    assert exit_code == 0
+    assert exit_code == 1
     assert "Failed" in output
-    assert cli_name in output
-    assert "nonexistent_cli" in output
+    assert f"CLI '{cli_name}' is already registered" in output
+    assert "Successfully added 'nonexistent_cli'" in output
+    assert list(load_registry()) == [cli_name, "nonexistent_cli"]
+
+
+def test_add_with_jobs(
+    command_tester, mock_wrapper_dir, mock_completion_dir, monkeypatch, tmp_path
+):
+    """Test adding several CLIs with a parallel worker pool keeps input order"""
+    # Arrange
+    cli_names = ["cli1", "cli2", "cli3"]
+    for cli in cli_names:
+        cli_path = tmp_path / cli
+        cli_path.write_text("#!/bin/bash\necho 'some completion'")
+        cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    # Act
+    exit_code = command_tester.execute("--jobs 3 " + " ".join(cli_names))
+    output = command_tester.io.fetch_output()
+
+    # Assert
+    assert exit_code == 0
+    assert "Successfully added 3 CLI(s): cli1, cli2, cli3" in output
+    for cli in cli_names:
+        assert (mock_completion_dir / cli).exists()
+
+
+def test_add_invalid_jobs(command_tester, mock_wrapper_dir):
+    """Test that an invalid --jobs value is rejected"""
+    # Act
+    exit_code = command_tester.execute("--jobs 0 cli1")
+
+    # Assert
+    assert exit_code == 1
+    assert "--jobs must be a positive integer" in command_tester.io.fetch_output()
+
+
+def test_add_records_registry(
+    command_tester, mock_wrapper_dir, mock_completion_dir, monkeypatch, mock_cli
+):
+    """Test that add stores a registry record and derives the wrapper from it"""
+    monkeypatch.setenv("PATH", str(mock_cli.parent))
+
+    exit_code = command_tester.execute(mock_cli.name)
+    registry = load_registry()
+
+    assert exit_code == 0
+    assert list(registry) == [mock_cli.name]
+    assert registry[mock_cli.name]["path"] == str(mock_cli)
+    assert registry[mock_cli.name]["generation_seconds"] is not None
+    assert f'registered_clis="{mock_cli.name}"' in (mock_wrapper_dir / "superclisubs").read_text()
+
+
+def test_add_commits_all_files_at_once(
+    command_tester, mock_wrapper_dir, mock_completion_dir, temp_home, monkeypatch, tmp_path
+):
+    """Test that a failed commit leaves no completion, registry or wrapper behind"""
+    from unittest.mock import patch
+
+    for cli in ("cli1", "cli2"):
+        cli_path = tmp_path / cli
+        cli_path.write_text("#!/bin/bash\necho 'complete -F _x_complete x'")
+        cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    with patch(
+        "cli_manager.utils.transaction.apply_index_changes", side_effect=OSError("disk full")
+    ):
+        exit_code = command_tester.execute("cli1 cli2")
+    output = command_tester.io.fetch_output()
+
+    assert exit_code == 1
+    assert "nothing was modified: disk full" in output
+    assert not (mock_completion_dir / "cli1").exists()
+    assert not (mock_wrapper_dir / "superclisubs").exists()
+    assert not (temp_home / ".bashrc").exists()
+    assert load_registry() == {}
+
+    # The .bashrc loader is checked once and the restart hint printed once
+    exit_code = command_tester.execute("cli1 cli2")
+    output = command_tester.io.fetch_output()
+    assert exit_code == 0
+    assert output.count("Restart terminal to activate") == 1
+    assert output.count("Added completion loader") == 1
+    assert (mock_completion_dir / "cli1").exists() and (mock_completion_dir / "cli2").exists()
+
+
+def test_add_wrapper_mode_is_saved_with_the_commit(
+    command_tester, mock_wrapper_dir, mock_completion_dir, temp_home, monkeypatch, tmp_path
+):
+    """Test that --wrapper-mode is only remembered when the add is committed"""
+    from unittest.mock import patch
+
+    from cli_manager.utils.wrapper_utils import get_wrapper_mode
+
+    cli_path = tmp_path / "cli1"
+    cli_path.write_text("#!/bin/bash\necho 'complete -F _x_complete x'")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    with patch(
+        "cli_manager.utils.transaction.apply_index_changes", side_effect=OSError("disk full")
+    ):
+        assert command_tester.execute("--wrapper-mode function cli1") == 1
+    assert get_wrapper_mode() == "script"
+
+    assert command_tester.execute("--wrapper-mode function cli1") == 0
+    assert get_wrapper_mode() == "function"
+    assert (mock_completion_dir / ".supercli" / "superclisubs.bash").exists()
@@ -0,0 +1,45 @@
+import fcntl
+import os
+
+from cleo.testers.command_tester import CommandTester
+
+from cli_manager.commands.add import AddCommand
+from cli_manager.core import SupercliApplication
+from cli_manager.utils import registry
+from cli_manager.utils.safe_io import get_lock_path
+
+
+def test_refresh_reads_registry_under_the_write_lock(
+    mock_wrapper_dir, mock_completion_dir, monkeypatch, tmp_path
+):
+    """Test that superclisubs completion is rebuilt from a registry read under the lock"""
+    cli_path = tmp_path / "mock_cli"
+    cli_path.write_text("#!/bin/sh\necho 'complete -F _mock_cli_complete mock_cli'\n")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert CommandTester(AddCommand()).execute("mock_cli") == 0
+
+    # a new completion makes the refresh rewrite the superclisubs completion
+    cli_path.write_text("#!/bin/sh\necho '# v2'\necho 'complete -F _mock_cli_complete mock_cli'\n")
+    locked_reads = []
+    load_registry = registry.load_registry
+
+    def checked_load_registry():
+        fd = os.open(get_lock_path(), os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            locked_reads.append(False)
+        except BlockingIOError:
+            locked_reads.append(True)
+        finally:
+            os.close(fd)
+        return load_registry()
+
+    monkeypatch.setattr(
+        "cli_manager.commands.completionrefresh.load_registry", checked_load_registry
+    )
+    tester = CommandTester(SupercliApplication().find("completion-refresh"))
+
+    assert tester.execute("--force --shell bash") == 0
+    assert locked_reads == [True]
+    assert "[mock_cli]=_mock_cli_complete" in (mock_completion_dir / "superclisubs").read_text()
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+from cli_manager.utils.completion_index import load_index
+from cli_manager.utils.registry import load_registry
+from cli_manager.utils.wrapper_utils import get_registered_clis
+
+
+SUPERCLI = [sys.executable, "-c", "from cli_manager.core import main; main()"]
+
+
+def _supercli_env(temp_home, bin_dir):
+    env = dict(os.environ)
+    env["HOME"] = str(temp_home)
+    env["PATH"] = f"{bin_dir}{os.pathsep}{env.get('PATH', '')}"
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    return env
+
+
+def test_concurrent_adds_and_removes(mock_wrapper_dir, mock_completion_dir, temp_home):
+    """Test 50 concurrent supercli processes against one HOME without lost updates"""
+    bin_dir = temp_home / "bin"
+    bin_dir.mkdir()
+    added = [f"added{i}" for i in range(25)]
+    removed = [f"removed{i}" for i in range(25)]
+    for cli in added + removed:
+        cli_path = bin_dir / cli
+        cli_path.write_text(f"#!/bin/sh\necho 'complete -F _{cli}_complete {cli}'\n")
+        cli_path.chmod(0o755)
+
+    env = _supercli_env(temp_home, bin_dir)
+    subprocess.run(SUPERCLI + ["add", *removed], env=env, check=True, capture_output=True)
+
+    processes = [
+        subprocess.Popen(SUPERCLI + ["add", cli], env=env, stdout=subprocess.DEVNULL)
+        for cli in added
+    ] + [
+        subprocess.Popen(
+            SUPERCLI + ["remove", "--force", cli], env=env, stdout=subprocess.DEVNULL
+        )
+        for cli in removed
+    ]
+    assert [process.wait() for process in processes] == [0] * len(processes)
+
+    assert sorted(load_registry()) == sorted(added)
+    assert sorted(get_registered_clis()) == sorted(added)
+    # plus the superclisubs completion generated from the registry
+    assert sorted(load_index(mock_completion_dir)) == sorted(added + ["superclisubs"])
+    assert sorted(
+        path.name for path in mock_completion_dir.iterdir() if not path.name.startswith(".")
+    ) == sorted(added + ["superclisubs"])
+    assert (temp_home / ".bashrc").read_text().count("~/.completions/*") == 1
@@ -1,5 +1,5 @@
+import json
 import pytest
-from pathlib import Path
 from cli_manager.commands.show import ShowCommand
 from cleo.testers.command_tester import CommandTester
 
@@ -49,7 +49,7 @@ def test_show_with_registered_clis(
 
 
 def test_show_with_check_option(
-    command_tester, mock_wrapper_dir, mock_completion_dir, monkeypatch
+    command_tester, mock_wrapper_dir, mock_completion_dir, monkeypatch, tmp_path
 ):
     """Test show command with --check option"""
     # Arrange
@@ -57,10 +57,11 @@ def test_show_with_check_option(
     wrapper_script.write_text('registered_clis="cli1 cli2"')
     wrapper_script.chmod(0o755)
     
-    # Mock shutil.which to simulate cli1 being available
-    def mock_which(cmd):
-        return "/usr/bin/cli1" if cmd == "cli1" else None
-    monkeypatch.setattr("shutil.which", mock_which)
+    # Only cli1 is available in PATH
+    cli_path = tmp_path / "cli1"
+    cli_path.write_text("#!/bin/sh\n")
+    cli_path.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
     
     # Act
     exit_code = command_tester.execute(["--check"])
@@ -84,4 +85,49 @@ def test_show_with_invalid_wrapper(command_tester, mock_wrapper_dir):
     
     # Assert
     assert exit_code == 0
-    assert "No CLIs are registered" in command_tester.io.fetch_output() 
\ No newline at end of file
+    assert "No CLIs are registered" in command_tester.io.fetch_output() 
+
+def test_show_ndjson_filter_and_limit(command_tester, mock_wrapper_dir, mock_completion_dir):
+    """Test machine-readable output with --filter and --limit"""
+    # Arrange
+    wrapper_script = mock_wrapper_dir / "superclisubs"
+    wrapper_script.write_text('registered_clis="git gh git-lfs docker"')
+    (mock_completion_dir / "git").touch()
+
+    # Act
+    exit_code = command_tester.execute("--format ndjson --filter 'g*' --limit 2")
+    lines = command_tester.io.fetch_output().splitlines()
+
+    # Assert
+    assert exit_code == 0
+    assert [json.loads(line) for line in lines] == [
+        {"name": "git", "completion": True, "completion_file": str(mock_completion_dir / "git")},
+        {"name": "gh", "completion": False, "completion_file": None},
+    ]
+
+
+def test_show_json_with_check(command_tester, mock_wrapper_dir, mock_completion_dir, monkeypatch):
+    """Test --format json emits one document including PATH availability"""
+    # Arrange
+    wrapper_script = mock_wrapper_dir / "superclisubs"
+    wrapper_script.write_text('registered_clis="cli1"')
+    monkeypatch.setenv("PATH", str(mock_wrapper_dir))
+
+    # Act
+    exit_code = command_tester.execute("--format json --check")
+    rows = json.loads(command_tester.io.fetch_output())
+
+    # Assert
+    assert exit_code == 0
+    assert rows == [
+        {"name": "cli1", "completion": False, "completion_file": None, "available": False}
+    ]
+
+
+def test_show_invalid_format_and_limit(command_tester, mock_wrapper_dir):
+    """Test invalid --format and --limit values are rejected"""
+    assert command_tester.execute("--format xml") == 1
+    assert "--format must be one of" in command_tester.io.fetch_output()
+
+    assert command_tester.execute("--limit=-3") == 1
+    assert "--limit must be a non-negative integer" in command_tester.io.fetch_output()
@@ -1,7 +1,6 @@
 import pytest
 from pathlib import Path
 import tempfile
-import shutil
 
 
 @pytest.fixture
@@ -34,4 +33,13 @@ def mock_wrapper_dir(temp_home):
     """Create a temporary directory for wrapper script"""
     wrapper_dir = temp_home / ".local" / "bin"
     wrapper_dir.mkdir(parents=True)
-    return wrapper_dir 
\ No newline at end of file
+    return wrapper_dir 
+
+@pytest.fixture(autouse=True)
+def fresh_path_index():
+    """Tests create executables on PATH, so never reuse another test's PATH index"""
+    from cli_manager.utils.path_index import clear_path_index
+
+    clear_path_index()
+    yield
+    clear_path_index()
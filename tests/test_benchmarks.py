@@ -0,0 +1,32 @@
+import importlib.util
+from pathlib import Path
+
+from cli_manager.utils.completion_index import load_index
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+def load_benchmark(name):
+    spec = importlib.util.spec_from_file_location(f"benchmark_{name}", BENCHMARKS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_shell_startup_build_home(temp_home):
+    """Test that the shell startup benchmark can still build its HOME"""
+    shell_startup = load_benchmark("shell_startup")
+
+    bin_dir = shell_startup.build_home(temp_home, 3)
+
+    assert sorted(path.name for path in bin_dir.iterdir()) == [
+        "benchcli0000",
+        "benchcli0001",
+        "benchcli0002",
+    ]
+    assert set(load_index(temp_home / ".completions")) == {
+        "benchcli0000",
+        "benchcli0001",
+        "benchcli0002",
+    }
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+from cli_manager.core import COMMANDS, SupercliApplication
+
+
+def test_commands_load_lazily_by_name():
+    """Test that every registered command loads and matches its name"""
+    app = SupercliApplication()
+
+    for name in COMMANDS:
+        assert app.has(name)
+        assert app.get(name).name == name
+
+
+def test_construction_imports_no_commands():
+    """Test that building the application does not import command modules"""
+    code = (
+        "import sys\n"
+        "from cli_manager.core import SupercliApplication\n"
+        "SupercliApplication()\n"
+        "print(sorted(m for m in sys.modules if m.startswith('cli_manager.')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+
+    assert result.stdout.strip() == "['cli_manager.core']"
+
+
+def test_profile_startup_option(tmp_path):
+    """Test that --profile-startup runs the command and reports its timings"""
+    report = tmp_path / "profile.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "cli_manager.core", "--profile-startup", "list"],
+        capture_output=True,
+        text=True,
+        env=dict(
+            os.environ,
+            HOME=str(tmp_path),
+            PYTHONPATH=os.pathsep.join(sys.path),
+            SUPERCLI_PROFILE_STARTUP=str(report),
+        ),
+    )
+    profile = json.loads(report.read_text())
+
+    assert result.returncode == 0
+    assert "completion-refresh" in result.stdout
+    assert profile["command"] == ["supercli", "list"]
+    assert profile["construct_ms"] is not None
+    assert profile["dispatch_ms"] is not None
+    assert any(entry["module"] == "cleo.application" for entry in profile["imports"])